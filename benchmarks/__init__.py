@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Benchmarks of the PDFgui control layer for airspeed velocity (asv).
+
+Run "asv run" from the project directory to benchmark the latest commit
+or "asv continuous main HEAD" to compare a branch with main.  Results
+are kept per commit and machine in .asv/results.
+
+The Benchmarks workflow in .github/workflows compares pull requests
+with their base and runs the suite for every commit to main.  Results
+of the github-actions machine are kept in the asv-results branch, check
+it out to .asv/results to extend that history or to publish it locally.
+"""
+
+# End of file
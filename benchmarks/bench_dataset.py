@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Benchmarks of PDF data reading and resampling."""
+
+import numpy
+
+from benchmarks.common import readfile, syntheticPDFString
+from diffpy.pdfgui.control.fitdataset import grid_interpolation
+from diffpy.pdfgui.control.pdfdataset import PDFDataSet
+
+
+class ReadTestData:
+    """PDFDataSet.readStr for the data files in tests/testdata."""
+
+    params = ["Ni_2-8.chi.gr", "lcmo_00.gr", "300K.gr"]
+    param_names = ["filename"]
+
+    def setup(self, filename):
+        self.text = readfile(filename)
+
+    def time_readStr(self, filename):
+        PDFDataSet("bench").readStr(self.text)
+
+
+class ReadSynthetic:
+    """PDFDataSet.readStr for large synthetic data files."""
+
+    params = [10000, 100000]
+    param_names = ["npoints"]
+
+    def setup(self, npoints):
+        self.text = syntheticPDFString(npoints)
+
+    def time_readStr(self, npoints):
+        PDFDataSet("bench").readStr(self.text)
+
+    def peakmem_readStr(self, npoints):
+        PDFDataSet("bench").readStr(self.text)
+
+
+class GridInterpolation:
+    """grid_interpolation with linear and Nyquist resampling."""
+
+    params = (["data", "Nyquist", "Nyquist-fast"], [2000, 20000])
+    param_names = ["tp", "npoints"]
+
+    def setup(self, tp, npoints):
+        # data with 0.01 A spacing resampled to the Nyquist spacing of
+        # qmax = 25, which is incommensurate with the data
+        self.x0 = 0.5 + 0.01 * numpy.arange(npoints)
+        self.y0 = numpy.sin(3.3 * self.x0) * self.x0
+        self.x1 = numpy.arange(self.x0[0], self.x0[-1], numpy.pi / 25.0)
+
+    def time_grid_interpolation(self, tp, npoints):
+        grid_interpolation(self.x0, self.y0, self.x1, tp=tp)
+
+    def peakmem_grid_interpolation(self, tp, npoints):
+        grid_interpolation(self.x0, self.y0, self.x1, tp=tp)
+
+
+# End of file
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Benchmarks of project files, refinement history and data export."""
+
+import io
+import os
+import shutil
+import tempfile
+
+from benchmarks.common import largeProject, loadProject
+from diffpy.pdfgui.control.pdfguicontrol import PDFGuiControl
+
+
+class ProjectLoadSave:
+    """PDFGuiControl.load and save for projects with many fittings."""
+
+    params = [8, 64]
+    param_names = ["nfits"]
+    timeout = 300
+
+    def setup_cache(self):
+        # build the projects once, asv passes the directory to setup
+        tmpdir = os.path.abspath("projects")
+        os.mkdir(tmpdir)
+        for nfits in self.params:
+            control = largeProject(nfits)
+            control.save(os.path.join(tmpdir, "project%i.ddp" % nfits))
+        return tmpdir
+
+    def setup(self, tmpdir, nfits):
+        self.projfile = os.path.join(tmpdir, "project%i.ddp" % nfits)
+        self.outdir = tempfile.mkdtemp()
+        self.control = PDFGuiControl()
+        self.control.load(self.projfile)
+
+    def teardown(self, tmpdir, nfits):
+        self.control.close()
+        shutil.rmtree(self.outdir)
+
+    def time_load(self, tmpdir, nfits):
+        PDFGuiControl().load(self.projfile)
+
+    def time_load_lazy(self, tmpdir, nfits):
+        PDFGuiControl().load(self.projfile, lazy=True)
+
+    def time_save(self, tmpdir, nfits):
+        # write all members, do not copy them from the loaded project
+        self.control.savedTokens = None
+        self.control.save(os.path.join(self.outdir, "saved.ddp"))
+
+    def time_resave(self, tmpdir, nfits):
+        self.control.save(self.projfile + ".resaved")
+
+
+class SnapshotGetData:
+    """Fitting.getData over a long refinement history."""
+
+    params = [100, 2000]
+    param_names = ["nsteps"]
+
+    def setup(self, nsteps):
+        control = loadProject()
+        self.fit = control.fits[0]
+        self.dataset = self.fit.datasets[0]
+        last = self.fit.snapshots[-1]
+        while len(self.fit.snapshots) < nsteps:
+            self.fit.snapshots.append(last)
+
+    def time_getData_rw(self, nsteps):
+        self.fit.getData("rw", None)
+
+    def time_getData_parameter(self, nsteps):
+        self.fit.getData(1, None)
+
+    def time_getData_Gcalc(self, nsteps):
+        self.dataset.getData("Gcalc", None)
+
+    def time_getData_Gcalc_last(self, nsteps):
+        self.dataset.getData("Gcalc", -1)
+
+
+class ExportCompactData:
+    """Export of plotted curves, most of them sharing the x values."""
+
+    params = [10, 100]
+    param_names = ["ncurves"]
+
+    def setup(self, ncurves):
+        try:
+            from diffpy.pdfgui.control.plotter import _exportCompactData
+        except ImportError:
+            # plotter needs wxPython
+            raise NotImplementedError
+        self.export = _exportCompactData
+        dataset = loadProject().fits[0].datasets[0]
+        x = dataset.robs
+        y = dataset.Gobs
+        self.xylist = [(x, y + i) for i in range(ncurves)]
+        self.xylist.append((x[::2], y[::2]))
+        self.xynames = [("r", "G%i" % i) for i in range(len(self.xylist))]
+
+    def time_exportCompactData(self, ncurves):
+        self.export(io.StringIO(), self.xylist, self.xynames)
+
+
+# End of file
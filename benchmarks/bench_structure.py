@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Benchmarks of structure constraints, supercells and pair selection."""
+
+from benchmarks.common import datafile
+from diffpy.pdfgui.control.constraint import Constraint
+from diffpy.pdfgui.control.fitstructure import FitStructure
+from diffpy.pdfgui.control.parameter import Parameter
+
+
+def _constrainedStructure(filename):
+    """FitStructure with lattice, positions and Uiso of all atoms
+    constrained to parameters.
+
+    returns (structure, parameters) tuple
+    """
+    stru = FitStructure(filename)
+    stru.read(datafile(filename), format="pdffit")
+    parameters = {}
+    for i in (1, 2, 3):
+        stru.constraints["lat(%i)" % i] = Constraint("@%i" % i)
+        parameters[i] = Parameter(i, stru.initial.lattice.abcABG()[i - 1])
+    for i, a in enumerate(stru.initial, 1):
+        for j, v in enumerate(("x", "y", "z")):
+            idx = 100 + 10 * i + j
+            stru.constraints["%s(%i)" % (v, i)] = Constraint("@%i + 0.001 * @%i" % (idx, 3))
+            parameters[idx] = Parameter(idx, a.xyz[j])
+        stru.constraints["u11(%i)" % i] = Constraint("@%i" % (100 + 10 * i + 3))
+        parameters[100 + 10 * i + 3] = Parameter(100 + 10 * i + 3, 0.005)
+    return stru, parameters
+
+
+class EvalFormula:
+    """Constraint.evalFormula for simple and compound formulas."""
+
+    params = ["@1", "@1 * 2 + sqrt(@2) - sin(@3) / (1 + @4 * @4)"]
+    param_names = ["formula"]
+
+    def setup(self, formula):
+        self.constraint = Constraint(formula)
+        self.parvalues = {1: 1.5, 2: 2.0, 3: 0.3, 4: 0.7}
+
+    def time_evalFormula(self, formula):
+        self.constraint.evalFormula(self.parvalues)
+
+
+class ApplyParameters:
+    """FitStructure.applyParameters with all atoms constrained."""
+
+    params = ["Ni.stru", "LaMnO3.stru"]
+    param_names = ["filename"]
+
+    def setup(self, filename):
+        self.stru, self.parameters = _constrainedStructure(filename)
+
+    def time_applyParameters(self, filename):
+        self.stru.applyParameters(self.parameters)
+
+
+class ExpandSuperCell:
+    """FitStructure.expandSuperCell with constraints to adjust."""
+
+    params = ([(2, 2, 2), (4, 4, 4)], ["Ni.stru", "LaMnO3.stru"])
+    param_names = ["mno", "filename"]
+    # the expansion changes the structure, setup is needed for every run
+    number = 1
+    repeat = 5
+
+    def setup(self, mno, filename):
+        self.stru, self.parameters = _constrainedStructure(filename)
+
+    def time_expandSuperCell(self, mno, filename):
+        self.stru.expandSuperCell(mno)
+
+
+class PairSelectionFlags:
+    """FitStructure.getPairSelectionFlags for a large supercell."""
+
+    params = ["all-all", "all-all, !O-!O, La-1:100"]
+    param_names = ["selection"]
+
+    def setup(self, selection):
+        self.stru = FitStructure("LaMnO3")
+        self.stru.read(datafile("LaMnO3.stru"), format="pdffit")
+        self.stru.expandSuperCell((4, 4, 4))
+
+    def time_getPairSelectionFlags(self, selection):
+        self.stru.getPairSelectionFlags(selection)
+
+
+# End of file
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Test data and synthetic inputs shared by the benchmarks."""
+
+import os
+
+import numpy
+
+TESTDATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "tests", "testdata")
+
+
+def datafile(filename):
+    """Absolute path to a file in tests/testdata."""
+    return os.path.normpath(os.path.join(TESTDATA, filename))
+
+
+def readfile(filename):
+    """Content of a file in tests/testdata."""
+    with open(datafile(filename)) as fp:
+        return fp.read()
+
+
+def syntheticPDFString(npoints, rstep=0.01):
+    """Text of a PDF data file with npoints rows of r, G, dr and dG.
+
+    npoints -- number of data points
+    rstep   -- spacing of the r-grid
+    """
+    r = 0.5 + rstep * numpy.arange(npoints)
+    g = numpy.sin(3.3 * r) * numpy.exp(-0.05 * r) * r
+    dg = 0.01 + 0.001 * r
+    rows = numpy.column_stack((r, g, numpy.zeros_like(r), dg))
+    lines = ["# synthetic data", "##### start data", "#L r(A) G(r) d_r d_Gr"]
+    lines += ["%.6f %.8g %g %.8g" % tuple(row) for row in rows]
+    return "\n".join(lines) + "\n"
+
+
+def loadProject(filename="lcmo_full.ddp"):
+    """Load project from tests/testdata in a new PDFGuiControl.
+
+    returns PDFGuiControl instance
+    """
+    from diffpy.pdfgui.control.pdfguicontrol import PDFGuiControl
+
+    control = PDFGuiControl()
+    control.load(datafile(filename))
+    return control
+
+
+def largeProject(nfits):
+    """Project with nfits fittings made of copies of lcmo_full.ddp fits.
+
+    returns PDFGuiControl instance
+    """
+    control = loadProject()
+    sources = list(control.fits)
+    for i in range(len(sources), nfits):
+        src = sources[i % len(sources)]
+        control.paste(control.copy(src), new_name="%s-%i" % (src.name, i))
+    return control
+
+
+# End of file
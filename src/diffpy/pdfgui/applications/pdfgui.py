@@ -29,6 +29,7 @@ Debugging options:
   --db-noed       disable exceptions catching to ErrorReportDialog
   --db-nocf       exit without asking to save modified project
   --db-pdb        use Python debugger to handle error exceptions
+  --db-profile    profile refinements, write pdfgui-profile.json at exit
 """
 
 from __future__ import print_function
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""
+PDFgui batch refinement without graphical user interface
+Usage: pdfgui-batch [options] project.ddp [fitname]...
+
+Run the specified fits from PDFgui project or all fits when no names
+are given.  Refined results are saved back to the project file.  For
+every finished fit there is one line of JSON written to the standard
+output with the fit name, status, Rw, number of refinement steps and
+refinement time in seconds.  Fits with parameters linked to other fits
+are started after their source fits have finished.
+
+Options:
+  -h, --help          display this message
+  -V, --version       show program version
+  -o, --output=FILE   save refined project to FILE instead of the input
+  -n, --no-save       do not save refined project
+  -j, --jobs=N        refine up to N fits at the same time, requires
+                      --processes [1]
+  -p, --processes     run each refinement in a separate process
+  -t, --timeout=SEC   stop unfinished fits after SEC seconds
+"""
+
+from __future__ import print_function
+
+import getopt
+import json
+import os
+import sys
+import time
+
+# time in seconds between checks for finished fits
+REPORT_INTERVAL = 0.5
+
+
+def usage():
+    """Show usage info."""
+    myname = os.path.basename(sys.argv[0])
+    msg = __doc__.replace("pdfgui-batch", myname)
+    print(msg)
+    return
+
+
+def version():
+    from diffpy.pdfgui import __version__
+
+    print("PDFgui", __version__)
+    return
+
+
+class BatchReporter:
+    """Replacement of the GUI main frame for the control events.
+
+    Error messages are written to the standard error, the other events
+    are ignored.
+    """
+
+    # event types compatible with MainFrame
+    ERROR = 1
+    UPDATE = 2
+    OUTPUT = 4
+    PLOTNOW = 8
+
+    def __init__(self, stream=None):
+        """Initialize BatchReporter.
+
+        stream -- output for error messages, default is sys.stderr
+        """
+        self.stream = stream
+        return
+
+    def postEvent(self, type, info):
+        """Handle event from the control.
+
+        type -- event type
+        info -- message for ERROR events, otherwise ignored
+        """
+        if type & BatchReporter.ERROR:
+            stream = self.stream or sys.stderr
+            print(info, file=stream)
+        return
+
+
+# End of class BatchReporter
+
+
+def fitResult(fit, duration):
+    """Summary of finished fit.
+
+    fit      -- instance of Fitting
+    duration -- refinement time in seconds
+
+    returns dictionary for JSON output
+    """
+    from diffpy.pdfgui.control.fitting import Fitting
+
+    status = "done" if fit.fitStatus == Fitting.DONE else "incomplete"
+    rv = {
+        "fit": fit.name,
+        "status": status,
+        "rw": fit.rw,
+        "steps": fit.step,
+        "time": round(duration, 3),
+    }
+    return rv
+
+
+def runBatch(projfile, fitnames=(), output=None, jobs=1, processes=False, stream=None, timeout=None):
+    """Refine fits from PDFgui project and save the results.
+
+    projfile  -- path to PDFgui project file
+    fitnames  -- names of fits to be refined, all fits when empty
+    output    -- path for the refined project, overwrite projfile when
+                 None, do not save when False
+    jobs      -- maximum number of fits refined at the same time,
+                 effective only with processes
+    processes -- flag for running refinements in separate processes
+    stream    -- output for JSON lines, default is sys.stdout
+    timeout   -- time in seconds after which unfinished fits are
+                 stopped, no limit when None
+
+    Refinements are stopped on KeyboardInterrupt, which is raised again
+    after the stopped fits are reported, the project is not saved.
+
+    returns list of dictionaries with results of all fits
+    raise ControlKeyError when fit name does not exist in the project
+    """
+    from diffpy.pdfgui.control.controlerrors import ControlKeyError
+    from diffpy.pdfgui.control.fitting import Fitting
+    from diffpy.pdfgui.control.pdfguicontrol import pdfguicontrol
+
+    stream = stream or sys.stdout
+    # linked parameters look up source fits in the pdfguicontrol singleton
+    control = pdfguicontrol()
+    control.gui = BatchReporter()
+    control.reset()
+    control.load(projfile)
+    allfits = [f for f in control.fits if isinstance(f, Fitting)]
+    if fitnames:
+        names = [f.name for f in allfits]
+        for n in fitnames:
+            if n not in names:
+                raise ControlKeyError("Fit '%s' does not exist in %s" % (n, projfile))
+        fits = [f for f in allfits if f.name in fitnames]
+    else:
+        fits = allfits
+    control.setWorkers(jobs, processes)
+    if not control.queueManager.is_alive():
+        control.startQueue()
+    control.start(fits)
+    t0 = time.time()
+    results = []
+    pending = list(fits)
+
+    def report():
+        # fits are recorded in the schedule when they finish
+        for fit in list(pending):
+            if fit not in control.schedule.finished:
+                continue
+            duration = control.schedule.finished[fit] - control.schedule.started[fit]
+            res = fitResult(fit, duration)
+            print(json.dumps(res), file=stream)
+            stream.flush()
+            results.append(res)
+            pending.remove(fit)
+        # engine output is not shown, discard it so it does not grow
+        control.getEngineOutput()
+        return
+
+    try:
+        while not control.waitQueue(REPORT_INTERVAL):
+            report()
+            if timeout is not None and time.time() - t0 > timeout:
+                control.stop()
+                timeout = None
+    except KeyboardInterrupt:
+        control.stop()
+        control.waitQueue()
+        report()
+        raise
+    report()
+    if output is not False:
+        control.save(output or projfile)
+    return results
+
+
+def main():
+    """Main entry point to PDFgui batch refinement."""
+    from diffpy.pdfgui.control.controlerrors import ControlError
+
+    try:
+        opts, args = getopt.gnu_getopt(
+            sys.argv[1:],
+            "hVo:nj:pt:",
+            ["help", "version", "output=", "no-save", "jobs=", "processes", "timeout="],
+        )
+    except getopt.GetoptError as err:
+        print(err, file=sys.stderr)
+        sys.exit(1)
+    output = None
+    jobs = 1
+    processes = False
+    timeout = None
+    for o, a in opts:
+        if o in ("-h", "--help"):
+            usage()
+            sys.exit()
+        elif o in ("-V", "--version"):
+            version()
+            sys.exit()
+        elif o in ("-o", "--output"):
+            output = a
+        elif o in ("-n", "--no-save"):
+            output = False
+        elif o in ("-j", "--jobs"):
+            try:
+                jobs = int(a)
+            except ValueError:
+                print("Invalid number of jobs %r." % a, file=sys.stderr)
+                sys.exit(1)
+        elif o in ("-p", "--processes"):
+            processes = True
+        elif o in ("-t", "--timeout"):
+            try:
+                timeout = float(a)
+            except ValueError:
+                print("Invalid timeout %r." % a, file=sys.stderr)
+                sys.exit(1)
+    if not args:
+        print("Project file not specified.", file=sys.stderr)
+        sys.exit(1)
+    projfile, fitnames = args[0], args[1:]
+    if not os.path.isfile(projfile):
+        print("Project file %s does not exist." % projfile, file=sys.stderr)
+        sys.exit(1)
+    t0 = time.time()
+    try:
+        results = runBatch(projfile, fitnames, output, jobs, processes, timeout=timeout)
+    except ControlError as err:
+        print(err, file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("Interrupted, project was not saved.", file=sys.stderr)
+        sys.exit(130)
+    print("Finished %i fits in %.3f s." % (len(results), time.time() - t0), file=sys.stderr)
+    if any(r["status"] != "done" for r in results):
+        sys.exit(2)
+    return
+
+
+if __name__ == "__main__":
+    main()
+
+# End of file
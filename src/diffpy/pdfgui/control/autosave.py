@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Periodic saving of project to crash-recovery files in a background
+thread."""
+
+import glob
+import os
+import pickle
+import tempfile
+import threading
+import time
+import zipfile
+
+from diffpy.pdfgui.control.controlerrors import ControlFileError
+from diffpy.pdfgui.control.projectwriter import writeProject
+
+
+class AutoSave:
+    """Background saving of project snapshots to a recovery file.
+
+    Snapshots of fittings are copied while holding the control lock,
+    the recovery file is written and compressed without it.  Running
+    fittings are copied between their refinement steps.  Fittings
+    that were not loaded from a lazily opened project are not copied.
+    The recovery file is removed when the project is saved or closed,
+    so it survives only when PDFgui did not exit properly.
+
+    Data members:
+        control   -- instance of PDFGuiControl
+        interval  -- time between autosaves in seconds, 0 disables
+        directory -- folder for recovery files
+        lock      -- lock held while writing a project file
+        altered   -- flag for project changes since the last save
+        lastSave  -- time of the last autosave or None
+        lastError -- message from the last failed autosave or None
+    """
+
+    # suffix of recovery files
+    suffix = ".autosave.ddp"
+
+    def __init__(self, control, interval=0, directory=None):
+        """Initialize AutoSave.
+
+        control   -- instance of PDFGuiControl
+        interval  -- time between autosaves in seconds, 0 disables
+        directory -- folder for recovery files, by default
+                     ~/.pdfgui_autosave
+        """
+        self.control = control
+        self.interval = interval
+        self.directory = directory or AutoSave.defaultDirectory()
+        self.lock = threading.Lock()
+        self.altered = False
+        self.lastSave = None
+        self.lastError = None
+        self._recoveryfile = None
+        self._tokens = None
+        self._state = None
+        self._thread = None
+        self._stopevent = threading.Event()
+        return
+
+    @staticmethod
+    def defaultDirectory():
+        """Default folder for recovery files."""
+        return os.path.join(os.path.expanduser("~"), ".pdfgui_autosave")
+
+    @staticmethod
+    def findRecoveryFiles(directory=None):
+        """List recovery files left from previous sessions.
+
+        directory -- folder with recovery files, use default when None
+
+        returns list of paths, the newest first
+        """
+        directory = directory or AutoSave.defaultDirectory()
+        files = glob.glob(os.path.join(directory, "*" + AutoSave.suffix))
+        files.sort(key=os.path.getmtime, reverse=True)
+        return files
+
+    def setInterval(self, interval):
+        """Change time between autosaves and start or stop the thread.
+
+        interval -- time in seconds, 0 disables autosave
+        """
+        self.interval = max(0, interval)
+        if self.interval > 0:
+            self.start()
+        else:
+            self.stop()
+        return
+
+    def start(self):
+        """Start the autosave thread if not running."""
+        if self.isRunning():
+            return
+        self._stopevent.clear()
+        self._thread = threading.Thread(target=self._run, name="pdfgui-autosave")
+        self._thread.daemon = True
+        self._thread.start()
+        return
+
+    def stop(self):
+        """Stop the autosave thread and wait until it finishes."""
+        self._stopevent.set()
+        if self.isRunning() and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        return
+
+    def isRunning(self):
+        """Check if the autosave thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def recoveryFile(self):
+        """Path to the recovery file of the current project.  Recovered
+        projects are saved to their original recovery file."""
+        projbase = os.path.basename(self.control.projfile or "untitled")
+        if projbase.endswith(AutoSave.suffix):
+            projbase = projbase[: -len(AutoSave.suffix)]
+        projName = os.path.splitext(projbase)[0]
+        return os.path.join(self.directory, projName + AutoSave.suffix)
+
+    def saveNow(self):
+        """Save project snapshot to the recovery file if it changed since
+        the last save.  This is called periodically from the autosave
+        thread.
+
+        returns path to the recovery file or None if not saved
+        raise ControlFileError when the file cannot be written
+        """
+        with self.control.lock:
+            state = self._stateToken()
+            if not self.altered and state == self._state:
+                return None
+            fits = [self._snapshot(fit) for fit in self.control.fits]
+            journal = self.control.journal
+            recoveryfile = self.recoveryFile()
+            self.altered = False
+        # compress without the control lock
+        try:
+            with self.lock:
+                self._write(recoveryfile, fits, journal)
+        except ControlFileError:
+            self.altered = True
+            raise
+        self._state = state
+        self.lastSave = time.time()
+        return recoveryfile
+
+    def discard(self):
+        """Remove the recovery file, called when the project is saved or
+        closed."""
+        with self.lock:
+            if self._recoveryfile is not None and os.path.isfile(self._recoveryfile):
+                os.remove(self._recoveryfile)
+            self._recoveryfile = None
+            self._tokens = None
+            self._state = self._stateToken()
+            self.altered = False
+        return
+
+    # protected methods
+
+    def _run(self):
+        """Function run in the autosave thread."""
+        while not self._stopevent.wait(self.interval or 1.0):
+            if not self.interval:
+                continue
+            try:
+                self.saveNow()
+                self.lastError = None
+            except ControlFileError as error:
+                self.lastError = str(error)
+        return
+
+    def _stateToken(self):
+        """Summary of fitting states that change during refinement."""
+        rv = []
+        for fit in self.control.fits:
+            if fit.isLoaded():
+                rv.append((id(fit), fit.name, fit.fitStatus, fit.step, fit.snapshots.version))
+            else:
+                rv.append((id(fit), fit.name))
+        return tuple(rv)
+
+    def _snapshot(self, fit):
+        """Copy of fit for saving, fits that were not loaded at all are
+        saved from the original project file."""
+        items = [fit] + list(fit.strucs) + list(fit.datasets) + list(fit.calcs)
+        if not any(item.isLoaded() for item in items):
+            return fit
+        return fit.copy()
+
+    def _write(self, recoveryfile, fits, journal):
+        """Write project to the recovery file.  Unchanged members are
+        copied from the previous recovery file."""
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        projName = os.path.splitext(os.path.basename(recoveryfile))[0]
+        source = self._recoveryfile
+        tokens = self._tokens if source == recoveryfile else None
+        tmpfd, tmpfilename = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(tmpfd)
+        try:
+            z = writeProject(tmpfilename, projName, fits, journal, source, tokens)
+            os.replace(tmpfilename, recoveryfile)
+        except (IOError, OSError, zipfile.error, pickle.PickleError):
+            if os.path.isfile(tmpfilename):
+                os.remove(tmpfilename)
+            emsg = "Error when writing recovery file %s" % recoveryfile
+            raise ControlFileError(emsg)
+        if source is not None and source != recoveryfile and os.path.isfile(source):
+            os.remove(source)
+        self._recoveryfile = recoveryfile
+        self._tokens = z.tokens
+        return
+
+
+# End of class AutoSave
+
+# End of file
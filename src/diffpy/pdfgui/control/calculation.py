@@ -16,9 +16,12 @@
 structure."""
 
 import copy
+import itertools
 import math
 import pickle
 
+import numpy
+
 from diffpy.pdfgui.control.controlerrors import ControlConfigError, ControlKeyError, ControlValueError
 from diffpy.pdfgui.control.pdfcomponent import PDFComponent
 from diffpy.pdfgui.utils import safeCPickleDumps
@@ -137,6 +140,7 @@ class Calculation(PDFComponent):
 
     def calculate(self):
         """Do the real calculation."""
+        self.ensureLoaded()
         # clean up old results
         self.rcalc = []
         self.Gcalc = []
@@ -147,10 +151,110 @@ class Calculation(PDFComponent):
 
         # make sure parameters are initialized
         self.owner.updateParameters()
-        from diffpy.pdffit2 import PdfFit
+        with self.owner.controlCenter.serverPool.lease() as server:
+            self._configureServer(server)
+            server.calc()
+            # get results
+            self.rcalc = server.getR()
+            self.Gcalc = server.getpdf_fit()
+        return
 
-        server = PdfFit()
+    def calculateGrid(self, grid, workers=1):
+        """Calculate PDFs for all points of a parameter grid.  The engine
+        is configured only once and the grid values are changed in place
+        before every calculation.  rcalc and Gcalc are not changed.
+
+        grid    -- mapping of parameter index or engine variable name,
+                   such as "qdamp", to a sequence of values.  Parameters
+                   are changed with setpar, variables with setvar.
+        workers -- maximum number of concurrent calculations in the
+                   calculation pool of the control center, where each
+                   worker process has its own engine.  Calculate in the
+                   current process when 1.
+
+        returns 2-D float array with one row of G(r) per grid point.
+        The rows follow itertools.product over the grid values and the
+        columns the r-grid starting at rmin with rstep and rlen points.
+        Raise ControlConfigError when there is no structure,
+        ControlKeyError for parameter index not used in constraints and
+        ControlValueError for invalid grid values or workers.
+        """
+        self.ensureLoaded()
+        if len(self.owner.strucs) == 0:
+            raise ControlConfigError("No structure is given for calculation")
+        keys = list(grid)
+        try:
+            values = [[float(v) for v in grid[key]] for key in keys]
+            workers = int(workers)
+        except (TypeError, ValueError) as error:
+            raise ControlValueError("Invalid calculation grid. [%s]" % error)
+        if workers < 1:
+            raise ControlValueError("Number of workers must be positive.")
+        points = list(itertools.product(*values))
+        # make sure parameters are initialized
+        self.owner.updateParameters()
+        for key in keys:
+            if not isinstance(key, str) and key not in self.owner.parameters:
+                raise ControlKeyError("Parameter @%s is not used." % key)
+        if workers == 1 or len(points) < 2:
+            with self.owner.controlCenter.serverPool.lease() as server:
+                self._configureServer(server)
+                return self._calculatePoints(server, keys, points)
+        import concurrent.futures
+
+        # linked parameters can be resolved only in this process
+        naked = self.owner.stripped()
+        for par in naked.parameters.values():
+            par.setInitial(par.initialValue())
+        index = self.owner.calcs.index(self)
+        # a few chunks per worker balance the load with little overhead
+        nchunks = min(len(points), 4 * workers)
+        chunks = [points[i::nchunks] for i in range(nchunks)]
+        rv = numpy.empty((len(points), self.rlen))
+        # use the calculation pool of the control center, which is shared
+        # with fittings, and keep at most workers chunks in it at a time
+        executor = self.owner.controlCenter.getCalcExecutor()
+        pending = {}
+
+        def collect(return_when):
+            done, notdone = concurrent.futures.wait(pending, return_when=return_when)
+            for future in done:
+                i = pending.pop(future)
+                rv[i::nchunks] = future.result()
+            return
 
+        try:
+            for i, chunk in enumerate(chunks):
+                if len(pending) >= workers:
+                    collect(concurrent.futures.FIRST_COMPLETED)
+                future = executor.submit(_calculateGridChunk, naked, index, keys, chunk)
+                pending[future] = i
+            collect(concurrent.futures.ALL_COMPLETED)
+        finally:
+            for future in pending:
+                future.cancel()
+        return rv
+
+    def _calculatePoints(self, server, keys, points):
+        """Calculate PDFs for a list of grid points with a configured
+        server, return 2-D array with one row per point.
+        """
+        rv = numpy.empty((len(points), self.rlen))
+        for row, point in zip(rv, points):
+            for key, value in zip(keys, point):
+                if isinstance(key, str):
+                    server.setvar(key, value)
+                else:
+                    server.setpar(key, value)
+            server.calc()
+            row[:] = server.getpdf_fit()
+        return rv
+
+    def _configureServer(self, server):
+        """Load structures, r-grid and parameters to a clean PdfFit server.
+
+        server -- PdfFit instance from the server pool
+        """
         # structure needs to be read before dataset allocation
         for struc in self.owner.strucs:
             server.read_struct_string(struc.writeStr("pdffit"))
@@ -178,13 +282,7 @@ class Calculation(PDFComponent):
             # fix if fixed.  Note: all parameters are free after server.reset().
             if par.fixed:
                 server.fixpar(index)
-
-        # all ready here
-        server.calc()
-
-        # get results
-        self.rcalc = server.getR()
-        self.Gcalc = server.getpdf_fit()
+        return
 
     def write(self, filename):
         """Write this calculated PDF to a file.
@@ -297,6 +395,7 @@ class Calculation(PDFComponent):
 
         returns reference to copied object
         """
+        self.ensureLoaded()
         if other is None:
             other = Calculation(self.name)
 
@@ -348,6 +447,7 @@ class Calculation(PDFComponent):
 
         returns data object, be it a single number, a list, or a list of list
         """
+        self.ensureLoaded()
         if dataname not in ["rcalc", "Gcalc"]:
             emsg = "%s is not valid dataname" % dataname
             raise ControlKeyError(emsg)
@@ -369,6 +469,52 @@ class Calculation(PDFComponent):
 
 # End of class Calculation
 
+
+def _calculateProcess(owner, index):
+    """Calculate PDF of one calculation in a worker process.
+
+    This is the target of the process pool used by
+    Fitting._startCalculations().
+
+    owner  -- stripped copy of the Fitting with resolved parameters
+    index  -- index of the Calculation in owner.calcs
+
+    returns tuple of (rcalc, Gcalc, output), where output is the
+    engine output of the calculation.
+    """
+    from diffpy.pdfgui.control.pdfguicontrol import pdfguicontrol
+
+    owner.controlCenter = pdfguicontrol()
+    owner.controlCenter.redirectStdout()
+    calc = owner.calcs[index]
+    calc.calculate()
+    return calc.rcalc, calc.Gcalc, owner.controlCenter.getEngineOutput()
+
+
+def _calculateGridChunk(owner, index, keys, points):
+    """Calculate PDFs for a chunk of grid points in a worker process.
+
+    This is the target of the process pool used by
+    Calculation.calculateGrid().
+
+    owner  -- stripped copy of the Fitting with resolved parameters
+    index  -- index of the Calculation in owner.calcs
+    keys   -- list of parameter indices and engine variable names
+    points -- list of value tuples for keys
+
+    returns 2-D array with one row of G(r) per point.
+    """
+    from diffpy.pdfgui.control.pdfguicontrol import pdfguicontrol
+
+    owner.controlCenter = pdfguicontrol()
+    # keep engine output of the worker off the console
+    owner.controlCenter.redirectStdout()
+    calc = owner.calcs[index]
+    with owner.controlCenter.serverPool.lease() as server:
+        calc._configureServer(server)
+        return calc._calculatePoints(server, keys, points)
+
+
 # simple test code
 if __name__ == "__main__":
     Calculation("name")
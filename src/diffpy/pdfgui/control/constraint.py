@@ -17,6 +17,7 @@ constraints will be stored in { variable : constraint } dictionary."""
 
 import math
 import re
+from functools import lru_cache
 
 from diffpy.pdfgui.control.controlerrors import ControlSyntaxError
 
@@ -34,8 +35,13 @@ class Constraint:
 
     Private members:
         __lhs    -- last value of constrained variable passed to guess()
+        __fncp   -- lambda function compiled from formula, reset when
+                    formula is assigned.  It is not pickled.
     """
 
+    # default for instances unpickled from project files
+    __fncp = None
+
     def __init__(self, formula, value=None):
         """Initialize the Constraint.
 
@@ -68,13 +74,14 @@ class Constraint:
 
     def lambdaFormula(self):
         """Build lambda function from constraint formula. Lambda
-        function expects dictionary argument.
+        function expects dictionary argument.  The function is compiled
+        once and reused until formula changes.
 
         returns lambda function
         """
-        expr = re.sub(r"@(\d*)", r"p[\1]", self.formula)
-        f = eval("lambda p:" + expr, vars(math))
-        return f
+        if self.__fncp is None:
+            self.__fncp = eval("lambda p:" + _pythonExpression(self.formula), vars(math))
+        return self.__fncp
 
     def guess(self, value):
         """Guess the initial values of parameters contained in parguess.
@@ -137,12 +144,52 @@ class Constraint:
             raise ControlSyntaxError(emsg)
         # checks checked
         self.__dict__["formula"] = newformula
+        self.__fncp = None
         self.parguess = dict.fromkeys([int(p[1:]) for p in pars])
         if self.__lhs is not None:
             self.guess(self.__lhs)
         return
 
+    def __getstate__(self):
+        """Pickle state without the compiled lambda function."""
+        state = dict(self.__dict__)
+        state.pop("_Constraint__fncp", None)
+        return state
+
 
 # End of class Constraint
 
+
+def evalConstraints(constraints, parvalues):
+    """Evaluate many constraint formulas in a single call.
+
+    constraints -- dictionary of constrained variables and Constraint
+                   instances
+    parvalues   -- dictionary of int parameter indices and float values.
+
+    returns dictionary of variables and formula results
+    """
+    formulas = tuple(con.formula for con in constraints.values())
+    values = _batchFormula(formulas)(parvalues)
+    return dict(zip(constraints, values))
+
+
+@lru_cache(maxsize=32)
+def _batchFormula(formulas):
+    """Compile lambda function that evaluates formulas to a tuple.
+
+    formulas -- tuple of constraint formulas
+
+    returns lambda function that expects dictionary argument
+    """
+    exprs = "".join(_pythonExpression(f) + ",\n" for f in formulas)
+    return eval("lambda p: (" + exprs + ")", vars(math))
+
+
+def _pythonExpression(formula):
+    """Python expression of formula with parameters taken from
+    dictionary p."""
+    return re.sub(r"@(\d*)", r"p[\1]", formula)
+
+
 # End of file
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Concurrent reading of many PDF data files, used by the temperature
+and doping series macros."""
+
+import os.path
+
+from diffpy.pdfgui.control.controlerrors import ControlError
+from diffpy.pdfgui.control.fitdataset import FitDataSet
+
+
+def readDataSets(paths, workers=None, processes=False):
+    """Read PDF data files in a pool of threads or processes.
+
+    paths     -- list of data file paths
+    workers   -- maximum number of concurrent readers, use the
+                 concurrent.futures default when None
+    processes -- flag for reading in separate processes instead of
+                 threads, faster for many large files
+
+    returns list of (dataset, error) pairs in the order of paths.
+    dataset is a FitDataSet named after the file basename or None when
+    the file could not be read, error is None or the error message.
+    """
+    import concurrent.futures
+
+    paths = list(paths)
+    if not paths:
+        return []
+    if processes:
+        import multiprocessing
+
+        ctx = multiprocessing.get_context("spawn")
+        executor = concurrent.futures.ProcessPoolExecutor(workers, mp_context=ctx)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(workers)
+    # _readDataSet does not raise, map keeps the order of paths
+    with executor:
+        rv = list(executor.map(_readDataSet, paths, chunksize=16))
+    return rv
+
+
+def _readDataSet(path):
+    """Read one data file, return (dataset, error) pair."""
+    basename = os.path.basename(path)
+    try:
+        dataset = FitDataSet(basename)
+        dataset.readObs(path)
+    except ControlError as error:
+        return (None, str(error))
+    except (IOError, OSError, ValueError) as error:
+        emsg = "Could not open '%s'. [%s]" % (basename, error)
+        return (None, emsg)
+    return (dataset, None)
+
+
+# End of file
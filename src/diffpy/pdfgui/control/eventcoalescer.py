@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Throttling of the events posted by the control to the gui."""
+
+import threading
+import time
+
+from diffpy.pdfgui.control.controlerrors import ControlValueError
+
+
+class EventCoalescer:
+    """Merge repeated control events and deliver them at a limited rate.
+
+    Events are keyed by their type and the job object they refer to.
+    An event that is already waiting for delivery is dropped, the gui
+    handlers read the current state of the job, so the last delivered
+    event always shows the final state.  Pending events are delivered
+    together in the order of their first posting, at most maxrate
+    times per second.  Urgent events are delivered immediately after
+    any pending ones.
+
+    Data members:
+        deliver   -- function of (type, info) that passes event to gui
+        urgent    -- bit mask of event types that are never delayed
+        delivered -- number of delivered events
+        merged    -- number of events merged with pending ones
+    """
+
+    def __init__(self, deliver, maxrate=None, urgent=0):
+        """Create EventCoalescer.
+
+        deliver -- function of (type, info) called for every delivered
+                   event, possibly from a timer thread
+        maxrate -- maximum number of deliveries per second,
+                   no throttling when None or 0
+        urgent  -- bit mask of event types that are never delayed
+        """
+        self.deliver = deliver
+        self.urgent = urgent
+        self.delivered = 0
+        self.merged = 0
+        self._interval = 0.0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self._lastflush = None
+        self.setMaxRate(maxrate)
+        return
+
+    def setMaxRate(self, maxrate):
+        """Set maximum number of deliveries per second.
+
+        maxrate -- positive number, None or 0 to deliver every event
+                   immediately
+
+        raises ControlValueError for negative or invalid maxrate.
+        """
+        try:
+            rate = float(maxrate or 0)
+        except (TypeError, ValueError):
+            raise ControlValueError("Invalid event rate %r." % (maxrate,))
+        if not rate >= 0:
+            raise ControlValueError("Event rate must be non-negative.")
+        self._interval = rate and 1.0 / rate
+        if not self._interval:
+            self.flush()
+        return
+
+    def getMaxRate(self):
+        """Maximum number of deliveries per second, 0 when unlimited."""
+        return self._interval and 1.0 / self._interval
+
+    maxrate = property(getMaxRate, setMaxRate)
+
+    def postEvent(self, type, info):
+        """Queue event for delivery, same signature as the gui postEvent.
+
+        type -- event type, a bit flag defined by the gui
+        info -- job object or message attached to the event
+        """
+        if not self._interval or type & self.urgent:
+            self.flush()
+            self._deliver([(type, info)])
+            return
+        with self._lock:
+            key = (type, id(info))
+            if key in self._pending:
+                self.merged += 1
+                return
+            self._pending[key] = (type, info)
+            if self._timer is not None:
+                return
+            delay = 0.0
+            if self._lastflush is not None:
+                delay = self._lastflush + self._interval - time.monotonic()
+            if delay > 0:
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
+        return
+
+    def flush(self):
+        """Deliver all pending events now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            events = list(self._pending.values())
+            self._pending.clear()
+            if events:
+                self._lastflush = time.monotonic()
+        self._deliver(events)
+        return
+
+    def close(self):
+        """Discard pending events and stop the delivery timer."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending.clear()
+        return
+
+    def pending(self):
+        """Number of events waiting for delivery."""
+        return len(self._pending)
+
+    # protected methods
+
+    def _deliver(self, events):
+        """Pass events to the deliver function."""
+        for type, info in events:
+            self.deliver(type, info)
+            self.delivered += 1
+        return
+
+
+# End of class EventCoalescer
+
+# End of file
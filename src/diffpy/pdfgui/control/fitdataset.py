@@ -16,14 +16,26 @@
 parameters."""
 
 import copy
+import itertools
+from collections import Counter
 
 import numpy
 
+from diffpy.pdfgui.control.constraint import evalConstraints
 from diffpy.pdfgui.control.controlerrors import ControlStatusError
 from diffpy.pdfgui.control.parameter import Parameter
-from diffpy.pdfgui.control.pdfdataset import PDFDataSet
+from diffpy.pdfgui.control.pdfdataset import PDFDataSet, asDataArray
 from diffpy.utils.resampler import wsinterp
 
+# unique versions of observed and calculated data
+_versions = itertools.count(1)
+
+# half-width of the window for Whittaker-Shannon interpolation in
+# data points for the "Nyquist-fast" sampling type
+SINC_HALFWIDTH = 32
+# maximum number of elements in temporary arrays of sinc interpolation
+_SINC_BLOCK = 1 << 16
+
 
 class FitDataSet(PDFDataSet):
     """FitDataSet stores experimental and calculated PDF data and
@@ -40,17 +52,21 @@ class FitDataSet(PDFDataSet):
 
     Calculated members:
 
-    rcalc       -- list of r points where Gcalc is calculated, cached property
-    Gcalc       -- list of calculated G values, cached property
-    dGcalc      -- list of standard deviations of Gcalc, cached property
+    rcalc       -- r points where Gcalc is calculated, cached property
+    Gcalc       -- calculated G values, cached property
+    dGcalc      -- standard deviations of Gcalc, cached property
     Gtrunc      -- Gobs resampled to rcalc grid, cached property
     dGtrunc     -- dGobs resampled to rcalc grid, cached property
     Gdiff       -- difference curve, Gdiff = Gtrunc - Gcalc, property
     crw         -- cumulative rw of the fit
 
-    The data in rcalc, Gcalc, dGcalc, Gtrunc, dGtrunc are recalculated
-    and cached when r-sampling changes.  Any change to fitrmin,
-    fitrmax and fitrstep sets the _rcalc_changed flag.
+    The calculated members are DataArray instances.  The data in rcalc,
+    Gcalc, dGcalc are resampled when r-sampling changes.  Any change
+    to robs, Gobs, dGobs, fitrmin, fitrmax and fitrstep sets the
+    _rcalc_changed flag.  Gtrunc, dGtrunc and Gdiff are cached with
+    the versions of the observed data, rcalc and Gcalc they were
+    computed from.  Use getCacheStats() to obtain the cache hits and
+    misses.
 
     Refinable variables:  qdamp, qbroad, dscale
     Note: self.refvar is the same as self.initial[refvar].
@@ -58,8 +74,14 @@ class FitDataSet(PDFDataSet):
     Class data:
 
     persistentItems -- list of attributes saved in project file
+    windowedSinc    -- flag for resampling at Nyquist sampling with the
+                       windowed sinc kernel instead of the full sum,
+                       set by the "Nyquist-fast" sampling type
     """
 
+    # default for instances saved before windowedSinc was added
+    windowedSinc = False
+
     persistentItems = [
         "rcalc",
         "Gcalc",
@@ -67,6 +89,7 @@ class FitDataSet(PDFDataSet):
         "fitrmin",
         "fitrmax",
         "fitrstep",
+        "windowedSinc",
         "initial",
         "refined",
     ]
@@ -78,6 +101,8 @@ class FitDataSet(PDFDataSet):
         """
         self.initial = {}
         self.refined = {}
+        self._cachehits = Counter()
+        self._cachemisses = Counter()
         PDFDataSet.__init__(self, name)
         self.clear()
         return
@@ -88,8 +113,21 @@ class FitDataSet(PDFDataSet):
             self.initial[name] = value
         else:
             PDFDataSet.__setattr__(self, name, value)
+        if name in FitDataSet._obsItems:
+            self.__dict__["_obsversion"] = next(_versions)
+            self.__dict__["_rcalc_changed"] = True
         return
 
+    # observed data that invalidate rcalc and the cached arrays
+    _obsItems = frozenset(("robs", "Gobs", "drobs", "dGobs"))
+
+    def __getstate__(self):
+        """Drop cached arrays, their versions are unique to a
+        process."""
+        state = self.__dict__.copy()
+        state["_cache"] = {}
+        return state
+
     def __getattr__(self, name):
         """Obtain refinable variables from self.initial.
 
@@ -137,6 +175,7 @@ class FitDataSet(PDFDataSet):
 
         returns data object, be it a single number, a list, or a list of list
         """
+        self.ensureLoaded()
         # FIXME: for next plot interface, we need find how many steps the
         # plotter is requiring for and make exact same number of copies of
         # data in below
@@ -162,15 +201,18 @@ class FitDataSet(PDFDataSet):
         """Reset all data members to initial empty values."""
         PDFDataSet.clear(self)
         self._rcalc_changed = True
-        self._rcalc = []
-        self._Gcalc = []
-        self._dGcalc = []
-        self._Gtrunc = []
-        self._dGtrunc = []
-        self._crw = []
+        self._rcalc = asDataArray([])
+        self._rcalcversion = next(_versions)
+        self._Gcalc = asDataArray([])
+        self._calcversion = next(_versions)
+        self._dGcalc = asDataArray([])
+        self._crw = asDataArray([])
+        # dictionary of {name : (key, value)} for cached arrays
+        self._cache = {}
         self._fitrmin = 0.5
         self._fitrmax = None
         self._fitrstep = None
+        self.windowedSinc = False
         self.constraints = {}
         self.refined = {}
         return
@@ -279,7 +321,7 @@ class FitDataSet(PDFDataSet):
 
         Return data string.
         """
-        if self.Gcalc == []:
+        if not len(self.Gcalc):
             raise ControlStatusError("Gcalc not available")
         import time
         from getpass import getuser
@@ -319,11 +361,10 @@ class FitDataSet(PDFDataSet):
         # write data:
         lines.append("##### start data")
         lines.append("#L r(A) G(r) d_r d_Gr Gdiff")
-        # cache Gdiff here so it is not calculated many times
-        Gdiff = self.Gdiff
         drcalc = 0.0
-        for i in range(len(self.rcalc)):
-            lines.append("%g %g %.1f %g %g" % (self.rcalc[i], self.Gcalc[i], drcalc, self.dGcalc[i], Gdiff[i]))
+        columns = [a.tolist() for a in (self.rcalc, self.Gcalc, self.dGcalc, self.Gdiff)]
+        for r, G, dG, Gdiff in zip(*columns):
+            lines.append("%g %g %.1f %g %g" % (r, G, drcalc, dG, Gdiff))
         # lines are ready here
         datastring = "\n".join(lines) + "\n"
         return datastring
@@ -345,6 +386,21 @@ class FitDataSet(PDFDataSet):
         """
         return PDFDataSet.writeStr(self)
 
+    def _obsDigest(self):
+        """Digest of observed data and of the metadata saved by
+        writeObsStr(), excluding the time stamp.
+
+        Return hexadecimal string.
+        """
+        import hashlib
+
+        header = (self.stype, self.qmax, self.qdamp, self.qbroad, self.dscale)
+        h = hashlib.sha1(repr(header).encode())
+        h.update(repr(sorted(self.metadata.items())).encode())
+        for a in (self.robs, self.Gobs, self.drobs, self.dGobs):
+            h.update(numpy.asarray(a, dtype=float).tobytes())
+        return h.hexdigest()
+
     def _resampledPDFDataSet(self):
         """Return instance of PDFDataSet with resampled observed data.
 
@@ -353,7 +409,7 @@ class FitDataSet(PDFDataSet):
         resampled = PDFDataSet(self.name)
         self.copy(resampled)
         resampled.robs = self.rcalc
-        resampled.drobs = len(self.rcalc) * [0.0]
+        resampled.drobs = asDataArray(numpy.zeros(len(self.rcalc)))
         resampled.Gobs = self.Gtrunc
         resampled.dGobs = self.dGtrunc
         return resampled
@@ -413,9 +469,9 @@ class FitDataSet(PDFDataSet):
             else:
                 parvalues[pidx] = float(par)
         # evaluate constraints
-        for var, con in self.constraints.items():
+        for var, value in evalConstraints(self.constraints, parvalues).items():
             # __setattr__ assigns var in self.initial
-            self.setvar(var, con.evalFormula(parvalues))
+            self.setvar(var, value)
         return
 
     def changeParameterIndex(self, oldidx, newidx):
@@ -440,6 +496,7 @@ class FitDataSet(PDFDataSet):
 
         returns reference to copied object
         """
+        self.ensureLoaded()
         # check arguments
         if other is None:
             other = FitDataSet(self.name)
@@ -449,6 +506,7 @@ class FitDataSet(PDFDataSet):
             other._fitrmin = self._fitrmin
             other._fitrmax = self._fitrmax
             other._fitrstep = self._fitrstep
+            other.windowedSinc = self.windowedSinc
             other._rcalc_changed = self._rcalc_changed
             # copied attributes
             other.constraints = copy.deepcopy(self.constraints)
@@ -507,16 +565,21 @@ class FitDataSet(PDFDataSet):
     def save(self, z, subpath):
         """Save data to a zipped project file.
 
-        z       -- zipped project file
+        z       -- ProjectWriter for the zipped project file
         subpath -- path to its own storage within project file
         """
         from diffpy.pdfgui.utils import safeCPickleDumps
 
-        # write raw data
-        z.writestr(subpath + "obs", self.writeObsStr())
+        # write raw data, keep the saved copy with its time stamp when
+        # the observed data did not change
+        z.writeCached(subpath + "obs", self._obsDigest(), self.writeObsStr)
         content = {}
         for item in FitDataSet.persistentItems:
-            content[item] = getattr(self, item, None)
+            value = getattr(self, item, None)
+            # project files keep plain lists
+            if isinstance(value, numpy.ndarray):
+                value = value.tolist()
+            content[item] = value
         spkl = safeCPickleDumps(content)
         z.writestr(subpath + "calc", spkl)
 
@@ -533,14 +596,14 @@ class FitDataSet(PDFDataSet):
         compares self.fitrstep with r-sampling in the observed data and
         with Nyquist r step.
 
-        Return a string, possible values are "data", "Nyquist" or
-        "custom".
+        Return a string, possible values are "data", "Nyquist",
+        "Nyquist-fast" or "custom".
         """
         eps = 1e-8
         if abs(self.fitrstep - self.getObsSampling()) < eps:
             rv = "data"
         elif abs(self.fitrstep - self.getNyquistSampling()) < eps:
-            rv = "Nyquist"
+            rv = "Nyquist-fast" if self.windowedSinc else "Nyquist"
         else:
             rv = "custom"
         return rv
@@ -551,6 +614,8 @@ class FitDataSet(PDFDataSet):
         tp    -- description of fit sampling type.  Possible values are
                  "data"    ... same as used in experimental PDF
                  "Nyquist" ... sampling at Nyquist spacing
+                 "Nyquist-fast" ... Nyquist spacing with approximate
+                               resampling by windowed sinc kernel
                  "custom"  ... user specified value
         value -- new value of fitrstep, only used when tp is "custom".
 
@@ -560,13 +625,14 @@ class FitDataSet(PDFDataSet):
         """
         if tp == "data":
             self.fitrstep = self.getObsSampling()
-        elif tp == "Nyquist":
+        elif tp in ("Nyquist", "Nyquist-fast"):
             self.fitrstep = self.getNyquistSampling()
         elif tp == "custom":
             self.fitrstep = max(value, self.getObsSampling())
         else:
             emsg = "Invalid value for fit sampling type."
             raise ValueError(emsg)
+        self.windowedSinc = tp == "Nyquist-fast"
         return
 
     def getObsSampling(self):
@@ -591,6 +657,47 @@ class FitDataSet(PDFDataSet):
             rv = self.getObsSampling()
         return rv
 
+    # cache of derived arrays
+
+    def getCacheStats(self):
+        """Hits and misses of the cached rcalc, Gtrunc, dGtrunc and
+        Gdiff arrays.
+
+        returns dictionary of {name : (hits, misses)}
+        """
+        names = set(self._cachehits) | set(self._cachemisses)
+        return dict((n, (self._cachehits[n], self._cachemisses[n])) for n in names)
+
+    def resetCacheStats(self):
+        """Reset counters of the cache hits and misses."""
+        self._cachehits.clear()
+        self._cachemisses.clear()
+        return
+
+    def _cached(self, name, key, factory):
+        """Return cached array or store a new one from factory().
+
+        name    -- name of the cached array
+        key     -- tuple of versions the array depends on
+        factory -- function that computes the array
+
+        returns read-only DataArray
+        """
+        entry = self._cache.get(name)
+        if entry is not None and entry[0] == key:
+            self._cachehits[name] += 1
+            return entry[1]
+        self._cachemisses[name] += 1
+        value = asDataArray(factory())
+        value.flags.writeable = False
+        self._cache[name] = (key, value)
+        return value
+
+    def _truncKey(self):
+        """Cache key of arrays resampled from the observed data."""
+        self._updateRcalcSampling()
+        return (self._obsversion, self._rcalcversion, self.getFitSamplingType())
+
     # Property Attributes
 
     def _updateRcalcSampling(self):
@@ -601,16 +708,16 @@ class FitDataSet(PDFDataSet):
         No return value.
         """
         if not self._rcalc_changed:
+            self._cachehits["rcalc"] += 1
             return
+        self._cachemisses["rcalc"] += 1
         frmin, frmax = self.fitrmin, self.fitrmax
         frstep = float(self.fitrstep)
         # new rcalc must cover the whole [fitrmin, fitrmax] interval
         # otherwise pdffit2 would complain
-        robs_below = [ri for ri in self.robs if ri < frmin]
-        if robs_below:
-            rcalcfirst = robs_below[-1]
-        else:
-            rcalcfirst = self.robs[0]
+        robs = self.robs
+        nbelow = numpy.searchsorted(robs, frmin)
+        rcalcfirst = robs[nbelow - 1] if nbelow else robs[0]
         nrcalc = numpy.round(1.0 * (frmax - rcalcfirst) / frstep)
         if frmax - (rcalcfirst + nrcalc * frstep) > frstep * 1e-8:
             nrcalc += 1
@@ -619,16 +726,16 @@ class FitDataSet(PDFDataSet):
         # Gcalc:
         if len(self._Gcalc) > 0:
             newGcalc = grid_interpolation(self._rcalc, self._Gcalc, newrcalc, tp=tp)
-            self._Gcalc = list(newGcalc)
+            self._Gcalc = asDataArray(newGcalc)
+            self._calcversion = next(_versions)
         # dGcalc
         if len(self._dGcalc) > 0:
             newdGcalc = grid_interpolation(self._rcalc, self._dGcalc, newrcalc, tp=tp)
-            self._dGcalc = list(newdGcalc)
-        # invalidate Gtrunc and dGtrunc
-        self._Gtrunc = []
-        self._dGtrunc = []
-        # everything has been interpolated here, we can overwrite _rcalc
-        self._rcalc = list(newrcalc)
+            self._dGcalc = asDataArray(newdGcalc)
+        # everything has been interpolated here, we can overwrite _rcalc,
+        # the new version invalidates Gtrunc and dGtrunc
+        self._rcalc = asDataArray(newrcalc)
+        self._rcalcversion = next(_versions)
         # and finally set flag for up to date cache
         self._rcalc_changed = False
         return
@@ -639,8 +746,10 @@ class FitDataSet(PDFDataSet):
         return self._fitrmin
 
     def _set_fitrmin(self, value):
-        self._rcalc_changed = True
-        self._fitrmin = float(value)
+        value = float(value)
+        if value != self._fitrmin:
+            self._rcalc_changed = True
+        self._fitrmin = value
         return
 
     fitrmin = property(_get_fitrmin, _set_fitrmin, doc="Lower boundary for simulated PDF curve.")
@@ -651,8 +760,10 @@ class FitDataSet(PDFDataSet):
         return self._fitrmax
 
     def _set_fitrmax(self, value):
-        self._rcalc_changed = True
-        self._fitrmax = float(value)
+        value = float(value)
+        if value != self._fitrmax:
+            self._rcalc_changed = True
+        self._fitrmax = value
         return
 
     fitrmax = property(_get_fitrmax, _set_fitrmax, doc="Upper boundary for simulated PDF curve.")
@@ -663,8 +774,10 @@ class FitDataSet(PDFDataSet):
         return self._fitrstep
 
     def _set_fitrstep(self, value):
-        self._rcalc_changed = True
-        self._fitrstep = float(value)
+        value = float(value)
+        if value != self._fitrstep:
+            self._rcalc_changed = True
+        self._fitrstep = value
         return
 
     fitrstep = property(_get_fitrstep, _set_fitrstep, doc="R-step used for simulated PDF curve.")
@@ -676,7 +789,8 @@ class FitDataSet(PDFDataSet):
         return self._rcalc
 
     def _set_rcalc(self, value):
-        self._rcalc = value
+        self._rcalc = asDataArray(value)
+        self._rcalcversion = next(_versions)
         return
 
     rcalc = property(
@@ -693,7 +807,8 @@ class FitDataSet(PDFDataSet):
         return self._Gcalc
 
     def _set_Gcalc(self, value):
-        self._Gcalc = value
+        self._Gcalc = asDataArray(value)
+        self._calcversion = next(_versions)
         return
 
     Gcalc = property(_get_Gcalc, _set_Gcalc, doc="List of calculate G values.")
@@ -705,7 +820,7 @@ class FitDataSet(PDFDataSet):
         return self._dGcalc
 
     def _set_dGcalc(self, value):
-        self._dGcalc = value
+        self._dGcalc = asDataArray(value)
         return
 
     dGcalc = property(_get_dGcalc, _set_dGcalc, doc="List of standard deviations of Gcalc.")
@@ -713,15 +828,16 @@ class FitDataSet(PDFDataSet):
     # Gtrunc
 
     def _get_Gtrunc(self):
-        self._updateRcalcSampling()
-        if not self._Gtrunc:
-            tp = self.getFitSamplingType()
-            newGtrunc = grid_interpolation(self.robs, self.Gobs, self.rcalc, tp=tp)
-            self._Gtrunc = list(newGtrunc)
-        return self._Gtrunc
+        key = self._truncKey()
+        tp = self.getFitSamplingType()
+        return self._cached(
+            "Gtrunc",
+            key,
+            lambda: grid_interpolation(self.robs, self.Gobs, self._rcalc, tp=tp),
+        )
 
     def _set_Gtrunc(self, value):
-        self._Gtrunc = value
+        self._cache["Gtrunc"] = (self._truncKey(), asDataArray(value))
         return
 
     Gtrunc = property(_get_Gtrunc, _set_Gtrunc, doc="Gobs resampled to rcalc grid.")
@@ -729,23 +845,24 @@ class FitDataSet(PDFDataSet):
     # dGtrunc
 
     def _get_dGtrunc(self):
-        self._updateRcalcSampling()
-        if not self._dGtrunc:
-            tp = self.getFitSamplingType()
-            # use sum to avoid index error for empty arrays
-            newdGtrunc = grid_interpolation(
+        key = self._truncKey()
+        tp = self.getFitSamplingType()
+        # use sum to avoid index error for empty arrays
+        return self._cached(
+            "dGtrunc",
+            key,
+            lambda: grid_interpolation(
                 self.robs,
                 self.dGobs,
-                self.rcalc,
+                self._rcalc,
                 left=sum(self.dGobs[:1]),
                 right=sum(self.dGobs[-1:]),
                 tp=tp,
-            )
-            self._dGtrunc = list(newdGtrunc)
-        return self._dGtrunc
+            ),
+        )
 
     def _set_dGtrunc(self, value):
-        self._dGtrunc = value
+        self._cache["dGtrunc"] = (self._truncKey(), asDataArray(value))
         return
 
     dGtrunc = property(_get_dGtrunc, _set_dGtrunc, doc="dGobs resampled to rcalc grid.")
@@ -753,11 +870,13 @@ class FitDataSet(PDFDataSet):
     # Gdiff
 
     def _get_Gdiff(self):
-        if len(self.Gcalc):
-            rv = [(yo - yc) for yo, yc in zip(self.Gtrunc, self.Gcalc)]
-        else:
-            rv = []
-        return rv
+        Gcalc = self.Gcalc
+        if not len(Gcalc):
+            return asDataArray([])
+        Gtrunc = self.Gtrunc
+        n = min(len(Gtrunc), len(Gcalc))
+        key = self._truncKey() + (self._calcversion,)
+        return self._cached("Gdiff", key, lambda: Gtrunc[:n] - Gcalc[:n])
 
     Gdiff = property(_get_Gdiff, doc="Difference between observed and calculated PDF on rcalc grid.")
 
@@ -768,9 +887,9 @@ class FitDataSet(PDFDataSet):
 
     def _set_crw(self, value):
         if len(value) != len(self.rcalc):
-            self._crw = [0.0] * len(self.rcalc)
+            self._crw = asDataArray(numpy.zeros(len(self.rcalc)))
         else:
-            self._crw = value[:]
+            self._crw = asDataArray(value)
         return
 
     crw = property(_get_crw, _set_crw, doc="cumulative rw on rcalc grid")
@@ -818,7 +937,61 @@ def _linear_interpolation(x0, y0, x1, youtleft, youtright):
     return y1
 
 
-def grid_interpolation(x0, y0, x1, left=None, right=None, tp=None):
+def _sinc_interpolation(x0, y0, x1, left=None, right=None, halfwidth=SINC_HALFWIDTH):
+    """Whittaker-Shannon interpolation evaluated in blocks of bounded
+    size.
+
+    The windowed version sums only over halfwidth data points on either
+    side of each new point, with the sinc kernel tapered by a Lanczos
+    window.  For the test PDF data sampled at 0.01 A the maximum
+    deviation from the full sum is below 1e-3 of the maximum of |y0|
+    for the default halfwidth.  The full sum, which is the same as in
+    wsinterp, is used when halfwidth is None.
+
+    x0, y0    -- original values on equally spaced grid
+    x1        -- new grid
+    left      -- value for x1 below the x0 range, by default y0[0]
+    right     -- value for x1 above the x0 range, by default y0[-1]
+    halfwidth -- number of data points on either side of the new point
+                 or None for summation over all data points
+
+    returns numpy.ndarray of interpolated values on x1.
+    """
+    x0 = numpy.asarray(x0, dtype=float)
+    y0 = numpy.asarray(y0, dtype=float)
+    x1 = numpy.asarray(x1, dtype=float)
+    n0 = len(x0)
+    # wsinterp handles, or rejects, grids without step
+    if n0 < 2:
+        return wsinterp(x1, x0, y0, left, right)
+    # positions of new points in units of the data step
+    u = (x1 - x0[0]) / (x0[1] - x0[0])
+    y1 = numpy.empty(len(x1))
+    if halfwidth is None:
+        k = numpy.arange(n0)
+        nrows = max(1, _SINC_BLOCK // n0)
+        for lo in range(0, len(u), nrows):
+            ub = u[lo : lo + nrows]
+            y1[lo : lo + nrows] = numpy.dot(numpy.sinc(ub[:, None] - k), y0)
+    else:
+        w = int(halfwidth)
+        offsets = numpy.arange(1 - w, w + 1)
+        nrows = max(1, _SINC_BLOCK // len(offsets))
+        for lo in range(0, len(u), nrows):
+            ub = u[lo : lo + nrows]
+            k = numpy.floor(ub).astype(int)[:, None] + offsets
+            d = ub[:, None] - k
+            kernel = numpy.sinc(d) * numpy.sinc(d / w)
+            outside = (k < 0) | (k >= n0)
+            kernel[outside] = 0.0
+            k[outside] = 0
+            y1[lo : lo + nrows] = numpy.sum(kernel * y0[k], axis=1)
+    y1[x1 < x0[0]] = y0[0] if left is None else left
+    y1[x1 > x0[-1]] = y0[-1] if right is None else right
+    return y1
+
+
+def grid_interpolation(x0, y0, x1, left=None, right=None, tp=None, halfwidth=SINC_HALFWIDTH):
     """Interpolate values from one grid onto another using either linear
     or Whittaker–Shannon interpolation.
 
@@ -830,16 +1003,20 @@ def grid_interpolation(x0, y0, x1, left=None, right=None, tp=None):
         Original values defined on x0.
     x1 : array_like
         New x-grid upon which to interpolate.
-    tp : {'data', 'Nyquist', 'custom'}, optional
+    tp : {'data', 'Nyquist', 'Nyquist-fast', 'custom'}, optional
         Corresponding fit sampling type. Use Whittaker–Shannon interpolation
         for Nyquist resampling and linear interpolation otherwise.
         If not provided, linear interpolation is used.
+    halfwidth : int, optional
+        Number of data points on either side of a new point summed in
+        Whittaker–Shannon interpolation with a Lanczos window for
+        tp='Nyquist-fast'.  Default: SINC_HALFWIDTH.
     left : float, optional
         Value for interpolated y1 for x1 below the x0 range.
-        Default: if tp='Nyquist' then y1[0] is used. Otherwise 0.0 is used.
+        Default: for Nyquist sampling y1[0] is used. Otherwise 0.0 is used.
     right : float, optional
         Value for interpolated y1 for x1 above the x0 range.
-        Default: if tp='Nyquist' then y1[-1] is used. Otherwise 0.0 is used.
+        Default: for Nyquist sampling y1[-1] is used. Otherwise 0.0 is used.
 
     Returns
     -------
@@ -848,14 +1025,15 @@ def grid_interpolation(x0, y0, x1, left=None, right=None, tp=None):
 
     Notes
     -----
-    When tp='Nyquist', the function calls :func:`wsinterp` to perform Whittaker–Shannon interpolation.
+    When tp='Nyquist', the function calls :func:`_sinc_interpolation` to perform Whittaker–Shannon
+    interpolation with the full sum, which gives the same result as :func:`wsinterp` with bounded
+    memory use.  tp='Nyquist-fast' sums only over the window of halfwidth points.
     Otherwise it uses the internal :func:`_linear_interpolation` routine.
     """
     if tp == "Nyquist":
-        x0 = numpy.asarray(x0)
-        x1 = numpy.asarray(x1)
-        y0 = numpy.asarray(y0)
-        return wsinterp(x1, x0, y0, left, right)
+        return _sinc_interpolation(x0, y0, x1, left, right, halfwidth=None)
+    elif tp == "Nyquist-fast":
+        return _sinc_interpolation(x0, y0, x1, left, right, halfwidth)
     else:
         left = 0.0 if left is None else left
         right = 0.0 if right is None else right
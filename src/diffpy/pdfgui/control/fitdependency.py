@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Dependency graph of fittings linked by parameter initial values and
+timing record of the scheduled refinements."""
+
+import time
+
+from diffpy.pdfgui.control.controlerrors import ControlRuntimeError
+from diffpy.pdfgui.control.fitting import Fitting
+
+
+class FitDependencyGraph:
+    """Directed graph of Fitting objects, where an edge leads from the
+    fitting that provides linked initial values to the fitting that
+    uses them.
+
+    Data members:
+        fits    -- list of Fitting objects in the graph
+        sources -- dictionary of {fit : [source fittings]}
+        targets -- dictionary of {fit : [dependent fittings]}
+    """
+
+    def __init__(self, fits):
+        """Build dependency graph from Parameter links.
+
+        fits -- list of Fitting and Calculation objects, only Fitting
+                objects are added to the graph
+        """
+        self.fits = [f for f in fits if isinstance(f, Fitting)]
+        self.sources = dict((f, []) for f in self.fits)
+        self.targets = dict((f, []) for f in self.fits)
+        for fit in self.fits:
+            for src in fit.getLinkedFittings():
+                if src not in self.sources:
+                    continue
+                self.sources[fit].append(src)
+                self.targets[src].append(fit)
+        return
+
+    def isReady(self, fit, pending):
+        """Check if fit does not depend on any pending fitting.
+
+        fit     -- instance of Fitting
+        pending -- container of fittings that are queued or running
+
+        returns bool
+        """
+        return not any(src in pending for src in self.sources.get(fit, ()))
+
+    def readyFittings(self, queued, running=()):
+        """Find queued fittings whose sources are all finished.
+
+        queued  -- list of queued fittings in the queue order
+        running -- list of running fittings
+
+        returns list of fittings that can be started, in queue order
+        """
+        pending = set(queued) | set(running)
+        return [f for f in queued if self.isReady(f, pending)]
+
+    def topologicalOrder(self):
+        """Sort fittings so that sources precede their dependents.
+
+        returns list of Fitting objects
+        raise ControlRuntimeError for circular links
+        """
+        indegree = dict((f, len(self.sources[f])) for f in self.fits)
+        ready = [f for f in self.fits if indegree[f] == 0]
+        order = []
+        while ready:
+            fit = ready.pop(0)
+            order.append(fit)
+            for tgt in self.targets[fit]:
+                indegree[tgt] -= 1
+                if indegree[tgt] == 0:
+                    ready.append(tgt)
+        if len(order) != len(self.fits):
+            names = [f.name for f in self.fits if indegree[f] > 0]
+            emsg = "Circular parameter links in fittings %s" % ", ".join(names)
+            raise ControlRuntimeError(emsg)
+        return order
+
+    def criticalPath(self, durations):
+        """Find the longest chain of dependent fittings.
+
+        durations -- dictionary of {fit : refinement time}, fittings
+                     that are not included take no time
+
+        returns a tuple of (length, list of fittings in the chain)
+        """
+        length = {}
+        previous = {}
+        for fit in self.topologicalOrder():
+            srcs = self.sources[fit]
+            best = max(srcs, key=lambda s: length[s]) if srcs else None
+            base = length[best] if best is not None else 0.0
+            length[fit] = base + durations.get(fit, 0.0)
+            previous[fit] = best
+        if not length:
+            return 0.0, []
+        fit = max(self.fits, key=lambda f: length[f])
+        total = length[fit]
+        path = []
+        while fit is not None:
+            path.insert(0, fit)
+            fit = previous[fit]
+        return total, path
+
+
+# End of class FitDependencyGraph
+
+
+class FitSchedule:
+    """Record of start and finish times of scheduled fittings.
+
+    Data members:
+        workers -- maximum number of fittings refined at the same time
+        started -- dictionary of {fit : start time}
+        finished -- dictionary of {fit : finish time}
+    """
+
+    def __init__(self, workers=1):
+        """Initialize empty schedule.
+
+        workers -- number of available workers
+        """
+        self.workers = workers
+        self.started = {}
+        self.finished = {}
+        return
+
+    def start(self, fit):
+        """Record start of fit refinement."""
+        self.started[fit] = time.time()
+        self.finished.pop(fit, None)
+        return
+
+    def finish(self, fit):
+        """Record end of fit refinement."""
+        if fit in self.started:
+            self.finished[fit] = time.time()
+        return
+
+    def isComplete(self):
+        """Check if all started fittings have finished."""
+        return len(self.finished) == len(self.started)
+
+    def report(self, graph=None):
+        """Summarize timing of finished fittings.
+
+        graph -- instance of FitDependencyGraph used for the critical
+                 path, when None the graph is built from recorded fits
+
+        returns dictionary with items
+            wallTime           -- time from the first start to last finish
+            busyTime           -- sum of refinement times
+            idleTime           -- unused worker time, workers * wallTime - busyTime
+            criticalPath       -- names of fittings in the longest chain
+            criticalPathLength -- refinement time of the longest chain
+            workers            -- number of workers
+            fits               -- list of per-fit dictionaries with
+                                  name, start, duration and wait times
+        """
+        durations = dict((f, self.finished[f] - self.started[f]) for f in self.finished)
+        if graph is None:
+            graph = FitDependencyGraph(list(self.started))
+        t0 = min(self.started.values()) if self.started else 0.0
+        t1 = max(self.finished.values()) if self.finished else t0
+        wall = t1 - t0
+        busy = sum(durations.values())
+        try:
+            cplength, cpath = graph.criticalPath(durations)
+        except ControlRuntimeError:
+            cplength, cpath = 0.0, []
+        fitinfo = []
+        for fit in sorted(durations, key=lambda f: self.started[f]):
+            # wait is the delay between availability of sources and start
+            ready = [self.finished[s] for s in graph.sources.get(fit, ()) if s in self.finished]
+            ready = max(ready + [t0])
+            fitinfo.append(
+                {
+                    "name": fit.name,
+                    "start": self.started[fit] - t0,
+                    "duration": durations[fit],
+                    "wait": max(0.0, self.started[fit] - ready),
+                }
+            )
+        rv = {
+            "wallTime": wall,
+            "busyTime": busy,
+            "idleTime": max(0.0, self.workers * wall - busy),
+            "criticalPath": [f.name for f in cpath],
+            "criticalPathLength": cplength,
+            "workers": self.workers,
+            "fits": fitinfo,
+        }
+        return rv
+
+
+# End of class FitSchedule
+
+# End of file
@@ -20,7 +20,7 @@ import re
 
 import numpy
 
-from diffpy.pdfgui.control.constraint import Constraint
+from diffpy.pdfgui.control.constraint import Constraint, evalConstraints
 from diffpy.pdfgui.control.controlerrors import ControlTypeError, ControlValueError
 from diffpy.pdfgui.control.parameter import Parameter
 from diffpy.pdfgui.control.pdfstructure import PDFStructure
@@ -37,7 +37,9 @@ class FitStructure(PDFStructure):
     Data members (in addition to those in PDFStructure):
         owner       -- instance of parent Fitting (set in Organizer.add())
         initial     -- initial structure, same as self
-        refined     -- refined structure when available or None
+        refined     -- refined structure when available or None.  Refined
+                       structure obtained from PdfFit server is parsed
+                       when first used, see setRefinedString().
         constraints -- dictionary of { refvar_string : Constraint_instance }
         selected_pairs -- string of selected pairs, by default "all-all".
                        Use setSelectedPairs() and getSelectedPairs() methods
@@ -152,6 +154,44 @@ class FitStructure(PDFStructure):
         """
         return "p_" + self.name
 
+    @property
+    def refined(self):
+        """Refined structure when available or None."""
+        refinedstr = self.__dict__.get("_refinedstr")
+        if refinedstr is not None:
+            refined = self.__dict__.get("_refined")
+            if refined is None:
+                refined = PDFStructure(self.name)
+            refined.readStr(refinedstr, "pdffit")
+            self.__dict__["_refined"] = refined
+            # keep newer string that could arrive from refinement thread
+            if self.__dict__.get("_refinedstr") is refinedstr:
+                self.__dict__["_refinedstr"] = None
+        return self.__dict__.get("_refined")
+
+    @refined.setter
+    def refined(self, value):
+        self.__dict__["_refinedstr"] = None
+        self.__dict__["_refined"] = value
+        return
+
+    def setRefinedString(self, refinedstr):
+        """Set refined structure from a string in pdffit format.  The
+        string is parsed only when the refined structure is used.
+
+        refinedstr -- refined structure in pdffit format
+        """
+        self.__dict__["_refinedstr"] = refinedstr
+        return
+
+    def getRefinedString(self):
+        """Refined structure in pdffit format or None when not
+        available.  Avoids parsing of a pending refined structure."""
+        refinedstr = self.__dict__.get("_refinedstr")
+        if refinedstr is None and self.refined is not None:
+            refinedstr = self.refined.writeStr("pdffit")
+        return refinedstr
+
     def clearRefined(self):
         """Clear all refinement results."""
         self.refined = None
@@ -164,9 +204,7 @@ class FitStructure(PDFStructure):
         iphase -- index of this phase in server
         """
         server.setphase(iphase)
-        if self.refined is None:
-            self.refined = PDFStructure(self.name)
-        self.refined.readStr(server.save_struct_string(iphase), "pdffit")
+        self.setRefinedString(server.save_struct_string(iphase))
         return
 
     def findParameters(self):
@@ -177,8 +215,9 @@ class FitStructure(PDFStructure):
         returns dictionary of indices and Parameter instances
         """
         foundpars = {}
-        for var, con in self.constraints.items():
-            con.guess(self.initial.getvar(var))
+        values = self.initial.getvars(self.constraints)
+        for con, value in zip(self.constraints.values(), values):
+            con.guess(value)
             for pidx, pguess in con.parguess.items():
                 # skip if already found
                 if pidx in foundpars:
@@ -204,8 +243,7 @@ class FitStructure(PDFStructure):
             else:
                 parvalues[pidx] = float(par)
         # evaluate constraints
-        for var, con in self.constraints.items():
-            self.initial.setvar(var, con.evalFormula(parvalues))
+        self.initial.setvars(evalConstraints(self.constraints, parvalues))
         return
 
     def changeParameterIndex(self, oldidx, newidx):
@@ -730,6 +768,7 @@ class FitStructure(PDFStructure):
 
         returns reference to copied object
         """
+        self.ensureLoaded()
         # check arguments
         if other is None:
             other = FitStructure(self.name)
@@ -839,6 +878,7 @@ class FitStructure(PDFStructure):
 
         returns data object, be it a single number, a list, or a list of list
         """
+        self.ensureLoaded()
         # FIXME: for next plot interface, we need find how many steps the
         # plotter is requiring for and make exact same number of copies of
         # data by name
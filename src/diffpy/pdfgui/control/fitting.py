@@ -15,13 +15,15 @@
 
 from __future__ import print_function
 
+import functools
 import pickle
 import threading
 import time
 
 from diffpy.pdfgui.control.controlerrors import ControlError, ControlStatusError, ControlValueError
 from diffpy.pdfgui.control.organizer import Organizer
-from diffpy.pdfgui.utils import safeCPickleDumps
+from diffpy.pdfgui.control.snapshotstore import SnapshotRetention, SnapshotStore
+from diffpy.pdfgui.utils import asunicode, safeCPickleDumps
 
 # helper routines to deal with PDFfit2 exceptions
 
@@ -47,11 +49,12 @@ def getEngineExceptions():
     return engine_exceptions
 
 
-def handleEngineException(error, gui=None):
-    """Common handler of PDFfit2 engine exceptions.
+def engineExceptionInfo(error):
+    """Format message for PDFfit2 engine exception.
 
     error -- instance of PDFfit2 exception
-    gui   -- reference to GUI when active
+
+    returns message string
     """
     errorInfo = "(%s)\n%s" % (error.__class__.__name__, str(error))
     # be more verbose for Singular matrix exception
@@ -61,10 +64,80 @@ def handleEngineException(error, gui=None):
             "Common reasons are degeneracy in fit parameters,\n"
             "zero thermal factors or fit range starting at zero."
         )
+    return "<Engine exception> %s" % errorInfo
+
+
+def handleEngineException(error, gui=None):
+    """Common handler of PDFfit2 engine exceptions.
+
+    error -- instance of PDFfit2 exception
+    gui   -- reference to GUI when active
+    """
+    _reportError(engineExceptionInfo(error), gui)
+    return
+
+
+def _reportError(message, gui=None):
+    """Post error message to GUI or print it when GUI is not active."""
     if gui:
-        gui.postEvent(gui.ERROR, "<Engine exception> %s" % errorInfo)
+        gui.postEvent(gui.ERROR, message)
     else:
-        print("<Engine exception> %s" % errorInfo)
+        print(message)
+    return
+
+
+def _runFittingProcess(naked, conn, stopevent, runevent, refinedevent):
+    """Refine fitting in a separate worker process.
+
+    This is the target of the process started by Fitting.runProcess().
+    Every refinement step is sent back through conn as a tuple of
+    (message, data), see Fitting.runProcess() for the message types.
+
+    naked     -- stripped copy of Fitting with all linked parameters
+                 resolved to float values
+    conn      -- sending end of multiprocessing Pipe
+    stopevent -- multiprocessing Event, set to stop the refinement
+    runevent  -- multiprocessing Event, cleared to pause the refinement
+    refinedevent -- multiprocessing Event, set to request refined
+                 structures at the next step
+    """
+    from diffpy.pdfgui.control.pdfguicontrol import pdfguicontrol
+
+    fit = naked
+    fit.controlCenter = pdfguicontrol()
+    fit.pauseEvent = threading.Event()
+    fit.lock = threading.RLock()
+    fit.thread = None
+    fit.controlCenter.redirectStdout()
+    try:
+        while not stopevent.is_set():
+            if not runevent.is_set():
+                conn.send(("paused", None))
+                while not (runevent.wait(0.5) or stopevent.is_set()):
+                    pass
+                conn.send(("running", None))
+                continue
+            if fit.fitStatus != Fitting.CONFIGURED:
+                fit.getServer()
+                fit.configure()
+                conn.send(("configured", (fit.itemIndex, fit.dataNameDict)))
+            if refinedevent.is_set():
+                refinedevent.clear()
+                fit.requestRefined()
+            finished = fit.refine_step()
+            conn.send(("step", fit._stepResults(finished)))
+            if finished:
+                break
+        if fit._obtainStaleRefined():
+            conn.send(("refined", [struc.getRefinedString() for struc in fit.strucs]))
+    except ControlError as error:
+        conn.send(("error", "<Fitting exception> %s" % error.info))
+    except getEngineExceptions() as error:
+        conn.send(("error", engineExceptionInfo(error)))
+    finally:
+        fit._release()
+        conn.send(("exit", fit.controlCenter.getEngineOutput()))
+        conn.close()
     return
 
 
@@ -106,16 +179,19 @@ class Fitting(Organizer):
         def run(self):
             """Overload function from Thread."""
             try:
-                self.fitting.run()
+                if self.fitting.controlCenter.useProcesses:
+                    self.fitting.runProcess()
+                else:
+                    self.fitting.run()
             except ControlError as error:
                 gui = self.fitting.controlCenter.gui
-                if gui:
-                    gui.postEvent(gui.ERROR, "<Fitting exception> %s" % error.info)
-                else:
-                    print("<Fitting exception> %s" % error.info)
+                _reportError("<Fitting exception> %s" % error.info, gui)
             except getEngineExceptions() as error:
                 gui = self.fitting.controlCenter.gui
                 handleEngineException(error, gui)
+            finally:
+                # let the queue manager start waiting fittings
+                self.fitting.controlCenter.queueEvent.set()
             return
 
     def __init__(self, name):
@@ -128,6 +204,8 @@ class Fitting(Organizer):
         # Thread, status, and control variables
         self.thread = None
         self.pauseEvent = threading.Event()
+        # guards refined data of a step for copies from other threads
+        self.lock = threading.RLock()
         self.fitStatus = Fitting.INITIALIZED
         self.jobStatus = Fitting.VOID
         self.stopped = False
@@ -142,8 +220,15 @@ class Fitting(Organizer):
         self.rw = 1.0
         self.tolerancy = 0.001
         self.res = ""
-        self.snapshots = []
+        self.snapshots = SnapshotStore()
         self.res = ""
+        # SnapshotRetention for this fitting, use global policy when None
+        self.retention = None
+        # obtain refined structures after every step, otherwise only
+        # on request and when refinement ends
+        self.watchRefined = False
+        self._refinedRequested = False
+        self._refinedStep = None
 
         # All the calculated data are to be stored in a list.
         # Such flat storage require unique index for each data item
@@ -167,8 +252,9 @@ class Fitting(Organizer):
 
     def _release(self):
         """Release resources."""
-        if self.server:  # server has been allocated, we need free the memory
-            self.server.reset()
+        if self.server:  # server has been allocated, return it for reuse
+            server, self.server = self.server, None
+            self.controlCenter.serverPool.checkin(server)
 
     def _getStrId(self):
         """Make a string identifier.
@@ -187,22 +273,41 @@ class Fitting(Organizer):
             other = Fitting(self.name)
         import copy
 
-        Organizer.copy(self, other)
-        other.parameters = copy.deepcopy(self.parameters)
-        other.snapshots = copy.deepcopy(self.snapshots)
-        other.res = copy.deepcopy(self.res)
-        other.dataNameDict = copy.deepcopy(self.dataNameDict)
-        other.itemIndex = self.itemIndex
+        self.ensureLoaded()
+        # running refinement updates data only between steps
+        with self.lock:
+            Organizer.copy(self, other)
+            other.parameters = copy.deepcopy(self.parameters)
+            other.snapshots = copy.deepcopy(self.snapshots)
+            other.retention = self.retention
+            other.res = copy.deepcopy(self.res)
+            other.dataNameDict = copy.deepcopy(self.dataNameDict)
+            other.itemIndex = self.itemIndex
         return other
 
-    def load(self, z, subpath):
+    def load(self, z, subpath, archive=None):
         """Load data from a zipped project file.
 
-        z -- zipped project file
+        z       -- zipped project file
         subpath -- path to its own storage within project file
+        archive -- LazyProjectArchive for deferred loading.  When specified,
+                   only the internal hierarchy is created and the data are
+                   loaded on the first call of ensureLoaded().
 
         returns a tree of internal hierarchy
         """
+        if archive is None:
+            self._loadDeferred(z, subpath)
+        else:
+            self.deferLoad(archive, subpath)
+        return Organizer.load(self, z, subpath, archive)
+
+    def _loadDeferred(self, z, subpath):
+        """Load parameters, refinement steps and results.
+
+        z       -- zipped project file
+        subpath -- path to its own storage within project file
+        """
         # subpath = projName/fitName/
         subs = subpath.split("/")
         rootDict = z.fileTree[subs[0]][subs[1]]
@@ -212,32 +317,53 @@ class Fitting(Organizer):
 
             self.parameters = CtrlUnpickler.loads(z.read(subpath + "parameters"))
         if "steps" in rootDict:
-            self.itemIndex, self.dataNameDict, self.snapshots = pickle.loads(
+            self.itemIndex, self.dataNameDict, snapshots = pickle.loads(
                 z.read(subpath + "steps"), encoding="latin1"
             )
+            self.snapshots = SnapshotStore(snapshots)
+        if "retention" in rootDict:
+            self.retention = SnapshotRetention.fromString(asunicode(z.read(subpath + "retention")))
         if "result" in rootDict:
             self.rw, self.res = pickle.loads(z.read(subpath + "result"), encoding="latin1")
-
-        return Organizer.load(self, z, subpath)
+        return
 
     def save(self, z, subpath):
         """Save data from a zipped project file.
 
-        z       -- zipped project file
+        z       -- ProjectWriter for the zipped project file
         subpath -- path to its own storage within project file
         """
+        if not z.copyDeferred(self, subpath):
+            self._saveOwnData(z, subpath)
+        Organizer.save(self, z, subpath)
+        return
+
+    def _saveOwnData(self, z, subpath):
+        """Save parameters, refinement steps and results.
+
+        z       -- ProjectWriter for the zipped project file
+        subpath -- path to its own storage within project file
+        """
+        self.ensureLoaded()
         if self.parameters:
             spkl = safeCPickleDumps(self.parameters)
             z.writestr(subpath + "parameters", spkl)
         if self.res:
             spkl = safeCPickleDumps((self.rw, self.res))
             z.writestr(subpath + "result", spkl)
+        if self.retention is not None:
+            z.writestr(subpath + "retention", str(self.retention))
         if self.snapshots:
-            spkl = safeCPickleDumps((self.itemIndex, self.dataNameDict, self.snapshots))
-            z.writestr(subpath + "steps", spkl)
-        Organizer.save(self, z, subpath)
+            self.snapshots.setRetention(self.getRetention())
+            # steps are pickled only when changed since the last save
+            z.writeCached(subpath + "steps", self.snapshots.version, self._dumpSteps)
         return
 
+    def _dumpSteps(self):
+        """Pickle of refinement steps as saved in project files."""
+        snapshots = self.snapshots.tolist()
+        return safeCPickleDumps((self.itemIndex, self.dataNameDict, snapshots))
+
     def stripped(self):
         """Make a copy stripped of all unpickleable data members.
         The copy should be suitable for pickling and has the
@@ -258,6 +384,7 @@ class Fitting(Organizer):
 
         returns self.parameters
         """
+        self.ensureLoaded()
         # create dictionary of parameters used in constraints
         cpars = {}
         for struc in self.strucs:
@@ -329,19 +456,26 @@ class Fitting(Organizer):
 
     def getServer(self):
         """Get a PDFfit2 instance either locally or remotely."""
-        if self.fitStatus != Fitting.INITIALIZED:
+        # server of an interrupted refinement has been released
+        released = self.server is None and self.fitStatus in (Fitting.CONNECTED, Fitting.CONFIGURED)
+        if self.fitStatus != Fitting.INITIALIZED and not released:
             return
-        # create a new instance of calculation server
-        from diffpy.pdffit2 import PdfFit
-
-        self.server = PdfFit()
+        self._release()
+        # take a clean calculation server from the pool
+        self.server = self.controlCenter.serverPool.checkout()
         self.__changeStatus(fitStatus=Fitting.CONNECTED)
 
     def configure(self):
         """Configure fitting."""
         if self.fitStatus != Fitting.CONNECTED:
             return
+        with self.controlCenter.profiler.phase("configure", self.name):
+            self._configureServer()
+        self.__changeStatus(fitStatus=Fitting.CONFIGURED)
+        return
 
+    def _configureServer(self):
+        """Load structures, datasets and parameters to the server."""
         # make sure parameters are initialized
         self.updateParameters()
         self.server.reset()
@@ -383,14 +517,13 @@ class Fitting(Organizer):
 
         # build name dict
         self.buildNameDict()
-
-        self.__changeStatus(fitStatus=Fitting.CONFIGURED)
         return
 
     def resetStatus(self):
         """Reset status back to initialized."""
-        self.snapshots = []
+        self.snapshots = SnapshotStore(retention=self.getRetention())
         self.step = 0
+        self._refinedStep = None
         if self.fitStatus == Fitting.INITIALIZED:
             return  # already reset
 
@@ -401,9 +534,9 @@ class Fitting(Organizer):
         """Function to be run in daemon thread."""
         # Begin
         self.__changeStatus(jobStatus=Fitting.RUNNING)
+        calculations = []
         try:
-            for calc in self.calcs:
-                calc.start()
+            calculations = self._startCalculations()
 
             while not self.stopped and self.datasets:
                 if not self.paused:
@@ -423,17 +556,302 @@ class Fitting(Organizer):
                     # Recover from pause now
                     self.__changeStatus(jobStatus=Fitting.RUNNING)
 
+            self._obtainStaleRefined()
         finally:
             # whatever happened, resource should be released.
             self._release()
+            self._waitCalculations(calculations)
 
             # job status should be changed because of thread exit
             self.__changeStatus(jobStatus=Fitting.VOID)
         return
 
-    def _configureBondCalculation(self, struc):
+    def runProcess(self):
+        """Function to be run in daemon thread, when the refinement is
+        delegated to a worker process with its own PdfFit server.
+
+        The worker process sends back tuples of (message, data) where
+        message is one of
+            "configured" -- data is (itemIndex, dataNameDict)
+            "step"       -- data is dictionary from _stepResults()
+            "refined"    -- data is list of refined structure strings
+                            obtained after refinement was stopped
+            "paused"     -- worker waits for resume
+            "running"    -- worker resumed after pause
+            "error"      -- data is error message
+            "exit"       -- data is remaining engine output
+        """
+        import multiprocessing
+
+        self.__changeStatus(jobStatus=Fitting.RUNNING)
+        gui = self.controlCenter.gui
+        ctx = multiprocessing.get_context("spawn")
+        process = None
+        calculations = []
+        try:
+            calculations = self._startCalculations()
+            if not self.datasets:
+                return
+            # linked parameters can be resolved only in this process
+            self.updateParameters()
+            naked = self.stripped()
+            naked.retention = self.getRetention()
+            for par in naked.parameters.values():
+                par.setInitial(par.initialValue())
+            conn, childconn = ctx.Pipe(duplex=False)
+            stopevent = ctx.Event()
+            runevent = ctx.Event()
+            runevent.set()
+            refinedevent = ctx.Event()
+            process = ctx.Process(
+                target=_runFittingProcess,
+                args=(naked, childconn, stopevent, runevent, refinedevent),
+                name="pdfgui-" + self.name,
+            )
+            process.daemon = True
+            process.start()
+            childconn.close()
+            self.__changeStatus(fitStatus=Fitting.CONNECTED)
+            while True:
+                # forward stop and pause requests to the worker
+                if self.stopped:
+                    stopevent.set()
+                    runevent.set()
+                elif self.paused == runevent.is_set():
+                    if self.paused:
+                        runevent.clear()
+                    else:
+                        runevent.set()
+                if self.watchRefined or self._refinedRequested:
+                    self._refinedRequested = False
+                    refinedevent.set()
+                try:
+                    if not conn.poll(0.1):
+                        if not process.is_alive():
+                            break
+                        continue
+                    msg, data = conn.recv()
+                except EOFError:
+                    break
+                if msg == "configured":
+                    self._applyConfiguration(*data)
+                elif msg == "step":
+                    self._applyStepResults(data)
+                elif msg == "refined":
+                    with self.lock:
+                        for struc, strustr in zip(self.strucs, data):
+                            struc.setRefinedString(strustr)
+                elif msg == "paused":
+                    self.__changeStatus(jobStatus=Fitting.PAUSED)
+                elif msg == "running":
+                    self.__changeStatus(jobStatus=Fitting.RUNNING)
+                elif msg == "error":
+                    _reportError(data, gui)
+                elif msg == "exit":
+                    self._writeEngineOutput(data)
+                    break
+        finally:
+            if process is not None:
+                process.join()
+            self._waitCalculations(calculations)
+            self.__changeStatus(jobStatus=Fitting.VOID)
+        return
+
+    def _startCalculations(self):
+        """Submit all calculations to worker processes of the calculation
+        pool, so that they run concurrently with the refinement and do not
+        share the engine output stream of this process.  Every finished
+        calculation posts its own PLOTNOW event.
+
+        returns list of (future, event) pairs for _waitCalculations().
+        """
+        if not self.calcs:
+            return []
+        from diffpy.pdfgui.control.calculation import _calculateProcess
+
+        # calculations must not change parameters of running refinement
+        self.updateParameters()
+        # linked parameters can be resolved only in this process
+        naked = self.stripped()
+        for par in naked.parameters.values():
+            par.setInitial(par.initialValue())
+        executor = self.controlCenter.getCalcExecutor()
+        rv = []
+        for index, calc in enumerate(self.calcs):
+            done = threading.Event()
+            future = executor.submit(_calculateProcess, naked, index)
+            future.add_done_callback(functools.partial(self._finishCalculation, calc, done))
+            rv.append((future, done))
+        return rv
+
+    def _finishCalculation(self, calc, done, future):
+        """Store results of a calculation from the worker process and
+        inform gui.  Called when the calculation future is done.
+
+        calc   -- Calculation that was submitted
+        done   -- threading.Event set when the results are stored
+        future -- finished future of the calculation
+        """
+        gui = self.controlCenter.gui
+        try:
+            calc.rcalc, calc.Gcalc, output = future.result()
+            self._writeEngineOutput(output)
+        except ControlError as error:
+            _reportError("<Calculation exception> %s" % error.info, gui)
+        except getEngineExceptions() as error:
+            handleEngineException(error, gui)
+        except Exception as error:
+            # broken or cancelled pool or unpickleable data
+            emsg = "<Calculation exception> %s: %s" % (type(error).__name__, error)
+            _reportError(emsg, gui)
+        finally:
+            # inform gui of change, failed calculations update gui as well
+            if gui:
+                gui.postEvent(gui.OUTPUT, None)
+                gui.postEvent(gui.PLOTNOW, calc)
+            done.set()
+        return
+
+    def _waitCalculations(self, calculations):
+        """Wait for calculations started by _startCalculations().
+
+        calculations -- list of (future, event) pairs
+        """
+        for future, done in calculations:
+            done.wait()
+        return
+
+    def _stepResults(self, finished):
+        """Collect results of the last refinement step for transfer
+        from the worker process.
+
+        finished -- flag for the final refinement step
+
+        returns dictionary of picklable results
+        """
+        # refined structures are sent only when obtained in this step
+        fetched = self._refinedStep == self.step
+        rv = {
+            "step": self.step,
+            "rw": self.rw,
+            "parameters": dict((idx, par.refined) for idx, par in self.parameters.items()),
+            "snapshot": self.snapshots[-1],
+            "datasets": [(ds.Gcalc, ds.dGcalc, ds.crw, ds.refined) for ds in self.datasets],
+            "strucs": [struc.getRefinedString() if fetched else None for struc in self.strucs],
+            "output": self.controlCenter.getEngineOutput(),
+            "finished": finished,
+            "res": self.res,
+        }
+        return rv
+
+    def _applyConfiguration(self, itemIndex, dataNameDict):
+        """Reset refined results as done by configure() in the worker
+        process.
+
+        itemIndex    -- number of items in a snapshot
+        dataNameDict -- dictionary of snapshot indices, see buildNameDict()
+        """
+        for struc in self.strucs:
+            struc.clearRefined()
+        for dataset in self.datasets:
+            dataset.clearRefined()
+        for par in self.parameters.values():
+            par.refined = None
+        self.itemIndex = itemIndex
+        self.dataNameDict = dataNameDict
+        self.__changeStatus(fitStatus=Fitting.CONFIGURED)
+        return
+
+    def _applyStepResults(self, results):
+        """Update refined data with results from the worker process.
+
+        results -- dictionary obtained from _stepResults()
+        """
+        profiler = self.controlCenter.profiler
+        with self.lock, profiler.phase("applyStepResults", self.name, results["step"]):
+            self._applyStepData(results)
+            if results["finished"]:
+                self.res = results["res"]
+        profiler.recordMemory(self.name, self.snapshots.nbytes())
+        gui = self.controlCenter.gui
+        if gui:
+            gui.postEvent(gui.OUTPUT, None)
+            gui.postEvent(gui.PLOTNOW, self)
+        if results["finished"]:
+            self.__changeStatus(fitStatus=Fitting.DONE)
+        return
+
+    def _applyStepData(self, results):
+        """Copy refined data and step snapshot from worker results."""
+        for dataset, dsresults in zip(self.datasets, results["datasets"]):
+            dataset.Gcalc, dataset.dGcalc, dataset.crw, refined = dsresults
+            dataset.refined.update(refined)
+        for struc, strustr in zip(self.strucs, results["strucs"]):
+            if strustr is not None:
+                struc.setRefinedString(strustr)
+        for idx, value in results["parameters"].items():
+            if idx in self.parameters:
+                self.parameters[idx].refined = value
+        self.rw = results["rw"]
+        self.step = results["step"]
+        self.snapshots.setRetention(self.getRetention())
+        self.snapshots.append(results["snapshot"])
+        self._writeEngineOutput(results["output"])
+        return
+
+    def _writeEngineOutput(self, text):
+        """Append engine output from the worker process to the engine
+        output of this process."""
+        if not text:
+            return
+        from diffpy.pdffit2 import output
+
+        output.stdout.write(text)
+        return
+
+    def getRetention(self):
+        """Retention policy for vector items of refinement steps.
+
+        returns SnapshotRetention of this fitting or the global policy
+        of the control center when not set
+        """
+        if self.retention is not None:
+            return self.retention
+        control = getattr(self, "controlCenter", None)
+        return getattr(control, "snapshotRetention", None) or SnapshotRetention()
+
+    def setRetention(self, retention):
+        """Set retention policy for vector items of refinement steps and
+        apply it to the stored steps.
+
+        retention -- instance of SnapshotRetention, string such as
+                     "last 10", or None for the global policy
+        """
+        if isinstance(retention, str):
+            retention = SnapshotRetention.fromString(retention)
+        self.retention = retention
+        self.snapshots.setRetention(self.getRetention())
+        return
+
+    def getLinkedFittings(self):
+        """Find fittings that provide initial values of linked
+        parameters.
+
+        returns list of Fitting instances, this fitting is excluded
+        """
+        self.ensureLoaded()
+        rv = []
+        for par in self.parameters.values():
+            src = par.getLinkedFitting()
+            if src is None or src is self or src in rv:
+                continue
+            rv.append(src)
+        return rv
+
+    def _configureBondCalculation(self, server, struc):
         """Prepare server for bond angle or bond length calculation.
 
+        server  -- clean PdfFit instance from the server pool
         struc   -- instance of PDFStructure
 
         No return value.
@@ -441,10 +859,8 @@ class Fitting(Organizer):
         # struc can be handle to FitStructure.initial
         # let's make sure it is synchronized with current parameters
         self.applyParameters()
-        self.getServer()
-        self.server.reset()
         strucstr = struc.writeStr("pdffit")
-        self.server.read_struct_string(strucstr)
+        server.read_struct_string(strucstr)
         return
 
     def outputBondAngle(self, struc, i, j, k):
@@ -461,9 +877,9 @@ class Fitting(Organizer):
         Raise ControlValueError for invalid indices i, j, k.
         """
         try:
-            self._configureBondCalculation(struc)
-            self.server.bang(i, j, k)
-            self._release()
+            with self.controlCenter.serverPool.lease() as server:
+                self._configureBondCalculation(server, struc)
+                server.bang(i, j, k)
         except getEngineExceptions() as error:
             gui = self.controlCenter.gui
             handleEngineException(error, gui)
@@ -484,9 +900,9 @@ class Fitting(Organizer):
         Raise ControlValueError for invalid indices i, j.
         """
         try:
-            self._configureBondCalculation(struc)
-            self.server.blen(i, j)
-            self._release()
+            with self.controlCenter.serverPool.lease() as server:
+                self._configureBondCalculation(server, struc)
+                server.blen(i, j)
         except getEngineExceptions() as error:
             gui = self.controlCenter.gui
             handleEngineException(error, gui)
@@ -509,9 +925,9 @@ class Fitting(Organizer):
         Raise ControlValueError for invalid element symbols.
         """
         try:
-            self._configureBondCalculation(struc)
-            self.server.blen(a1, a2, lb, ub)
-            self._release()
+            with self.controlCenter.serverPool.lease() as server:
+                self._configureBondCalculation(server, struc)
+                server.blen(a1, a2, lb, ub)
         except getEngineExceptions() as error:
             gui = self.controlCenter.gui
             handleEngineException(error, gui)
@@ -541,6 +957,7 @@ class Fitting(Organizer):
             self.pause(False)
             return
 
+        self.ensureLoaded()
         # clean up control variable
         self.stopped = False
         self.paused = False
@@ -558,6 +975,35 @@ class Fitting(Organizer):
         if self.jobStatus == Fitting.PAUSED:
             self.pause(False)
 
+    def requestRefined(self):
+        """Ask for refined structures after the next refinement step.
+        Refined structures are otherwise obtained only when refinement
+        ends or when watchRefined is set.
+        """
+        self._refinedRequested = True
+        return
+
+    def _obtainRefined(self):
+        """Get refined structures from the PdfFit server."""
+        self._refinedRequested = False
+        with self.lock:
+            for istruc, struc in enumerate(self.strucs, 1):
+                struc.obtainRefined(self.server, istruc)
+            self._refinedStep = self.step
+        return
+
+    def _obtainStaleRefined(self):
+        """Get refined structures when refinement stopped after steps
+        that did not obtain them.
+
+        returns True when refined structures were updated.
+        """
+        stale = self.step > 0 and self._refinedStep != self.step
+        if stale and self.fitStatus == Fitting.CONFIGURED and self.server:
+            self._obtainRefined()
+            return True
+        return False
+
     def isThreadRunning(self):
         """Check if fitting thread is running.
 
@@ -682,6 +1128,7 @@ class Fitting(Organizer):
         for parameter in self.parameters.keys():
             snapshot[nameDict[parameter]] = source.getpar(parameter)
 
+        self.snapshots.setRetention(self.getRetention())
         self.snapshots.append(snapshot)
 
     def refine_step(self):
@@ -693,28 +1140,36 @@ class Fitting(Organizer):
             # do nothing but return finished
             return True
 
-        finished = self.server.refine_step(self.tolerancy)
-
-        # get fitted data
-        idataset = 1
-        for dataset in self.datasets:
-            dataset.obtainRefined(self.server, idataset)
-            idataset += 1
-
-        # get refined structure
-        istruc = 1
-        for struc in self.strucs:
-            struc.obtainRefined(self.server, istruc)
-            istruc += 1
-
-        # update parameters
-        for idx, par in self.parameters.items():
-            par.refined = self.server.getpar(idx)
-
-        self.rw = self.server.getrw()
-
-        self.step += 1
-        self.appendStep(self.server)
+        profiler = self.controlCenter.profiler
+        step = self.step + 1
+        with profiler.phase("refine_step", self.name, step):
+            finished = self.server.refine_step(self.tolerancy)
+
+        # copies made in other threads see only complete steps
+        with self.lock:
+            with profiler.phase("obtainRefined", self.name, step):
+                # get fitted data
+                idataset = 1
+                for dataset in self.datasets:
+                    dataset.obtainRefined(self.server, idataset)
+                    idataset += 1
+
+                # update parameters
+                for idx, par in self.parameters.items():
+                    par.refined = self.server.getpar(idx)
+
+                self.rw = self.server.getrw()
+
+                self.step += 1
+                # refined structures are expensive to transfer from the engine
+                if finished or self.watchRefined or self._refinedRequested:
+                    self._obtainRefined()
+
+            with profiler.phase("appendStep", self.name, step):
+                self.appendStep(self.server)
+            if finished:
+                self.res = "* %s\n\n" % time.ctime() + self.server.save_res_string()
+        profiler.recordMemory(self.name, self.snapshots.nbytes())
 
         # update plots and structure renderer
         gui = self.controlCenter.gui
@@ -723,7 +1178,6 @@ class Fitting(Organizer):
             gui.postEvent(gui.PLOTNOW, self)
 
         if finished:
-            self.res = "* %s\n\n" % time.ctime() + self.server.save_res_string()
             self.__changeStatus(fitStatus=Fitting.DONE)
 
         return finished
@@ -733,6 +1187,7 @@ class Fitting(Organizer):
 
         returns a name str list
         """
+        self.ensureLoaded()
         names = list(self.parameters.keys())
         names.append("rw")
         return names
@@ -766,6 +1221,7 @@ class Fitting(Organizer):
 
     def getMetaDataNames(self):
         """Return all applicable meta data names."""
+        self.ensureLoaded()
         names = []
         for dataset in self.datasets:
             # build up the name list
@@ -783,6 +1239,7 @@ class Fitting(Organizer):
         name -- meta data name
         returns meta data value
         """
+        self.ensureLoaded()
         try:
             return self.datasets[0].metadata[name]
         except (KeyError, IndexError):
@@ -798,8 +1255,10 @@ class Fitting(Organizer):
                 (2) a list of numbers: for multiple steps
                 (3) None: for all steps
 
-        returns data object, be it a single number, a list, or a list of list
+        returns a single number or array for one step, array of values
+        for multiple steps, see SnapshotStore.getItem()
         """
+        self.ensureLoaded()
         # find the unique index
         if len(self.snapshots) == 0:
             return None
@@ -812,12 +1271,7 @@ class Fitting(Organizer):
         except KeyError:
             return None  # data is not ready
 
-        if step is None:
-            return [snapshot[index] for snapshot in self.snapshots]
-        elif isinstance(step, list):
-            return [self.snapshots[i][index] for i in step]
-        else:
-            return self.snapshots[step][index]
+        return self.snapshots.getItem(index, step)
 
 
 # End of file
@@ -151,11 +151,13 @@ class Organizer(PDFComponent):
         # Any IndexError is a program bug thus should be propagated as is.
         return self.calcs[pos]
 
-    def load(self, z, subpath):
+    def load(self, z, subpath, archive=None):
         """Load data from a zipped project file.
 
-        z -- zipped project file
+        z       -- zipped project file
         subpath -- path to its own storage within project file
+        archive -- LazyProjectArchive for deferred loading of structures,
+                   datasets and calculations.  When None, load them now.
 
         returns a tree of internal hierarchy
         """
@@ -164,43 +166,67 @@ class Organizer(PDFComponent):
 
         subs = subpath.split("/")
         rootDict = z.fileTree[subs[0]][subs[1]]
+        items = []
         if "structure" in rootDict:
             for strucName in rootDict["structure"].keys():
                 struc = FitStructure(unquote_plus(strucName))
-                struc.load(z, subpath + "structure/" + strucName + "/")
-                self.add(struc)
+                items.append((struc, subpath + "structure/" + strucName + "/"))
 
         if "dataset" in rootDict:
             for datasetName in rootDict["dataset"].keys():
                 dataset = FitDataSet(unquote_plus(datasetName))
-                dataset.load(z, subpath + "dataset/" + datasetName + "/")
-                self.add(dataset)
+                items.append((dataset, subpath + "dataset/" + datasetName + "/"))
 
         if "calculation" in rootDict:
             for calcName in rootDict["calculation"].keys():
                 calc = Calculation(unquote_plus(calcName))
-                calc.load(z, subpath + "calculation/" + calcName + "/")
-                self.add(calc)
+                items.append((calc, subpath + "calculation/" + calcName + "/"))
 
-        self.__forward_spdiameter()
+        for item, itempath in items:
+            if archive is None:
+                item.load(z, itempath)
+            else:
+                item.deferLoad(archive, itempath)
+            self.add(item)
+
+        if archive is None:
+            self.__forward_spdiameter()
+        else:
+            # needs loaded datasets, done in ensureLoaded
+            self._pendingSpdiameter = True
 
         return self.organization()
 
+    def ensureLoaded(self):
+        """Load all deferred data of this object and its structures,
+        datasets and calculations.
+
+        returns self
+        """
+        PDFComponent.ensureLoaded(self)
+        for item in self.strucs + self.datasets + self.calcs:
+            item.ensureLoaded()
+        if self.__dict__.pop("_pendingSpdiameter", False):
+            self.__forward_spdiameter()
+        return self
+
     def save(self, z, subpath):
         """Save data from a zipped project file.
 
-        z -- zipped project file
+        z -- ProjectWriter for the zipped project file
         subpath -- path to its own storage within project file
         """
         # strucs and datasets
         from urllib.parse import quote_plus
 
-        for struc in self.strucs:
-            struc.save(z, subpath + "structure/" + quote_plus(struc.name) + "/")
-        for dataset in self.datasets:
-            dataset.save(z, subpath + "dataset/" + quote_plus(dataset.name) + "/")
-        for calc in self.calcs:
-            calc.save(z, subpath + "calculation/" + quote_plus(calc.name) + "/")
+        items = [(struc, "structure/") for struc in self.strucs]
+        items += [(dataset, "dataset/") for dataset in self.datasets]
+        items += [(calc, "calculation/") for calc in self.calcs]
+        for item, folder in items:
+            itempath = subpath + folder + quote_plus(item.name) + "/"
+            # data that were not loaded yet are copied from the old project
+            if not z.copyDeferred(item, itempath):
+                item.ensureLoaded().save(z, itempath)
         return
 
     def copy(self, other=None):
@@ -211,6 +237,7 @@ class Organizer(PDFComponent):
         """
         if other is None:
             other = Organizer(self.name)
+        self.ensureLoaded()
 
         for dataset in self.datasets:
             other.add(dataset.copy())
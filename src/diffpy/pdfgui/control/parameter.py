@@ -119,6 +119,16 @@ class Parameter:
                     raise
         return float(value)
 
+    def getLinkedFitting(self):
+        """Find Fitting which provides initial value of this parameter.
+
+        returns reference to linked Fitting or None when initial value
+        is a float or the linked Fitting does not exist
+        """
+        if isinstance(self.__initial, float):
+            return None
+        return self.__findLinkedFitting()
+
     def __getLinkedValue(self):
         """Private retrieval of parameter value from linked Fitting."""
         # Check to see if the fit name has a ':' in it
@@ -137,6 +147,7 @@ class Parameter:
         srcfit = self.__findLinkedFitting()
         if srcfit is None:
             raise ControlKeyError("Fitting '%s' does not exist" % fitname)
+        srcfit.ensureLoaded()
         # Check to see if srcfit has parameter srcidx
         try:
             srcpar = srcfit.parameters[srcidx]
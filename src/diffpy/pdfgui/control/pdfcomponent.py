@@ -31,5 +31,38 @@ class PDFComponent(object):
         """
         pass
 
+    def deferLoad(self, archive, subpath):
+        """Postpone loading from a project file until ensureLoaded().
+
+        archive -- instance of LazyProjectArchive with the project file
+        subpath -- path to its own storage within project file
+        """
+        self._deferred = (archive, subpath)
+        return
+
+    def isLoaded(self):
+        """Check if there is no data waiting for deferred loading."""
+        return "_deferred" not in self.__dict__
+
+    def ensureLoaded(self):
+        """Load data deferred by lazy project loading.
+
+        returns self
+        """
+        deferred = self.__dict__.get("_deferred")
+        if deferred is not None:
+            archive, subpath = deferred
+            archive.load(self, subpath)
+        return self
+
+    def _loadDeferred(self, z, subpath):
+        """Load deferred data, called from LazyProjectArchive.load().
+
+        z       -- zipped project file
+        subpath -- path to its own storage within project file
+        """
+        self.load(z, subpath)
+        return
+
 
 # End of file
@@ -15,11 +15,14 @@
 """Class PDFDataSet for experimental PDF data."""
 
 import copy
+import io
 import os.path
 import re
 import time
 from getpass import getuser
 
+import numpy
+
 from diffpy.pdfgui.control.controlerrors import ControlFileError, ControlKeyError
 from diffpy.pdfgui.control.pdfcomponent import PDFComponent
 
@@ -28,10 +31,10 @@ class PDFDataSet(PDFComponent):
     """PDFDataSet is a class for experimental PDF data.
 
     Data members:
-        robs       -- list of observed r points
-        Gobs       -- list of observed G values
-        drobs      -- list of standard deviations of robs
-        dGobs      -- list of standard deviations of Gobs
+        robs       -- DataArray of observed r points
+        Gobs       -- DataArray of observed G values
+        drobs      -- DataArray of standard deviations of robs
+        dGobs      -- DataArray of standard deviations of Gobs
         stype      -- scattering type, 'X' or 'N'
         qmax       -- maximum value of Q in inverse Angstroms.  Termination
                       ripples are neglected for qmax=0.
@@ -81,10 +84,10 @@ class PDFDataSet(PDFComponent):
 
     def clear(self):
         """Reset all data members to initial empty values."""
-        self.robs = []
-        self.Gobs = []
-        self.drobs = []
-        self.dGobs = []
+        self.robs = asDataArray([])
+        self.Gobs = asDataArray([])
+        self.drobs = asDataArray([])
+        self.dGobs = asDataArray([])
         self.stype = "X"
         # user must specify qmax to get termination ripples
         self.qmax = 0.0
@@ -239,7 +242,61 @@ class PDFDataSet(PDFComponent):
                     break
 
         # read actual data - robs, Gobs, drobs, dGobs
+        columns = self._readDataColumns(databody)
+        if columns is None:
+            self._readDataLines(databody)
+        else:
+            robs, Gobs, drobs, dGobs = columns
+            self.robs = robs
+            self.Gobs = Gobs
+            self.drobs = drobs if drobs is not None else asDataArray(numpy.zeros(len(robs)))
+            self.dGobs = dGobs if dGobs is not None else asDataArray(numpy.zeros(len(robs)))
+        self.rmin = float(self.robs[0])
+        self.rmax = float(self.robs[-1])
+        return self
+
+    @staticmethod
+    def _readDataColumns(databody):
+        """Convert data lines to arrays in one pass.
+
+        databody -- data lines with r, G, dr and dG columns
+
+        returns a tuple of (robs, Gobs, drobs, dGobs) DataArrays, where drobs
+        and dGobs are None when they are not defined and positive for
+        all points.  Return None when databody needs to be parsed by
+        _readDataLines(), which handles varying number of columns and
+        raises PDFDataFormatError for invalid data.
+        """
+        # empty lines are invalid, but skipped by loadtxt
+        if not databody or re.search(r"\n\s*\n", databody):
+            return None
+        try:
+            data = numpy.loadtxt(io.StringIO(databody), dtype=float, comments=None, ndmin=2)
+        except ValueError:
+            return None
+        if data.shape[1] < 2:
+            return None
+        # transpose to contiguous rows that are used without copying
+        columns = asDataArray(data.T)
+        rv = [columns[0], columns[1], None, None]
+        for i in range(2, min(4, len(columns))):
+            values = columns[i]
+            # infinity in the input text is handled by _readDataLines
+            if numpy.isinf(values).any():
+                return None
+            if numpy.all(values > 0.0):
+                rv[i] = values
+        return tuple(rv)
+
+    def _readDataLines(self, databody):
+        """Parse data lines one by one and set robs, Gobs, drobs, dGobs.
+
+        databody -- data lines with r, G, dr and dG columns
+
+        raise PDFDataFormatError for invalid data.
+        """
         inf_or_nan = re.compile("(?i)^[+-]?(NaN|Inf)\\b")
+        robs, Gobs, drobs, dGobs = [], [], [], []
         has_drobs = True
         has_dGobs = True
         # raise PDFDataFormatError if something goes wrong
@@ -247,33 +304,27 @@ class PDFDataSet(PDFComponent):
             for line in databody.split("\n"):
                 v = line.split()
                 # there should be at least 2 value in the line
-                self.robs.append(float(v[0]))
-                self.Gobs.append(float(v[1]))
+                robs.append(float(v[0]))
+                Gobs.append(float(v[1]))
                 # drobs is valid if all values are defined and positive
                 has_drobs = has_drobs and len(v) > 2 and not inf_or_nan.match(v[2])
                 if has_drobs:
                     v2 = float(v[2])
                     has_drobs = v2 > 0.0
-                    self.drobs.append(v2)
+                    drobs.append(v2)
                 # dGobs is valid if all values are defined and positive
                 has_dGobs = has_dGobs and len(v) > 3 and not inf_or_nan.match(v[3])
                 if has_dGobs:
                     v3 = float(v[3])
                     has_dGobs = v3 > 0.0
-                    self.dGobs.append(v3)
-            if not has_drobs:
-                self.drobs = len(self.robs) * [0.0]
-            if not has_dGobs:
-                self.dGobs = len(self.robs) * [0.0]
+                    dGobs.append(v3)
         except (ValueError, IndexError) as err:
             raise PDFDataFormatError(err)
-        self.rmin = self.robs[0]
-        self.rmax = self.robs[-1]
-        if not has_drobs:
-            self.drobs = len(self.robs) * [0.0]
-        if not has_dGobs:
-            self.dGobs = len(self.robs) * [0.0]
-        return self
+        self.robs = asDataArray(robs)
+        self.Gobs = asDataArray(Gobs)
+        self.drobs = asDataArray(drobs if has_drobs else numpy.zeros(len(robs)))
+        self.dGobs = asDataArray(dGobs if has_dGobs else numpy.zeros(len(robs)))
+        return
 
     def write(self, filename):
         """Write experimental PDF data to a file.
@@ -327,8 +378,9 @@ class PDFDataSet(PDFComponent):
         # write data:
         lines.append("##### start data")
         lines.append("#L r(A) G(r) d_r d_Gr")
-        for i in range(len(self.robs)):
-            lines.append("%g %g %g %g" % (self.robs[i], self.Gobs[i], self.drobs[i], self.dGobs[i]))
+        columns = [numpy.asarray(a).tolist() for a in (self.robs, self.Gobs, self.drobs, self.dGobs)]
+        for row in zip(*columns):
+            lines.append("%g %g %g %g" % row)
         # that should be it
         datastring = "\n".join(lines) + "\n"
         return datastring
@@ -371,6 +423,56 @@ class PDFDataSet(PDFComponent):
 # End of class PDFDataSet
 
 
+class DataArray(numpy.ndarray):
+    """Contiguous float64 array for PDF data, which behaves as a list
+    in truth tests and in comparisons with lists.
+
+    An empty DataArray is false.  Reductions such as min() return plain
+    floats.  Use asDataArray() to create instances.
+
+    Unlike ndarray, the == and != operators with a list, tuple or
+    another DataArray return a single bool as for the lists used before,
+    so that tests such as Gcalc == [] keep working.  Comparison with
+    scalars and plain ndarrays is elementwise.  Use numpy.equal() for
+    elementwise comparison of two DataArrays.
+    """
+
+    def __array_wrap__(self, obj, context=None, return_scalar=False):
+        if obj.ndim == 0:
+            return obj[()]
+        # return_scalar is not accepted by NumPy 1.x
+        return numpy.ndarray.__array_wrap__(self, obj, context)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, DataArray)):
+            return len(self) == len(other) and numpy.array_equal(self, other)
+        return numpy.ndarray.__eq__(self, other)
+
+    def __ne__(self, other):
+        if isinstance(other, (list, tuple, DataArray)):
+            return not self.__eq__(other)
+        return numpy.ndarray.__ne__(self, other)
+
+    __hash__ = None
+
+
+# End of class DataArray
+
+
+def asDataArray(values):
+    """Convert values to DataArray.  Contiguous float64 arrays are
+    used without copying.
+
+    values -- sequence or array of floats
+
+    returns DataArray
+    """
+    return numpy.ascontiguousarray(values, dtype=float).view(DataArray)
+
+
 class PDFDataFormatError(Exception):
     """Exception class marking failure to process PDF data string."""
 
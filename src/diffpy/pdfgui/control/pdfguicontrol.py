@@ -23,13 +23,19 @@ import threading
 import time
 from urllib.parse import quote_plus
 
+from diffpy.pdfgui.control.autosave import AutoSave
 from diffpy.pdfgui.control.calculation import Calculation
 from diffpy.pdfgui.control.controlerrors import ControlError, ControlFileError, ControlTypeError
 from diffpy.pdfgui.control.fitdataset import FitDataSet
+from diffpy.pdfgui.control.fitdependency import FitDependencyGraph, FitSchedule
 from diffpy.pdfgui.control.fitstructure import FitStructure
 from diffpy.pdfgui.control.fitting import Fitting
 from diffpy.pdfgui.control.organizer import Organizer
 from diffpy.pdfgui.control.pdflist import PDFList
+from diffpy.pdfgui.control.profiler import Profiler
+from diffpy.pdfgui.control.projectwriter import writeProject
+from diffpy.pdfgui.control.serverpool import ServerPool
+from diffpy.pdfgui.control.snapshotstore import SnapshotRetention
 from diffpy.pdfgui.utils import asunicode
 
 
@@ -47,6 +53,10 @@ class PDFGuiControl:
         """
         self.lock = threading.RLock()
         self.gui = gui
+        # project file with data for deferred loading
+        self.projarchive = None
+        # build only the internal hierarchy when loading projects
+        self.lazyLoad = False
 
         # clean up local data
         self.reset()
@@ -54,16 +64,38 @@ class PDFGuiControl:
         # Queue stuff
         self.fittingQueue = []
         self.currentFitting = None
+        self.runningFittings = []
+        self.schedule = FitSchedule()
+        # maximum number of fittings refined at the same time
+        self.maxWorkers = 1
+        # run refinements in worker processes with their own PdfFit engine
+        self.useProcesses = False
+        # default retention of vector items in the refinement history
+        self.snapshotRetention = SnapshotRetention()
+        # idle PdfFit engines reused by fittings, calculations and bond queries
+        self.serverPool = ServerPool()
+        # timing of refinement phases, off unless enabled
+        self.profiler = Profiler()
+        # process pool for calculations started by fittings, see getCalcExecutor
+        self.calcExecutor = None
+        self.queueEvent = threading.Event()
+        # periodic saving to crash-recovery files, disabled by default
+        self.autosave = AutoSave(self)
         self.queueManager = PDFGuiControl.QueueManager(self)
         # self.startQueue()
 
     def reset(self):
         """Clean up for a new project."""
+        if self.projarchive is not None:
+            self.projarchive.close()
+            self.projarchive = None
         self.fits = PDFList()
         self.plots = PDFList()
         self.journal = ""
 
         self.projfile = None
+        # (projfile, tokens) from the last save used by ProjectWriter
+        self.savedTokens = None
         # self.saved = False
 
     # a simple thread to handle fitting queue
@@ -86,7 +118,9 @@ class PDFGuiControl:
                 # another check before go to sleep
                 if not self.running:
                     break
-                time.sleep(1)
+                # wake up when a fitting finished or the queue changed
+                self.control.queueEvent.wait(1)
+                self.control.queueEvent.clear()
 
     def startQueue(self):
         """Start queue manager."""
@@ -94,23 +128,167 @@ class PDFGuiControl:
         self.queueManager.start()
 
     def checkQueue(self):
-        """Find next fitting in the queue and start it."""
-        if self.currentFitting:
-            # wait for currentFitting
-            self.currentFitting.join()
+        """Start queued fittings while there are free workers.
 
-        # No fitting in the queue is running.
+        Fittings are started in the queue order, but a fitting that
+        takes initial values from a queued or running fitting waits
+        for its source to finish.  Independent fittings run in parallel.
+        """
         try:
             self.lock.acquire()
-            if len(self.fittingQueue) > 0:
-                self.currentFitting = self.fittingQueue.pop(0)
-            else:
-                self.currentFitting = None
+            running = []
+            for fit in self.runningFittings:
+                if fit.isThreadRunning():
+                    running.append(fit)
+                else:
+                    self.schedule.finish(fit)
+            self.runningFittings = running
+            if not self.fittingQueue:
+                self.currentFitting = running and running[-1] or None
                 return
+            graph = FitDependencyGraph(self.fittingQueue + running)
+            started = []
+            for fit in graph.readyFittings(self.fittingQueue, running):
+                if len(running) + len(started) >= self.getWorkers():
+                    break
+                started.append(fit)
+            # avoid deadlock for circular links, run the first in queue
+            if not running and not started:
+                started.append(self.fittingQueue[0])
+            for fit in started:
+                self.fittingQueue.remove(fit)
+                self.runningFittings.append(fit)
+                self.schedule.start(fit)
+                fit.start()
+            self.currentFitting = self.runningFittings[-1]
+        finally:
+            self.lock.release()
+        return
+
+    def getScheduleReport(self):
+        """Timing summary of the last batch of queued fittings.
+
+        returns dictionary with wall time, busy and idle worker time,
+        critical path and per-fit timings, see FitSchedule.report().
+        """
+        try:
+            self.lock.acquire()
+            return self.schedule.report()
+        finally:
+            self.lock.release()
+
+    def isQueueActive(self):
+        """Check if there are queued or running fittings.
+
+        returns bool
+        """
+        try:
+            self.lock.acquire()
+            if self.fittingQueue:
+                return True
+            return any(f.isThreadRunning() for f in self.runningFittings)
         finally:
             self.lock.release()
 
-        self.currentFitting.start()
+    def waitQueue(self, timeout=None):
+        """Wait until all queued fittings are finished and recorded in
+        the schedule.  The queue manager must be running.
+
+        timeout -- maximum waiting time in seconds, no limit when None
+
+        returns True when the queue has finished, False on timeout
+        """
+        t0 = time.time()
+        while True:
+            with self.lock:
+                if not (self.fittingQueue or self.runningFittings):
+                    return True
+            if timeout is not None and time.time() - t0 >= timeout:
+                return False
+            # let the queue manager record finished fittings
+            self.queueEvent.set()
+            time.sleep(0.05)
+
+    def setWorkers(self, maxWorkers, useProcesses=None):
+        """Configure concurrent refinement of queued fittings.
+
+        maxWorkers   -- maximum number of fittings running at the same time,
+                        effective only with useProcesses
+        useProcesses -- run each refinement in a separate process with
+                        its own PdfFit engine.  Unchanged when None.
+        """
+        self.maxWorkers = max(1, int(maxWorkers))
+        if useProcesses is not None:
+            self.useProcesses = bool(useProcesses)
+        self.queueEvent.set()
+        return
+
+    def getWorkers(self):
+        """Number of fittings that can run at the same time.  Refinements
+        in threads share the engine output stream of this process, so
+        only one fitting runs at a time unless useProcesses is set.
+
+        returns maxWorkers when useProcesses is set, otherwise 1
+        """
+        if not self.useProcesses:
+            return 1
+        return self.maxWorkers
+
+    def getCalcExecutor(self):
+        """Get process pool that runs calculations of fittings alongside
+        their refinements.  Each worker process has its own engine, the
+        engine output stream cannot be shared by threads.  The pool is
+        created on the first call.
+
+        returns concurrent.futures.ProcessPoolExecutor
+        """
+        import concurrent.futures
+        import multiprocessing
+
+        with self.lock:
+            if self.calcExecutor is None:
+                ctx = multiprocessing.get_context("spawn")
+                self.calcExecutor = concurrent.futures.ProcessPoolExecutor(mp_context=ctx)
+        return self.calcExecutor
+
+    def getProfile(self):
+        """Summary of profiled phases of refinements, plotting and
+        project saving, see Profiler.getSummary().  Profiling must be
+        switched on with profiler.enable().
+
+        returns dictionary of phase timings and memory high-water marks
+        """
+        return self.profiler.getSummary()
+
+    def exportProfile(self, filename, format="json"):
+        """Write profiled phases to a file.
+
+        filename -- path to the output file
+        format   -- "json" for summary and timeline, "chrome" for
+                    Chrome trace
+
+        raise ControlValueError for unknown format.
+        """
+        self.profiler.write(filename, format)
+        return
+
+    def setSnapshotRetention(self, retention):
+        """Set global retention policy for vector items, such as Gcalc
+        and crw, saved after every refinement step.  The policy applies
+        to fittings without their own Fitting.retention.
+
+        retention -- instance of SnapshotRetention or a string such as
+                     "all", "last 10", "every 5" or "scalars"
+
+        raise ControlValueError for invalid retention string.
+        """
+        if isinstance(retention, str):
+            retention = SnapshotRetention.fromString(retention)
+        self.snapshotRetention = retention
+        for fit in self.fits:
+            if isinstance(fit, Fitting) and fit.retention is None and fit.isLoaded():
+                fit.snapshots.setRetention(retention)
+        return
 
     def enqueue(self, fits, enter=True):
         """Enqueue or dequeue fittings.
@@ -120,6 +298,9 @@ class PDFGuiControl:
         """
         try:
             self.lock.acquire()
+            if enter and not self.isQueueActive():
+                # new batch of fittings
+                self.schedule = FitSchedule(self.getWorkers())
             for fit in fits:
                 if enter:
                     try:
@@ -143,6 +324,7 @@ class PDFGuiControl:
                 fit.queue(enter)
         finally:
             self.lock.release()
+        self.queueEvent.set()
 
     def close(self, force=True):
         """Close a project.
@@ -155,13 +337,20 @@ class PDFGuiControl:
         for fit in self.fits:
             fit.close(force)
 
+        self.autosave.discard()
         self.reset()
 
     def exit(self):
         """Exit when program finished."""
+        self.autosave.stop()
         self.close()
+        if self.calcExecutor is not None:
+            self.calcExecutor.shutdown(wait=False, cancel_futures=True)
+            self.calcExecutor = None
+        self.serverPool.clear()
         if self.queueManager.is_alive():
             self.queueManager.running = False
+            self.queueEvent.set()
 
     def newFitting(self, name, position=None):
         """Insert a new instance of Fitting.
@@ -334,29 +523,21 @@ class PDFGuiControl:
         target.add(o, position)
         return o
 
-    def load(self, projfile):
+    def load(self, projfile, lazy=None):
         """Load project from projfile.
 
         projfile -- a zip file of everything
+        lazy     -- only build the internal hierarchy and defer loading
+                    of fits, datasets, structures and calculations until
+                    they are first used.  Use self.lazyLoad when None.
         """
+        if lazy is None:
+            lazy = self.lazyLoad
+        with self.profiler.phase("load"):
+            return self._load(projfile, lazy)
 
-        def _nameParser(namelist):
-            """Parse the zipfile name list to get a file tree."""
-            fileTree = {}
-            for name in namelist:
-                subs = name.split("/")
-                pathDict = fileTree
-                for x in subs[:-1]:
-                    # if no node has been created
-                    if x not in pathDict:
-                        pathDict[x] = {}
-                    pathDict = pathDict[x]
-
-                # check if the entry is a leaf(file, not folder)
-                if subs[-1] != "":
-                    pathDict[subs[-1]] = None
-            return fileTree
-
+    def _load(self, projfile, lazy):
+        """Load project from projfile, see load()."""
         self.projfile = projfile
         organizations = []
         import zipfile
@@ -372,6 +553,9 @@ class PDFGuiControl:
         try:
             z = zipfile.ZipFile(projfile, "r")
             z.fileTree = _nameParser(z.namelist())
+            archive = None
+            if lazy:
+                archive = LazyProjectArchive(projfile, z.fileTree)
 
             if len(z.fileTree) == 0:
                 raise ControlFileError(emsg_invalid_file)
@@ -401,7 +585,7 @@ class PDFGuiControl:
                 if rdname not in rootDict:
                     rdname = name
                 if rdname in rootDict:
-                    org = fit.load(z, projName + "/" + rdname + "/")
+                    org = fit.load(z, projName + "/" + rdname + "/", archive)
                 else:
                     # it's simply a blank fitting, has no info in proj file yet
                     org = fit.organization()
@@ -416,6 +600,9 @@ class PDFGuiControl:
             if z:
                 z.close()
 
+        self.projarchive = archive
+        # loaded project does not need recovery
+        self.autosave.discard()
         return organizations
 
     def save(self, projfile=None):
@@ -427,7 +614,12 @@ class PDFGuiControl:
         should something go wrong in the middle of save.  As an added
         benefit, all permissions and ownership flags in an existing
         projfile are preserved.
+
+        Members that did not change since the previous version of the
+        project are copied from it without recompression and fits that
+        were not loaded yet are copied without loading.
         """
+        sourcefile = self.projfile
         if projfile is not None:
             self.projfile = projfile
 
@@ -440,33 +632,37 @@ class PDFGuiControl:
 
         projbase = os.path.basename(self.projfile)
         projName = os.path.splitext(projbase)[0]
+        # tokens are valid only for the file they were saved to
+        tokens = None
+        if self.savedTokens is not None and self.savedTokens[0] == sourcefile:
+            tokens = self.savedTokens[1]
         # prepare to write
-        fitnames = []
-        z = None
         tmpfilename = None
         try:
             tmpfd, tmpfilename = tempfile.mkstemp()
             os.close(tmpfd)
-            z = zipfile.ZipFile(tmpfilename, "w", zipfile.ZIP_DEFLATED)
-            # fits also contain calculations
-            for fit in self.fits:
-                name = fit.name
-                fit.save(z, projName + "/" + quote_plus(fit.name) + "/")
-                fitnames.append(name)
-            if self.journal:
-                z.writestr(projName + "/journal", asunicode(self.journal))
-            ftxt = "\n".join(fitnames)
-            z.writestr(projName + "/fits", asunicode(ftxt))
-            z.close()
-            shutil.copyfile(tmpfilename, self.projfile)
-
-        except (IOError, pickle.PickleError):
+            # autosave must not read the project file while it is replaced
+            with self.autosave.lock, self.profiler.phase("save"):
+                z = writeProject(tmpfilename, projName, self.fits, self.journal, sourcefile, tokens)
+                # release the old project file before it is overwritten
+                if self.projarchive is not None:
+                    self.projarchive.close()
+                    self.projarchive = None
+                shutil.copyfile(tmpfilename, self.projfile)
+                # data that were not loaded are now in the saved file
+                if z.deferred:
+                    self.projarchive = LazyProjectArchive(self.projfile, _nameParser(z.namelist()))
+                    for component, subpath in z.deferred:
+                        component.deferLoad(self.projarchive, subpath)
+            self.savedTokens = (self.projfile, z.tokens)
+            self.autosave.discard()
+
+        except (IOError, zipfile.error, pickle.PickleError):
+            self.savedTokens = None
             emsg = "Error when writing to %s" % self.projfile
             raise ControlFileError(emsg)
 
         finally:
-            if z is not None:
-                z.close()
             if tmpfilename is not None:
                 os.remove(tmpfilename)
 
@@ -530,6 +726,84 @@ class PDFGuiControl:
         return txt
 
 
+class LazyProjectArchive:
+    """Read access to a project file for deferred loading of its fits,
+    datasets, structures and calculations.
+
+    Data members:
+        projfile -- path to the project file
+        fileTree -- dictionary tree of the project file members
+        lock     -- lock for reading from the project file
+    """
+
+    def __init__(self, projfile, fileTree):
+        """Initialize LazyProjectArchive.
+
+        projfile -- path to the project file
+        fileTree -- dictionary tree of the project file members
+        """
+        self.projfile = projfile
+        self.fileTree = fileTree
+        self.lock = threading.RLock()
+        self._zipfile = None
+        return
+
+    def load(self, component, subpath):
+        """Load deferred data of a component.  Do nothing if component
+        is already loaded.
+
+        component -- instance of PDFComponent with deferred data
+        subpath   -- path to its own storage within project file
+
+        raise ControlFileError when project file cannot be read
+        """
+        import zipfile
+
+        with self.lock:
+            if component.isLoaded():
+                return
+            del component._deferred
+            try:
+                if self._zipfile is None:
+                    self._zipfile = zipfile.ZipFile(self.projfile, "r")
+                    self._zipfile.fileTree = self.fileTree
+                component._loadDeferred(self._zipfile, subpath)
+            except (IOError, zipfile.error, pickle.PickleError):
+                component.deferLoad(self, subpath)
+                emsg = "Invalid or corrupted project %s." % self.projfile
+                raise ControlFileError(emsg)
+        return
+
+    def close(self):
+        """Close the project file.  It is reopened by the next load."""
+        with self.lock:
+            if self._zipfile is not None:
+                self._zipfile.close()
+                self._zipfile = None
+        return
+
+
+# End of class LazyProjectArchive
+
+
+def _nameParser(namelist):
+    """Parse the zipfile name list to get a file tree."""
+    fileTree = {}
+    for name in namelist:
+        subs = name.split("/")
+        pathDict = fileTree
+        for x in subs[:-1]:
+            # if no node has been created
+            if x not in pathDict:
+                pathDict[x] = {}
+            pathDict = pathDict[x]
+
+        # check if the entry is a leaf(file, not folder)
+        if subs[-1] != "":
+            pathDict[subs[-1]] = None
+    return fileTree
+
+
 _pdfguicontrol = None
 
 
@@ -17,10 +17,9 @@
 from __future__ import print_function
 
 import copy
-import os
 
-from diffpy.pdfgui.control.controlerrors import ControlValueError
-from diffpy.pdfgui.control.fitdataset import FitDataSet
+from diffpy.pdfgui.control.controlerrors import ControlFileError, ControlValueError
+from diffpy.pdfgui.control.datasetreader import readDataSets
 
 
 def makeRSeries(
@@ -195,13 +194,17 @@ def makeRSeries(
 
 
 # Temperature Series
-def makeTemperatureSeries(control, fit, paths, temperatures):
+def makeTemperatureSeries(control, fit, paths, temperatures, workers=None, processes=False, datasets=None):
     """Make a temperature series.
 
     control         --  pdguicontrol instance
     fit             --  The template fit
     paths           --  list of path names of new datasets
     temperatures    --  list of temperatures corresponding to the datasets
+    workers         --  maximum number of concurrent file readers
+    processes       --  flag for reading files in separate processes
+    datasets        --  optional list of FitDataSet objects already read
+                        from paths, files are read for None items
 
     returns a list of the new fit organization objects
     """
@@ -210,6 +213,7 @@ def makeTemperatureSeries(control, fit, paths, temperatures):
         message = "Can't apply macro to fits with multiple datasets."
         raise ControlValueError(message)
 
+    newdatasets = _readSeriesData(paths, workers, processes, datasets)
     fits = []
     # holds all of the other information about the dataset
     fitbasename = fit.name
@@ -217,7 +221,6 @@ def makeTemperatureSeries(control, fit, paths, temperatures):
     fitlastname = fit.name
     dataset = fit.datasets[0]
     for i in range(len(paths)):
-        filename = paths[i]
         fitlastname = fitnewname
 
         fitcopy = control.copy(fit)
@@ -227,9 +230,7 @@ def makeTemperatureSeries(control, fit, paths, temperatures):
         fitcopy.remove(temp)
 
         # Configure the new dataset
-        dsname = os.path.basename(filename)
-        newdataset = FitDataSet(dsname)
-        newdataset.readObs(filename)
+        newdataset = newdatasets[i]
 
         newdataset.qdamp = dataset.qdamp
         newdataset.qbroad = dataset.qbroad
@@ -266,7 +267,7 @@ def makeTemperatureSeries(control, fit, paths, temperatures):
 
 
 # Doping Series
-def makeDopingSeries(control, fit, base, dopant, paths, doping):
+def makeDopingSeries(control, fit, base, dopant, paths, doping, workers=None, processes=False, datasets=None):
     """Make a temperature series.
 
     control         --  pdguicontrol instance
@@ -275,6 +276,10 @@ def makeDopingSeries(control, fit, base, dopant, paths, doping):
     dopant          --  Name of the dopant element
     paths           --  list of path names of new datasets
     doping          --  list of doping values corresponding to the datasets
+    workers         --  maximum number of concurrent file readers
+    processes       --  flag for reading files in separate processes
+    datasets        --  optional list of FitDataSet objects already read
+                        from paths, files are read for None items
 
     returns a list of the new fit organization objects
     """
@@ -313,6 +318,7 @@ def makeDopingSeries(control, fit, base, dopant, paths, doping):
         message = "Can't apply macro to fits with multiple datasets."
         raise ControlValueError(message)
 
+    newdatasets = _readSeriesData(paths, workers, processes, datasets)
     fits = []
     # holds all of the other information about the dataset
     fitbasename = fit.name
@@ -320,7 +326,6 @@ def makeDopingSeries(control, fit, base, dopant, paths, doping):
     fitlastname = fit.name
     dataset = fit.datasets[0]
     for i in range(len(paths)):
-        filename = paths[i]
         fitlastname = fitnewname
 
         fitcopy = control.copy(fit)
@@ -330,9 +335,7 @@ def makeDopingSeries(control, fit, base, dopant, paths, doping):
         fitcopy.remove(temp)
 
         # Configure the new dataset
-        dsname = os.path.basename(filename)
-        newdataset = FitDataSet(dsname)
-        newdataset.readObs(filename)
+        newdataset = newdatasets[i]
 
         newdataset.qdamp = dataset.qdamp
         newdataset.qbroad = dataset.qbroad
@@ -376,6 +379,34 @@ def makeDopingSeries(control, fit, base, dopant, paths, doping):
     return [f.organization() for f in fits]
 
 
+def _readSeriesData(paths, workers, processes, datasets=None):
+    """Read all datasets of a series before any fit is created.
+
+    paths       --  list of path names of new datasets
+    workers     --  maximum number of concurrent file readers
+    processes   --  flag for reading files in separate processes
+    datasets    --  optional list of already read FitDataSet objects
+                    for paths, these are copied, None items are read
+
+    returns list of FitDataSet objects in the order of paths
+    raise ControlFileError with messages for all files that failed.
+    """
+    if datasets is None:
+        datasets = [None] * len(paths)
+    rv = [None if ds is None else ds.copy() for ds in datasets]
+    missing = [i for i, ds in enumerate(rv) if ds is None]
+    results = readDataSets([paths[i] for i in missing], workers, processes)
+    errors = []
+    for i, (dataset, error) in zip(missing, results):
+        rv[i] = dataset
+        if error is not None:
+            errors.append(error)
+    if errors:
+        message = "Cannot read %i of %i data files:\n%s" % (len(errors), len(paths), "\n".join(errors))
+        raise ControlFileError(message)
+    return rv
+
+
 if __name__ == "__main__":
     from diffpy.pdfgui.control.pdfguicontrol import PDFGuiControl
 
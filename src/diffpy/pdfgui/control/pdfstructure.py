@@ -15,6 +15,7 @@
 
 import copy
 import re
+from functools import lru_cache
 
 from diffpy.pdfgui.control.controlerrors import ControlFileError, ControlKeyError
 from diffpy.pdfgui.control.pdfcomponent import PDFComponent
@@ -86,46 +87,23 @@ class PDFStructure(PDFComponent, PDFFitStructure):
                  u22(i), u33(i), u12(i), u13(i), u23(i), where i=1..Natoms
         value -- new value of the variable
         """
-        barevar = var.strip()
-        fvalue = float(value)
-        parenthesis = re.match(r"^(\w+)\((\d+)\)$", barevar)
-        # common error message
-        emsg = "Invalid PdfFit phase variable %r" % barevar
-        if barevar in ("pscale"):
-            self.pdffit["scale"] = fvalue
-        elif barevar in PDFStructure._allowed_pdffit_vars:
-            self.pdffit[barevar] = fvalue
-        elif barevar == "lat(1)":
-            self.lattice.setLatPar(a=fvalue)
-        elif barevar == "lat(2)":
-            self.lattice.setLatPar(b=fvalue)
-        elif barevar == "lat(3)":
-            self.lattice.setLatPar(c=fvalue)
-        elif barevar == "lat(4)":
-            self.lattice.setLatPar(alpha=fvalue)
-        elif barevar == "lat(5)":
-            self.lattice.setLatPar(beta=fvalue)
-        elif barevar == "lat(6)":
-            self.lattice.setLatPar(gamma=fvalue)
-        elif parenthesis:
-            pvar = parenthesis.group(1)
-            idx = int(parenthesis.group(2))
-            atom = self[idx - 1]
-            if pvar == "x":
-                atom.xyz[0] = fvalue
-            elif pvar == "y":
-                atom.xyz[1] = fvalue
-            elif pvar == "z":
-                atom.xyz[2] = fvalue
-            elif pvar == "occ":
-                atom.occupancy = fvalue
-            elif pvar in ("u11", "u22", "u33", "u12", "u13", "u23"):
-                i, j = int(pvar[1]) - 1, int(pvar[2]) - 1
-                atom.U[i, j], atom.U[j, i] = fvalue, fvalue
-            else:
-                raise ControlKeyError(emsg)
-        else:
-            raise ControlKeyError(emsg)
+        owner, attr, index = _varSlot(var)
+        atom = self[owner] if attr is not None else None
+        self._setSlot(owner, attr, index, float(value), atom)
+        return
+
+    def setvars(self, values):
+        """Assign many PdfFit-style variables at once.  This is faster
+        than calling setvar() for each of them in large structures.
+
+        values -- dictionary of PdfFit variables and their new values,
+                  see setvar() for possible variables
+        """
+        atoms = list(self)
+        for var, value in values.items():
+            owner, attr, index = _varSlot(var)
+            atom = atoms[owner] if attr is not None else None
+            self._setSlot(owner, attr, index, float(value), atom)
         return
 
     def getvar(self, var):
@@ -140,50 +118,106 @@ class PDFStructure(PDFComponent, PDFFitStructure):
 
         returns value of var
         """
-        barevar = var.strip()
-        parenthesis = re.match(r"^(\w+)\((\d+)\)$", barevar)
-        # common error message
-        emsg = "Invalid PdfFit phase variable %r" % barevar
-        if barevar in ("pscale"):
-            value = self.pdffit["scale"]
-        elif barevar in PDFStructure._allowed_pdffit_vars:
-            value = self.pdffit[barevar]
-        elif barevar == "lat(1)":
-            value = self.lattice.a
-        elif barevar == "lat(2)":
-            value = self.lattice.b
-        elif barevar == "lat(3)":
-            value = self.lattice.c
-        elif barevar == "lat(4)":
-            value = self.lattice.alpha
-        elif barevar == "lat(5)":
-            value = self.lattice.beta
-        elif barevar == "lat(6)":
-            value = self.lattice.gamma
-        elif parenthesis:
-            pvar = parenthesis.group(1)
-            idx = int(parenthesis.group(2))
-            atom = self[idx - 1]
-            if pvar == "x":
-                value = atom.xyz[0]
-            elif pvar == "y":
-                value = atom.xyz[1]
-            elif pvar == "z":
-                value = atom.xyz[2]
-            elif pvar == "occ":
-                value = atom.occupancy
-            elif pvar in ("u11", "u22", "u33", "u12", "u13", "u23"):
-                i, j = int(pvar[1]) - 1, int(pvar[2]) - 1
-                value = atom.U[i, j]
+        owner, attr, index = _varSlot(var)
+        atom = self[owner] if attr is not None else None
+        return self._getSlot(owner, attr, index, atom)
+
+    def getvars(self, variables):
+        """Obtain values of many PdfFit-style variables at once.
+
+        variables -- list of PdfFit variables, see getvar()
+
+        returns list of float values
+        """
+        atoms = list(self)
+        rv = []
+        for var in variables:
+            owner, attr, index = _varSlot(var)
+            atom = atoms[owner] if attr is not None else None
+            rv.append(self._getSlot(owner, attr, index, atom))
+        return rv
+
+    def _getSlot(self, owner, attr, index, atom):
+        """Value of a slot obtained from _varSlot(), see _setSlot().
+
+        returns float value
+        """
+        if attr is None:
+            if owner == "pdffit":
+                value = self.pdffit[index]
             else:
-                raise ControlKeyError(emsg)
+                value = getattr(self.lattice, index)
         else:
-            raise ControlKeyError(emsg)
+            value = getattr(atom, attr)
+            if index is not None:
+                value = value[index[0]]
         # all should be fine here, but value may be NumPy.float64scalar type
         value = float(value)
         return value
 
+    def _setSlot(self, owner, attr, index, value, atom):
+        """Assign value to a slot obtained from _varSlot().
+
+        owner -- atom index or "pdffit" or "lattice"
+        attr  -- atom attribute or None for owner other than atom
+        index -- list of array indices in atom attribute, key in pdffit
+                 dictionary or lattice parameter name
+        value -- new float value
+        atom  -- Atom instance at the owner index
+        """
+        if attr is None:
+            if owner == "pdffit":
+                self.pdffit[index] = value
+            else:
+                self.lattice.setLatPar(**{index: value})
+        elif index is None:
+            setattr(atom, attr, value)
+        else:
+            array = getattr(atom, attr)
+            for idx in index:
+                array[idx] = value
+        return
+
 
 # End of class PDFStructure
 
+# lattice parameter names for the lat(n) variables
+_lattice_parameters = ("a", "b", "c", "alpha", "beta", "gamma")
+
+
+@lru_cache(maxsize=None)
+def _varSlot(var):
+    """Location of a PdfFit phase variable in PDFStructure.  The parsed
+    locations are cached, because the same variables are set in every
+    application of constraints.
+
+    var -- string representation of PdfFit variable
+
+    returns a tuple (owner, attr, index), see PDFStructure._setSlot().
+    raise ControlKeyError for invalid variable.
+    """
+    barevar = var.strip()
+    parenthesis = re.match(r"^(\w+)\((\d+)\)$", barevar)
+    # common error message
+    emsg = "Invalid PdfFit phase variable %r" % barevar
+    if barevar == "pscale":
+        return ("pdffit", None, "scale")
+    if barevar in PDFStructure._allowed_pdffit_vars:
+        return ("pdffit", None, barevar)
+    if not parenthesis:
+        raise ControlKeyError(emsg)
+    pvar = parenthesis.group(1)
+    idx = int(parenthesis.group(2))
+    if pvar == "lat" and 1 <= idx <= 6:
+        return ("lattice", None, _lattice_parameters[idx - 1])
+    if pvar in ("x", "y", "z"):
+        return (idx - 1, "xyz", ("xyz".index(pvar),))
+    if pvar == "occ":
+        return (idx - 1, "occupancy", None)
+    if pvar in ("u11", "u22", "u33", "u12", "u13", "u23"):
+        i, j = int(pvar[1]) - 1, int(pvar[2]) - 1
+        return (idx - 1, "U", ((i, j), (j, i)))
+    raise ControlKeyError(emsg)
+
+
 # End of file
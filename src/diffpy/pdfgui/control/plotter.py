@@ -13,6 +13,8 @@
 #
 ##############################################################################
 
+import numpy
+
 from diffpy.pdfgui.control.controlerrors import ControlConfigError, ControlStatusError
 from diffpy.pdfgui.control.pdfcomponent import PDFComponent
 from diffpy.pdfgui.gui.extendedplotframe import ExtendedPlotFrame
@@ -164,6 +166,9 @@ class Plotter(PDFComponent):
         x, y -- original data for exporting (curve could be shifted)
         bMultiData -- if the curve data comes from multiple data objects
         bMultiStep -- if the curve data comes from multiple refinement step
+        bAppend -- if the curve is a step trace of a single object, which
+                   is extended only with the new steps
+        npoints -- number of points in the step trace
         ref -- reference of curve in the plot window
         initialized -- if curve has been inserted
         dataChanged -- if curve data has changed
@@ -194,6 +199,10 @@ class Plotter(PDFComponent):
             self.bMultiStep = False
             if self.steps is None or isinstance(self.steps, list):
                 self.bMultiStep = True
+            self.bAppend = self.xStr == "step" and self.bMultiStep and not self.bMultiData
+            self.npoints = 0
+            # rows of step, value and shifted value for a step trace
+            self._trace = numpy.empty((3, 0))
 
             self.xData = None
             self.yData = None
@@ -291,6 +300,9 @@ class Plotter(PDFComponent):
                         self.xData[i] = i
                     else:
                         self.xData[i] = id.getData(xStr, -1)
+            elif self.bAppend:
+                # step trace, affectedIds has only one member
+                return self._appendSteps(affectedIds[0])
             else:
                 # affectedIds has only one member
                 if self.bMultiStep:
@@ -312,17 +324,50 @@ class Plotter(PDFComponent):
                 self.x = self.xData
                 self.y = self.yData
 
-                def _shift(y):
-                    return y + self.offset
-
-                if self.yData and self.offset:  # not zero
-                    self.yData = [_shift(yi) for yi in self.yData]
+                if _hasData(self.yData) and self.offset:  # not zero
+                    self.yData = numpy.add(self.yData, self.offset)
 
-            if self.xData and self.yData:  # not empty or None
+            if _hasData(self.xData) and _hasData(self.yData):
                 return self.draw()
             else:
                 return False
 
+        def _appendSteps(self, id):
+            """Extend step trace with the new refinement steps.
+
+            id -- object with the plotted data
+
+            return True if the curve was drawn.
+            """
+            yData = id.getData(self.yStr, None)
+            if not _hasData(yData):
+                return False
+            n = len(yData)
+            start = self.npoints
+            # refinement history was restarted if the last stored value differs
+            if start and (
+                n < start or not numpy.array_equal(yData[start - 1], self._trace[1, start - 1], equal_nan=True)
+            ):
+                start = 0
+            if n == start and self.ref is not None:
+                return False
+            if n > self._trace.shape[1]:
+                trace = numpy.empty((3, max(n, 2 * self._trace.shape[1], 64)))
+                trace[:, :start] = self._trace[:, :start]
+                self._trace = trace
+            trace = self._trace
+            trace[0, start:n] = numpy.arange(start, n)
+            trace[1, start:n] = numpy.asarray(yData[start:n], dtype=float)
+            trace[2, start:n] = trace[1, start:n] + self.offset
+            self.npoints = n
+            self.x = self.xData = trace[0, :n]
+            self.y = trace[1, :n]
+            self.yData = trace[2, :n]
+            if self.ref is None or start == 0:
+                return self.draw()
+            self.plotwnd.appendData(self.ref, self.xData, self.yData, n - start)
+            return True
+
         def draw(self):
             """Draw the curve in the graph.
 
@@ -344,7 +389,7 @@ class Plotter(PDFComponent):
                 xs = self.xData
                 ys = self.yData
 
-            if not xs or not ys:
+            if not (_hasData(xs) and _hasData(ys)):
                 return False
 
             # If it can get here, data is ready now.
@@ -643,6 +688,18 @@ class Plotter(PDFComponent):
 # End of class Plotter
 
 
+def _hasData(data):
+    """Check if data is not None and not empty.  Works for lists and
+    numpy arrays.
+    """
+    if data is None:
+        return False
+    try:
+        return len(data) > 0
+    except TypeError:
+        return True
+
+
 def _exportCompactData(fp, xylist, xynames=None):
     """Write the xylist data in a text format to the file object fp.
     The curves with the same x are grouped in the same datasets.
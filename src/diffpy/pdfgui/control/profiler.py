@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Timing of refinement phases, such as configure, refine_step or
+plotting, exported as JSON summary or Chrome trace."""
+
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+
+from diffpy.pdfgui.control.controlerrors import ControlValueError
+
+# shared context manager for phases of disabled Profiler
+_NOPHASE = contextlib.nullcontext()
+
+
+class Profiler:
+    """Record wall time and call counts of control-layer phases.
+
+    Every phase is recorded with the name of its fitting and the
+    refinement step.  Phases are summed per name and per fitting, the
+    last maxevents phases are kept as a timeline for the Chrome trace.
+    Memory of the refinement history is kept as a high-water mark per
+    fitting.  Recording is off by default, a disabled profiler costs
+    only a flag check per phase.
+
+    Data members:
+        enabled   -- flag for recording phases
+        maxevents -- maximum number of phases kept in the timeline
+    """
+
+    # formats supported by write()
+    formats = ("json", "chrome")
+
+    def __init__(self, enabled=False, maxevents=100000):
+        """Create Profiler.
+
+        enabled   -- flag for recording phases
+        maxevents -- maximum number of phases kept in the timeline
+        """
+        self.enabled = enabled
+        self.maxevents = maxevents
+        self._lock = threading.Lock()
+        self.reset()
+        return
+
+    def enable(self, flag=True):
+        """Switch recording of phases on or off."""
+        self.enabled = bool(flag)
+        return
+
+    def reset(self):
+        """Discard all recorded data."""
+        with self._lock:
+            self._t0 = time.perf_counter()
+            self._phases = collections.defaultdict(_PhaseStats)
+            self._fits = collections.defaultdict(lambda: collections.defaultdict(_PhaseStats))
+            self._memory = {}
+            self._events = collections.deque(maxlen=self.maxevents)
+        return
+
+    def phase(self, name, fit=None, step=None):
+        """Context manager that records the wall time of a block.
+
+        name -- phase name, for example "refine_step"
+        fit  -- name of the fitting or None
+        step -- refinement step or None
+        """
+        if not self.enabled:
+            return _NOPHASE
+        return self._timed(name, fit, step)
+
+    def record(self, name, start, duration, fit=None, step=None):
+        """Record one phase.
+
+        name     -- phase name
+        start    -- time.perf_counter() at the start of the phase
+        duration -- wall time of the phase in seconds
+        fit      -- name of the fitting or None
+        step     -- refinement step or None
+        """
+        event = (name, start, duration, fit, step, threading.get_ident())
+        with self._lock:
+            self._phases[name].add(duration)
+            if fit is not None:
+                self._fits[fit][name].add(duration)
+            self._events.append(event)
+        return
+
+    def recordMemory(self, fit, nbytes):
+        """Update memory high-water mark of a fitting.
+
+        fit    -- name of the fitting
+        nbytes -- current memory use in bytes
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._memory[fit] = max(nbytes, self._memory.get(fit, 0))
+        return
+
+    def getSummary(self):
+        """Summary of the recorded phases.
+
+        returns dictionary with items
+            "wall"   -- seconds since the last reset
+            "phases" -- {name : {"calls", "total", "max"}} for all phases
+            "fits"   -- {fit : {name : {"calls", "total", "max"}}}
+            "memory" -- {fit : high-water mark of history memory in bytes}
+        """
+        with self._lock:
+            rv = {
+                "wall": time.perf_counter() - self._t0,
+                "phases": dict((n, s.todict()) for n, s in self._phases.items()),
+                "fits": dict(
+                    (f, dict((n, s.todict()) for n, s in phases.items())) for f, phases in self._fits.items()
+                ),
+                "memory": dict(self._memory),
+            }
+        return rv
+
+    def getTrace(self):
+        """Recorded phases in the Chrome trace event format, to be viewed
+        in chrome://tracing or Perfetto.
+
+        returns dictionary with "traceEvents" list
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            memory = dict(self._memory)
+        trace = []
+        for name, start, duration, fit, step, tid in events:
+            item = {
+                "name": name,
+                "cat": "pdfgui",
+                "ph": "X",
+                "ts": (start - self._t0) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": {"fit": fit, "step": step},
+            }
+            trace.append(item)
+        if memory:
+            ts = trace[-1]["ts"] + trace[-1]["dur"] if trace else 0
+            trace.append({"name": "history memory", "ph": "C", "ts": ts, "pid": pid, "args": memory})
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def formatSummary(self):
+        """Summary of phases as a text table sorted by total time."""
+        summary = self.getSummary()
+        lines = ["%-24s %8s %12s %12s" % ("phase", "calls", "total [s]", "max [s]")]
+        phases = sorted(summary["phases"].items(), key=lambda x: -x[1]["total"])
+        for name, st in phases:
+            lines.append("%-24s %8i %12.4f %12.4f" % (name, st["calls"], st["total"], st["max"]))
+        for fit, nbytes in sorted(summary["memory"].items()):
+            lines.append("history memory of %s: %i bytes" % (fit, nbytes))
+        lines.append("wall time %.4f s" % summary["wall"])
+        return "\n".join(lines) + "\n"
+
+    def write(self, filename, format="json"):
+        """Write recorded data to a file.
+
+        filename -- path to the output file
+        format   -- "json" for summary and timeline, "chrome" for
+                    Chrome trace
+
+        raise ControlValueError for unknown format.
+        """
+        if format == "json":
+            data = {"summary": self.getSummary(), "events": self._eventDicts()}
+        elif format == "chrome":
+            data = self.getTrace()
+        else:
+            emsg = "Unknown profile format %r, use one of %s." % (format, ", ".join(self.formats))
+            raise ControlValueError(emsg)
+        with open(filename, "w") as fp:
+            json.dump(data, fp, indent=1)
+        return
+
+    # protected methods
+
+    @contextlib.contextmanager
+    def _timed(self, name, fit, step):
+        """Generator of phase context manager for enabled profiler."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start, fit, step)
+        return
+
+    def _eventDicts(self):
+        """List of recorded phases as dictionaries."""
+        keys = ("name", "start", "duration", "fit", "step", "thread")
+        with self._lock:
+            events = list(self._events)
+        rv = [dict(zip(keys, e)) for e in events]
+        for e in rv:
+            e["start"] -= self._t0
+        return rv
+
+
+# End of class Profiler
+
+
+class _PhaseStats:
+    """Call count, total and maximum time of one phase."""
+
+    __slots__ = ("calls", "total", "max")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        return
+
+    def add(self, duration):
+        self.calls += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        return
+
+    def todict(self):
+        return {"calls": self.calls, "total": self.total, "max": self.max}
+
+
+# End of class _PhaseStats
+
+# End of file
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Incremental writing of project files, which copies unchanged members
+from the previous version of the project without recompression."""
+
+import os
+import struct
+import zipfile
+import zlib
+
+# flag bits of zip members that prevent raw copy
+_MASK_ENCRYPTED = 0x01
+_MASK_USE_DATA_DESCRIPTOR = 0x08
+_MASK_UTF8 = 0x800
+
+
+class ProjectWriter:
+    """Write-only project zip file used by PDFGuiControl.save().
+
+    Members with the same content as in the source project file are
+    copied in their compressed form, the other members are compressed.
+    Components with data deferred by lazy loading are copied without
+    being loaded.
+
+    Data members:
+        zipfile  -- ZipFile open for writing
+        prefix   -- project name, the top folder in zipfile
+        written  -- number of compressed members
+        copied   -- number of members copied from the source
+        tokens   -- dictionary of {member : (token, CRC, file_size)}
+                    for members written by writeCached()
+        deferred -- list of (component, subpath) pairs for components
+                    copied without loading
+    """
+
+    def __init__(self, filename, prefix, source=None, tokens=None):
+        """Open ProjectWriter.
+
+        filename -- path to the new zip file
+        prefix   -- project name in the new zip file
+        source   -- path to previous version of the project or None.
+                    Ignored if it is not a valid zip file.
+        tokens   -- dictionary of member tokens from the previous save
+                    to source, see writeCached()
+        """
+        self.zipfile = zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED)
+        self.prefix = prefix
+        self.written = 0
+        self.copied = 0
+        self.tokens = {}
+        self.deferred = []
+        self._sourcetokens = tokens or {}
+        # dictionary of {absolute path : ZipFile} for raw copies
+        self._zipfiles = {}
+        self._source = None if source is None else self._openSource(source)
+        self._sourceprefix = None
+        if self._source is not None:
+            names = self._source.namelist()
+            self._sourceprefix = names[0].split("/")[0] if names else prefix
+        return
+
+    def writestr(self, name, data):
+        """Write member, copy it from the source when unchanged.
+
+        name -- member name starting with the project prefix
+        data -- member content, str or bytes
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        info = self._sourceInfo(name)
+        if info is not None and info.file_size == len(data) and info.CRC == zlib.crc32(data):
+            self._copyRaw(info, name)
+        else:
+            self.zipfile.writestr(name, data)
+            self.written += 1
+        return
+
+    def writeCached(self, name, token, factory):
+        """Write member that is expensive to serialize.  The member is
+        copied from the source when it was saved there with the same
+        token, otherwise its content is obtained from factory().
+
+        name    -- member name starting with the project prefix
+        token   -- hashable value that changes with the member content
+        factory -- function that returns the member content
+        """
+        info = self._sourceInfo(name)
+        saved = self._sourcetokens.get(self._sourceName(name))
+        if info is not None and saved == (token, info.CRC, info.file_size):
+            self._copyRaw(info, name)
+        else:
+            self.writestr(name, factory())
+            info = self.zipfile.getinfo(name)
+        self.tokens[name] = (token, info.CRC, info.file_size)
+        return
+
+    def copyDeferred(self, component, subpath):
+        """Copy data of a component that was not loaded yet.  Only the
+        members directly in the component folder are copied.
+
+        component -- instance of PDFComponent
+        subpath   -- path to its own storage in the new project
+
+        returns True when copied, False when the component is loaded or
+        its project file cannot be read.
+        """
+        deferred = component.__dict__.get("_deferred")
+        if deferred is None:
+            return False
+        archive, oldpath = deferred
+        source = self._openSource(archive.projfile)
+        if source is None:
+            return False
+        node = archive.fileTree
+        for x in oldpath.split("/"):
+            if x:
+                node = node.get(x) or {}
+        infos = []
+        for leaf, value in node.items():
+            if value is not None:
+                continue
+            try:
+                infos.append((source.getinfo(oldpath + leaf), subpath + leaf))
+            except KeyError:
+                return False
+        for info, name in infos:
+            self._copyRaw(info, name, source)
+        self.deferred.append((component, subpath))
+        return True
+
+    def namelist(self):
+        """List of member names in the new project."""
+        return self.zipfile.namelist()
+
+    def close(self):
+        """Finish writing of the new project and close the sources."""
+        self.zipfile.close()
+        for source in self._zipfiles.values():
+            if source is not None:
+                source.close()
+        self._zipfiles.clear()
+        self._source = None
+        return
+
+    # protected methods
+
+    def _openSource(self, filename):
+        """Open zip file for raw copies, return None if invalid."""
+        path = os.path.abspath(filename)
+        if path not in self._zipfiles:
+            source = None
+            if os.path.isfile(path):
+                try:
+                    source = zipfile.ZipFile(path, "r")
+                except (IOError, zipfile.error):
+                    source = None
+            self._zipfiles[path] = source
+        return self._zipfiles[path]
+
+    def _sourceName(self, name):
+        """Member name in the source project."""
+        if self._sourceprefix is None or not name.startswith(self.prefix + "/"):
+            return name
+        return self._sourceprefix + name[len(self.prefix) :]
+
+    def _sourceInfo(self, name):
+        """ZipInfo of a member in the source that can be copied raw or
+        None."""
+        if self._source is None:
+            return None
+        try:
+            info = self._source.getinfo(self._sourceName(name))
+        except KeyError:
+            return None
+        if info.flag_bits & _MASK_ENCRYPTED:
+            return None
+        return info
+
+    def _copyRaw(self, info, name, source=None):
+        """Copy compressed member from the source without recompression.
+        Raw copy uses internals of the zipfile module, the member is
+        decompressed and compressed again when these are not as expected.
+
+        info   -- ZipInfo of the source member
+        name   -- member name in the new project
+        source -- ZipFile with the member, by default the source project
+        """
+        source = source or self._source
+        zinfo = zipfile.ZipInfo(name, info.date_time)
+        zinfo.compress_type = info.compress_type
+        zinfo.external_attr = info.external_attr
+        data = self._readRaw(source, info)
+        if data is None or not self._writeRaw(zinfo, info, data):
+            self.zipfile.writestr(zinfo, source.read(info.filename))
+            self.written += 1
+            return
+        self.copied += 1
+        return
+
+    @staticmethod
+    def _readRaw(source, info):
+        """Read compressed data of a member from the source zip file.
+
+        returns bytes or None when the local header of the member
+        does not match info.
+        """
+        try:
+            fp = source.fp
+            fp.seek(info.header_offset)
+            header = struct.unpack(zipfile.structFileHeader, fp.read(zipfile.sizeFileHeader))
+            if header[0] != zipfile.stringFileHeader or header[4] != info.compress_type:
+                return None
+            # file name and extra field follow the local header
+            filename = fp.read(header[-2])
+            encoding = "utf-8" if info.flag_bits & _MASK_UTF8 else "cp437"
+            if filename.decode(encoding) != info.orig_filename:
+                return None
+            fp.seek(header[-1], 1)
+            data = fp.read(info.compress_size)
+        except (AttributeError, IndexError, OSError, ValueError, struct.error):
+            return None
+        if len(data) != info.compress_size:
+            return None
+        return data
+
+    def _writeRaw(self, zinfo, info, data):
+        """Append compressed member data to the new zip file.
+
+        zinfo -- new ZipInfo for the member
+        info  -- ZipInfo of the source member with sizes and CRC
+        data  -- compressed data of the member
+
+        returns True when written, False if the ZipFile does not have
+        the expected internals.
+        """
+        z = self.zipfile
+        required = ("fp", "start_dir", "filelist", "NameToInfo", "_didModify")
+        if not all(hasattr(z, a) for a in required) or getattr(z, "_writing", False):
+            return False
+        if not isinstance(z.start_dir, int) or not isinstance(z.filelist, list):
+            return False
+        zinfo.flag_bits = info.flag_bits & ~_MASK_USE_DATA_DESCRIPTOR
+        zinfo.CRC = info.CRC
+        zinfo.compress_size = info.compress_size
+        zinfo.file_size = info.file_size
+        z.fp.seek(z.start_dir)
+        zinfo.header_offset = z.fp.tell()
+        z.fp.write(zinfo.FileHeader())
+        z.fp.write(data)
+        z.filelist.append(zinfo)
+        z.NameToInfo[zinfo.filename] = zinfo
+        z.start_dir = z.fp.tell()
+        z._didModify = True
+        return True
+
+
+# End of class ProjectWriter
+
+
+def writeProject(filename, projName, fits, journal="", source=None, tokens=None):
+    """Write fittings and journal to a new project file.
+
+    filename -- path to the new zip file
+    projName -- project name, the top folder in the zip file
+    fits     -- list of Fitting objects
+    journal  -- project journal
+    source   -- path to previous version of the project for raw copies
+    tokens   -- member tokens from the previous save to source
+
+    returns closed ProjectWriter with the statistics, tokens and
+    components that were copied without loading.
+    """
+    from urllib.parse import quote_plus
+
+    from diffpy.pdfgui.utils import asunicode
+
+    z = ProjectWriter(filename, projName, source, tokens)
+    try:
+        # fits also contain calculations
+        fitnames = []
+        for fit in fits:
+            fit.save(z, projName + "/" + quote_plus(fit.name) + "/")
+            fitnames.append(fit.name)
+        if journal:
+            z.writestr(projName + "/journal", asunicode(journal))
+        ftxt = "\n".join(fitnames)
+        z.writestr(projName + "/fits", asunicode(ftxt))
+    finally:
+        z.close()
+    return z
+
+
+# End of file
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Pool of reusable PdfFit engine instances."""
+
+import contextlib
+import threading
+
+from diffpy.pdfgui.control.controlerrors import ControlValueError
+
+
+def _newPdfFit():
+    """Create a new PdfFit engine instance."""
+    from diffpy.pdffit2 import PdfFit
+
+    return PdfFit()
+
+
+class ServerPool:
+    """Bounded pool of idle PdfFit servers shared by fittings,
+    calculations and bond queries.
+
+    Servers are reset when they are returned to the pool, so a checked
+    out server is always clean.  A server is preferably handed back to
+    the thread which returned it last.  Checkout never blocks, a new
+    server is created when the pool is empty; servers returned to a
+    full pool are dropped.
+
+    Data members:
+        factory   -- function that creates a new server
+        created   -- number of servers created by the pool
+        reused    -- number of checkouts served from the pool
+        discarded -- number of returned servers dropped from full pool
+                     or after a failed reset
+    """
+
+    def __init__(self, maxsize=4, factory=None):
+        """Create ServerPool.
+
+        maxsize -- maximum number of idle servers kept for reuse,
+                   pooling is disabled when 0
+        factory -- function that creates a new server, use PdfFit
+                   when None
+        """
+        self.factory = factory or _newPdfFit
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self._maxsize = 0
+        self._idle = []
+        self._lock = threading.Lock()
+        self.setMaxSize(maxsize)
+        return
+
+    def setMaxSize(self, maxsize):
+        """Set maximum number of idle servers kept for reuse.
+
+        maxsize -- non-negative integer, 0 disables pooling
+
+        raises ControlValueError for negative or invalid maxsize.
+        """
+        try:
+            size = int(maxsize)
+        except (TypeError, ValueError):
+            raise ControlValueError("Invalid server pool size %r." % (maxsize,))
+        if size < 0:
+            raise ControlValueError("Server pool size must be non-negative.")
+        with self._lock:
+            self._maxsize = size
+            self.discarded += max(0, len(self._idle) - size)
+            del self._idle[size:]
+        return
+
+    def getMaxSize(self):
+        """Maximum number of idle servers kept for reuse."""
+        return self._maxsize
+
+    maxsize = property(getMaxSize, setMaxSize)
+
+    def checkout(self):
+        """Get a clean server from the pool or create a new one.
+
+        returns server instance, it should be returned with checkin().
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            if self._idle:
+                owners = [o for o, s in self._idle]
+                idx = owners.index(ident) if ident in owners else -1
+                owner, server = self._idle.pop(idx)
+                self.reused += 1
+                return server
+        server = self.factory()
+        self.created += 1
+        return server
+
+    def checkin(self, server):
+        """Reset server and return it to the pool.
+
+        server -- server obtained from checkout().  It is dropped when
+                  the pool is full or when its reset fails.
+        """
+        try:
+            server.reset()
+        except Exception:
+            # server in unknown state, do not raise over errors of lease()
+            with self._lock:
+                self.discarded += 1
+            return
+        with self._lock:
+            if len(self._idle) < self._maxsize:
+                self._idle.append((threading.get_ident(), server))
+                return
+            self.discarded += 1
+        return
+
+    @contextlib.contextmanager
+    def lease(self):
+        """Context manager that checks out a server and returns it
+        to the pool when the block exits.
+        """
+        server = self.checkout()
+        try:
+            yield server
+        finally:
+            self.checkin(server)
+        return
+
+    def idle(self):
+        """Number of idle servers in the pool."""
+        return len(self._idle)
+
+    def clear(self):
+        """Drop all idle servers."""
+        with self._lock:
+            del self._idle[:]
+        return
+
+
+# End of class ServerPool
+
+# End of file
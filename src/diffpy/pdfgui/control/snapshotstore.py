@@ -0,0 +1,544 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Columnar storage of refinement history used by Fitting.snapshots."""
+
+import itertools
+
+import numpy
+
+from diffpy.pdfgui.control.controlerrors import ControlValueError
+
+# unique versions of SnapshotStore content
+_versions = itertools.count(1)
+
+
+class SnapshotRetention(object):
+    """Policy for keeping vector items, such as Gcalc and crw, of past
+    refinement steps.  Scalar items are always kept for every step.
+
+    Data members:
+        mode  -- "all" keeps vectors of all steps,
+                 "last" keeps vectors of the last count steps,
+                 "every" keeps vectors of every count-th step and of
+                 the latest step,
+                 "scalars" does not keep any vectors
+        count -- number of steps for "last", step interval for "every"
+    """
+
+    modes = ("all", "last", "every", "scalars")
+
+    def __init__(self, mode="all", count=None):
+        """Initialize SnapshotRetention.
+
+        mode  -- retention mode, one of SnapshotRetention.modes
+        count -- positive integer required for "last" and "every" modes
+
+        raise ControlValueError for invalid mode or count.
+        """
+        if mode not in SnapshotRetention.modes:
+            raise ControlValueError("Invalid snapshot retention mode %r." % (mode,))
+        if mode in ("last", "every"):
+            try:
+                count = int(count)
+            except (TypeError, ValueError):
+                count = 0
+            if count < 1:
+                emsg = "Snapshot retention %r requires positive count." % mode
+                raise ControlValueError(emsg)
+        else:
+            count = None
+        self.mode = mode
+        self.count = count
+        return
+
+    @staticmethod
+    def fromString(s):
+        """Create SnapshotRetention from its string representation, such
+        as "all", "last 10", "every 5" or "scalars".
+
+        raise ControlValueError for invalid string.
+        """
+        words = s.split()
+        if len(words) not in (1, 2):
+            raise ControlValueError("Invalid snapshot retention %r." % (s,))
+        return SnapshotRetention(*words)
+
+    def __str__(self):
+        if self.count is None:
+            return self.mode
+        return "%s %i" % (self.mode, self.count)
+
+    def __repr__(self):
+        return "SnapshotRetention(%r, %r)" % (self.mode, self.count)
+
+    def __eq__(self, other):
+        if not isinstance(other, SnapshotRetention):
+            return NotImplemented
+        return (self.mode, self.count) == (other.mode, other.count)
+
+    def __ne__(self, other):
+        rv = self.__eq__(other)
+        return rv if rv is NotImplemented else not rv
+
+    def __hash__(self):
+        return hash((self.mode, self.count))
+
+    def keeps(self, step, last):
+        """Check if vectors of a step are kept.
+
+        step -- index of refinement step
+        last -- index of the latest step
+
+        returns bool
+        """
+        if self.mode == "all":
+            return True
+        elif self.mode == "last":
+            return step > last - self.count
+        elif self.mode == "every":
+            return step % self.count == 0 or step == last
+        return False
+
+    def dropped(self, last):
+        """Find step that is no longer kept after appending a new step.
+
+        last -- index of the newly appended step
+
+        returns step index or None
+        """
+        if self.mode == "last":
+            step = last - self.count
+        elif self.mode == "every":
+            step = last - 1
+        else:
+            return None
+        if step >= 0 and not self.keeps(step, last):
+            return step
+        return None
+
+
+# End of class SnapshotRetention
+
+
+class _VectorColumn(object):
+    """Rows of one vector item for the kept refinement steps.
+
+    The used rows are rows[begin:end] and their step indices are
+    steps[begin:end].  Steps are dropped only from either end, so that
+    both appending and dropping are cheap.
+    """
+
+    def __init__(self, shape):
+        self.shape = tuple(shape)
+        self.steps = numpy.empty(0, dtype=int)
+        self.rows = numpy.empty((0,) + self.shape)
+        self.begin = 0
+        self.end = 0
+        return
+
+    def __len__(self):
+        return self.end - self.begin
+
+    def append(self, step, value):
+        """Store value for a new step."""
+        if self.end == len(self.steps):
+            self._compact(max(2 * len(self), 16))
+        self.steps[self.end] = step
+        self.rows[self.end] = value
+        self.end += 1
+        return
+
+    def drop(self, step):
+        """Remove the first or the last kept step."""
+        if self.end > self.begin and self.steps[self.begin] == step:
+            self.begin += 1
+        elif self.end > self.begin and self.steps[self.end - 1] == step:
+            self.end -= 1
+        return
+
+    def filter(self, mask):
+        """Keep only rows where mask is True."""
+        mask = numpy.asarray(mask, dtype=bool)
+        self.steps = self.steps[self.begin : self.end][mask]
+        self.rows = self.rows[self.begin : self.end][mask]
+        self.begin = 0
+        self.end = len(self.steps)
+        return
+
+    def find(self, step):
+        """Index of row for the step or None when step is not kept."""
+        steps = self.steps[self.begin : self.end]
+        i = numpy.searchsorted(steps, step)
+        if i < len(steps) and steps[i] == step:
+            return self.begin + i
+        return None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["steps"] = self.steps[self.begin : self.end].copy()
+        state["rows"] = self.rows[self.begin : self.end].copy()
+        state["begin"] = 0
+        state["end"] = len(self)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        return
+
+    def _compact(self, capacity):
+        """Move used rows to the start of arrays with capacity rows."""
+        n = len(self)
+        steps = numpy.empty(capacity, dtype=int)
+        rows = numpy.empty((capacity,) + self.shape)
+        steps[:n] = self.steps[self.begin : self.end]
+        rows[:n] = self.rows[self.begin : self.end]
+        self.steps, self.rows = steps, rows
+        self.begin, self.end = 0, n
+        return
+
+
+# End of class _VectorColumn
+
+
+class SnapshotStore(object):
+    """Refinement history stored by columns.
+
+    A snapshot is a list of values of all items saved after one
+    refinement step, indexed as in Fitting.dataNameDict.  Scalar items
+    are kept in one 2-D array with a row per step.  Vector items, such
+    as Gcalc and crw, have their own 2-D array with a row per kept step,
+    as set by the retention policy.  Items with varying shape fall back
+    to a list of values.  Items that were None in all snapshots get
+    their storage with the first value that is not None.  The arrays are
+    preallocated and grow geometrically, so that appending is cheap.
+
+    SnapshotStore behaves as a read-only list of snapshots for len(),
+    iteration and indexing, vector items of steps that are not kept are
+    None.  Use getItem() for fast access to a single item over many
+    steps.
+
+    Data members:
+        retention -- instance of SnapshotRetention, use setRetention()
+                     to change it
+        version   -- number that changes with every modification of
+                     stored data and is unique among all stores
+    """
+
+    def __init__(self, snapshots=(), retention=None):
+        """Initialize SnapshotStore.
+
+        snapshots -- optional list of snapshots to be appended
+        retention -- SnapshotRetention policy, keep all when None
+        """
+        self.retention = retention or SnapshotRetention()
+        self.clear()
+        snapshots = list(snapshots)
+        if snapshots:
+            self._setLayout(snapshots)
+        for snapshot in snapshots:
+            self.append(snapshot)
+        return
+
+    def clear(self):
+        """Remove all snapshots."""
+        # number of stored steps and allocated rows
+        self._nsteps = 0
+        self._capacity = 0
+        # number of items in a snapshot
+        self._width = None
+        # dictionary of {item index : column in self._scalars}
+        self._scalarcols = {}
+        self._scalars = numpy.empty((0, 0))
+        # dictionary of {item index : _VectorColumn}
+        self._vectors = {}
+        # dictionary of {item index : list of values}
+        self._objects = {}
+        # indices of items that were always None
+        self._pending = set()
+        self.version = next(_versions)
+        return
+
+    def setRetention(self, retention):
+        """Change retention policy and drop vectors of the steps that
+        are no longer kept.
+
+        retention -- instance of SnapshotRetention
+        """
+        if retention == self.retention:
+            return
+        self.retention = retention
+        self.version = next(_versions)
+        last = self._nsteps - 1
+        for column in self._vectors.values():
+            steps = column.steps[column.begin : column.end]
+            column.filter([retention.keeps(i, last) for i in steps])
+        for values in self._objects.values():
+            for i, value in enumerate(values):
+                if numpy.ndim(value) > 0 and not retention.keeps(i, last):
+                    values[i] = None
+        return
+
+    def __len__(self):
+        return self._nsteps
+
+    def __iter__(self):
+        for i in range(self._nsteps):
+            yield self[i]
+
+    def __getitem__(self, step):
+        """Snapshot at the specified step as a list of values."""
+        steps = range(self._nsteps)[step]
+        if isinstance(steps, range):
+            return [self[i] for i in steps]
+        rv = [None] * self._width
+        for idx, col in self._scalarcols.items():
+            rv[idx] = float(self._scalars[steps, col])
+        for idx, column in self._vectors.items():
+            row = column.find(steps)
+            if row is not None:
+                rv[idx] = column.rows[row].copy()
+        for idx, values in self._objects.items():
+            rv[idx] = values[steps]
+        return rv
+
+    def append(self, snapshot):
+        """Append values from one refinement step.
+
+        snapshot -- list of item values
+
+        raise ControlValueError when snapshot length does not match.
+        """
+        if self._width is None:
+            self._setLayout([snapshot])
+        if len(snapshot) != self._width:
+            emsg = "Snapshot has %i items, expected %i." % (len(snapshot), self._width)
+            raise ControlValueError(emsg)
+        self._reserve(self._nsteps + 1)
+        for idx in [i for i in self._pending if snapshot[i] is not None]:
+            self._addItem(idx, snapshot[idx])
+        row = self._nsteps
+        keep = self.retention.keeps(row, row)
+        dropped = self.retention.dropped(row)
+        for idx, col in list(self._scalarcols.items()):
+            value = snapshot[idx]
+            if value is None or numpy.ndim(value) == 0:
+                self._scalars[row, col] = numpy.nan if value is None else value
+            else:
+                self._toObjects(idx)
+        for idx, column in list(self._vectors.items()):
+            if dropped is not None:
+                column.drop(dropped)
+            if snapshot[idx] is None:
+                continue
+            value = numpy.asarray(snapshot[idx], dtype=float)
+            if value.shape != column.shape:
+                self._toObjects(idx)
+            elif keep:
+                column.append(row, value)
+        for idx, values in self._objects.items():
+            if dropped is not None and numpy.ndim(values[dropped]) > 0:
+                values[dropped] = None
+            if len(values) == row:
+                value = snapshot[idx]
+                values.append(value if keep or numpy.ndim(value) == 0 else None)
+        self._nsteps += 1
+        self.version = next(_versions)
+        return
+
+    def getSteps(self, index):
+        """Steps with stored values of one snapshot item.
+
+        index -- index of the item in snapshot
+
+        returns 1-D array of step indices
+        raise IndexError for invalid index.
+        """
+        if index in self._scalarcols:
+            return numpy.arange(self._nsteps)
+        elif index in self._vectors:
+            column = self._vectors[index]
+            return column.steps[column.begin : column.end].copy()
+        elif index in self._objects:
+            return numpy.array([i for i, v in enumerate(self._objects[index]) if v is not None], dtype=int)
+        elif index in self._pending:
+            return numpy.empty(0, dtype=int)
+        raise IndexError("Invalid snapshot item index %r." % index)
+
+    def getItem(self, index, step=-1):
+        """Get values of one snapshot item.
+
+        index -- index of the item in snapshot
+        step  -- step info, it can be:
+                 (1) a number ( -1 means latest step ): for single step
+                 (2) a list of numbers: for multiple steps
+                 (3) None: for all steps
+
+        returns float or 1-D array for a single step, 1-D array of scalar
+        item or 2-D array of vector item for multiple steps.  Arrays are
+        read-only views to the store where possible.  Vector items of
+        steps that are not kept are None, for step None the result
+        contains only the kept steps as listed by getSteps().
+        raise IndexError for invalid step.
+        """
+        if index in self._scalarcols:
+            values = self._scalars[: self._nsteps, self._scalarcols[index]]
+        elif index in self._vectors:
+            return self._getVector(self._vectors[index], step)
+        elif index in self._objects or index in self._pending:
+            values = self._objects.get(index, [None] * self._nsteps)
+            if step is None:
+                return [v for v in values if v is not None]
+            elif isinstance(step, list):
+                return [values[i] for i in step]
+            return values[step]
+        else:
+            raise IndexError("Invalid snapshot item index %r." % index)
+        if step is None:
+            rv = values.view()
+        elif isinstance(step, list):
+            rv = values[step]
+        else:
+            rv = values[range(self._nsteps)[step]]
+            if rv.ndim == 0:
+                return float(rv)
+            rv = rv.view()
+        rv.flags.writeable = False
+        return rv
+
+    def tolist(self):
+        """Convert to list of snapshots with plain Python values, as
+        saved in project files.
+
+        returns list of lists
+        """
+        rv = []
+        for snapshot in self:
+            for idx in self._vectors:
+                if snapshot[idx] is not None:
+                    snapshot[idx] = snapshot[idx].tolist()
+            rv.append(snapshot)
+        return rv
+
+    def nbytes(self):
+        """Memory allocated for the stored arrays in bytes.  Values of
+        other objects are not counted.
+        """
+        rv = self._scalars.nbytes
+        for column in self._vectors.values():
+            rv += column.steps.nbytes + column.rows.nbytes
+        return rv
+
+    # support for pickle and copy, store only the used rows
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        n = self._nsteps
+        state["_scalars"] = self._scalars[:n].copy()
+        state["_capacity"] = n
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        return
+
+    # protected methods
+
+    def _setLayout(self, snapshots):
+        """Set item types from the first values that are not None.
+        Items that are None in all snapshots are left pending.
+        """
+        self._width = len(snapshots[0])
+        scalaridx = []
+        for idx in range(self._width):
+            value = None
+            for snapshot in snapshots:
+                if idx < len(snapshot) and snapshot[idx] is not None:
+                    value = snapshot[idx]
+                    break
+            if value is None:
+                self._pending.add(idx)
+            elif numpy.ndim(value) == 0:
+                scalaridx.append(idx)
+            else:
+                self._vectors[idx] = _VectorColumn(numpy.shape(value))
+        self._scalarcols = dict((idx, col) for col, idx in enumerate(scalaridx))
+        self._scalars = numpy.empty((self._capacity, len(scalaridx)))
+        return
+
+    def _reserve(self, n):
+        """Make sure there is space for n steps."""
+        if n <= self._capacity:
+            return
+        capacity = max(n, 2 * self._capacity, 16)
+        rv = numpy.empty((capacity,) + self._scalars.shape[1:])
+        rv[: self._nsteps] = self._scalars[: self._nsteps]
+        self._scalars = rv
+        self._capacity = capacity
+        return
+
+    def _addItem(self, idx, value):
+        """Add storage for pending item idx from its first value that is
+        not None.  Scalar values of the earlier steps are NaN.
+        """
+        self._pending.discard(idx)
+        if numpy.ndim(value) > 0:
+            self._vectors[idx] = _VectorColumn(numpy.shape(value))
+            return
+        column = numpy.full((self._capacity, 1), numpy.nan)
+        self._scalarcols[idx] = self._scalars.shape[1]
+        self._scalars = numpy.hstack((self._scalars, column))
+        return
+
+    def _getVector(self, column, step):
+        """Get rows of vector item for getItem()."""
+        if step is None:
+            rv = column.rows[column.begin : column.end].view()
+        elif isinstance(step, list):
+            rows = [column.find(range(self._nsteps)[i]) for i in step]
+            if None in rows:
+                return [None if r is None else self._readOnly(column.rows[r]) for r in rows]
+            rv = column.rows[rows]
+        else:
+            row = column.find(range(self._nsteps)[step])
+            if row is None:
+                return None
+            rv = column.rows[row].view()
+        return self._readOnly(rv)
+
+    @staticmethod
+    def _readOnly(a):
+        """Read-only view of array a."""
+        rv = a.view()
+        rv.flags.writeable = False
+        return rv
+
+    def _toObjects(self, idx):
+        """Convert item idx to a list of values for data of varying
+        shape."""
+        if idx in self._objects:
+            return
+        values = [self.getItem(idx, i) for i in range(self._nsteps)]
+        if idx in self._vectors:
+            values = [None if v is None else v.copy() for v in values]
+            del self._vectors[idx]
+        else:
+            del self._scalarcols[idx]
+        self._objects[idx] = values
+        return
+
+
+# End of class SnapshotStore
+
+# End of file
@@ -70,11 +70,11 @@ class DataSetConfigurePanel(wx.Panel, PDFPanel):
             self,
             wx.ID_ANY,
             "Data Sampling",
-            choices=["Data", "Nyquist", "Custom"],
-            majorDimension=3,
+            choices=["Data", "Nyquist", "Nyquist fast", "Custom"],
+            majorDimension=4,
             style=wx.RA_SPECIFY_COLS,
         )
-        self.radioBoxSampling.SetMinSize((232, 44))
+        self.radioBoxSampling.SetMinSize((330, 44))
         self.radioBoxSampling.SetSelection(0)
         outerSizer.Add(self.radioBoxSampling, 0, wx.ALL, 5)
 
@@ -223,7 +223,7 @@ class DataSetConfigurePanel(wx.Panel, PDFPanel):
         self.stypeMap = {0: "N", 1: "X"}
         self.metaNames = ["doping", "temperature"]
         self.constrainables = ["dscale", "qdamp", "qbroad"]
-        self.sampList = ["data", "Nyquist", "custom"]
+        self.sampList = ["data", "Nyquist", "Nyquist-fast", "custom"]
         self._focusedText = None
 
         # Note that the rstep and fitrstep attributes are special cases, so they
@@ -31,6 +31,9 @@ class DebugOptions:
                                 save modified project file
         pdb, pythondebugger  -- use python debugger to handle error exceptions
                                 instead of ErrorReportDialog
+        profile              -- profile refinements, plotting and saving,
+                                print summary and write Chrome trace
+                                pdfgui-profile.json at exit
     """
 
     # global list of all options
@@ -38,6 +41,7 @@ class DebugOptions:
         ("noed", "noerrordialog"),
         ("nocf", "noconfirm"),
         ("pdb", "pythondebugger"),
+        ("profile", "profile"),
     )
     # global dictionary for converting long options to short
     short2long = dict(alldebugoptions)
@@ -47,6 +51,7 @@ class DebugOptions:
         self.noerrordialog = False
         self.noconfirm = False
         self.pythondebugger = False
+        self.profile = False
         return
 
     def __setattr__(self, name, value):
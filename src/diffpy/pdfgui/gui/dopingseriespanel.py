@@ -21,6 +21,8 @@ import re
 
 import wx
 
+from diffpy.pdfgui.control.controlerrors import ControlFileError
+from diffpy.pdfgui.control.datasetreader import readDataSets
 from diffpy.pdfgui.control.pdfguimacros import makeDopingSeries
 from diffpy.pdfgui.gui import tooltips
 from diffpy.pdfgui.gui.pdfpanel import PDFPanel
@@ -143,6 +145,7 @@ class DopingSeriesPanel(wx.Panel, PDFPanel):
         self.reverse = False  # Reverse the sort?
         self.fullpath = ""
         self.datasets = []  # Contains (doping, filename) tuples
+        self.loaded = {}  # FitDataSet objects read for the header values
         # doping comes first for easy sorting
 
         self.listCtrlFiles.InsertColumn(0, "Doping")
@@ -232,6 +235,7 @@ class DopingSeriesPanel(wx.Panel, PDFPanel):
 
         # Assign the doping. Default to 0.0
         newdatasets = []
+        unmatched = []
         for path in paths:
             self.fullpath = path
             self.mainFrame.workpath = os.path.dirname(self.fullpath)
@@ -246,34 +250,33 @@ class DopingSeriesPanel(wx.Panel, PDFPanel):
             if res:
                 doping = float(res.groups()[0])
             else:
-                # Look in the file
-                infile = open(path, "r")
-                datastring = infile.read()
-                infile.close()
-                # Look for it first in the file
-                res = re.search(r"^#+ start data\s*(?:#.*\s+)*", datastring, re.M)
-                # start_data is position where the first data line starts
-                if res:
-                    start_data = res.end()
-                else:
-                    res = re.search(r"^[^#]", datastring, re.M)
-                    if res:
-                        start_data = res.start()
-                    else:
-                        start_data = 0
-                header = datastring[:start_data]
-                # parse header to get doping
-                regexp = r"\b(?:x|doping)\ *=\ *(%(f)s)\b" % rx
-                res = re.search(regexp, header)
-                if res:
-                    doping = float(res.groups()[0])
+                # Look in the file header
+                unmatched.append((len(newdatasets), path))
             # Add the new path
             if doping < 0:
                 doping = 0.0
             newdatasets.append([doping, path])
 
+        # read the other files concurrently for the doping in the header,
+        # keep their datasets for the macro and skip unreadable files
+        results = readDataSets([path for idx, path in unmatched])
+        errors = []
+        failed = set()
+        for (idx, path), (dataset, error) in zip(unmatched, results):
+            if error is not None:
+                failed.add(idx)
+                errors.append(error)
+                continue
+            self.loaded[path] = dataset
+            value = dataset.metadata.get("doping")
+            if value is not None and value >= 0:
+                newdatasets[idx][0] = value
+        newdatasets = [dp for idx, dp in enumerate(newdatasets) if idx not in failed]
         self.datasets.extend(newdatasets)
         self.fillList()
+        if errors:
+            message = "Cannot read %i of %i data files:\n%s" % (len(errors), len(paths), "\n".join(errors))
+            raise ControlFileError(message)
         return
 
     def onDelete(self, event):  # wxGlade: DopingSeriesPanel.<event_handler>
@@ -297,7 +300,8 @@ class DopingSeriesPanel(wx.Panel, PDFPanel):
         base = self.textCtrlBaseElement.GetValue()
         dopant = self.textCtrlDopant.GetValue()
         # Value checks will take place in makeDopingSeries
-        org = makeDopingSeries(self.mainFrame.control, self.fit, base, dopant, paths, dvals)
+        datasets = [self.loaded.get(path) for path in paths]
+        org = makeDopingSeries(self.mainFrame.control, self.fit, base, dopant, paths, dvals, datasets=datasets)
         self.treeCtrlMain.ExtendProjectTree(org, clear=False)
         self.mainFrame.needsSave()
         self.onCancel(event)
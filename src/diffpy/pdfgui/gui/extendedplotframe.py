@@ -17,6 +17,7 @@
 import os.path
 
 import matplotlib
+import numpy
 import wx
 from matplotlib.artist import setp
 from matplotlib.backends.backend_wxagg import FigureCanvasWxAgg as FigureCanvas
@@ -58,6 +59,11 @@ class ExtendedPlotFrame(wx.Frame):
     normal matplotlib plot manipulations can be performed with these two
     data members. See the matplotlib API at:
     http://matplotlib.sourceforge.net/classdocs.html
+
+    When fastRedraw is True, replot() draws the axes, labels and legend
+    only when they change.  Updates of curve data that keep the view
+    limits restore the cached background of the axes and redraw just
+    the curves and the legend over it.
     """
 
     # keyboard shortcut(s) for closing plot window
@@ -112,12 +118,21 @@ class ExtendedPlotFrame(wx.Frame):
             self.SetBackgroundColour((200, 200, 200, 255))
         self.canvas.mpl_connect("motion_notify_event", self.UpdateStatusBar)
         self.canvas.mpl_connect("key_press_event", self.mplKeyPress)
+        self.canvas.mpl_connect("draw_event", self.onDraw)
         self.Bind(wx.EVT_PAINT, self.OnPaint)
         self.Bind(wx.EVT_TOOL, self.savePlotData, id=DATA_SAVE_ID)
         self.Bind(wx.EVT_CLOSE, self.onClose)
 
         self.datalims = {}
 
+        # incremental redraw over cached axes background
+        self.fastRedraw = True
+        self._background = None
+        self._capturing = False
+        self._stale = True
+        self._viewlims = None
+        return
+
     # CUSTOM METHODS ########################################################
 
     # EVENT CODE #############################################################
@@ -132,6 +147,13 @@ class ExtendedPlotFrame(wx.Frame):
         self.canvas.draw()
         event.Skip()
 
+    def onDraw(self, event):
+        """Discard cached background after a full draw of the canvas,
+        such as after resize, zoom or pan."""
+        if not self._capturing:
+            self._background = None
+        return
+
     def savePlotData(self, evt):
         """Save the data in the plot in columns."""
         d = wx.FileDialog(
@@ -167,8 +189,19 @@ class ExtendedPlotFrame(wx.Frame):
         return
 
     def replot(self):
-        """Officially call function in matplotlib to do drawing."""
-        self.canvas.draw()
+        """Officially call function in matplotlib to do drawing.
+
+        Only the curves are redrawn when fastRedraw is set and the rest
+        of the plot has not changed since the last draw.
+        """
+        if not (self.fastRedraw and self.canvas.supports_blit):
+            self.canvas.draw()
+        elif self._stale or self._background is None:
+            self.__drawBackground()
+        else:
+            self.__blitCurves()
+        self._stale = False
+        return
 
     def insertCurve(self, xData, yData, style):
         """Insert a new curve to the plot.
@@ -181,10 +214,8 @@ class ExtendedPlotFrame(wx.Frame):
         curveRef = self.subplot.plot(xData, yData, **properties)[0]
         if "legend" in style:
             self.subplot.legend(**legendBoxProperties())
-        try:
-            self.datalims[curveRef] = (min(xData), max(xData), min(yData), max(yData))
-        except ValueError:
-            self.datalims[curveRef] = (0, 0, 0, 0)
+        self.datalims[curveRef] = _dataLimits(xData, yData)
+        self._stale = True
         self.__updateViewLimits()
         return curveRef
 
@@ -195,12 +226,27 @@ class ExtendedPlotFrame(wx.Frame):
         xData, yData -- x, y data to used for the curve
         """
         curveRef.set_data(xData, yData)
-        try:
-            self.datalims[curveRef] = (min(xData), max(xData), min(yData), max(yData))
-        except ValueError:
-            self.datalims[curveRef] = (0, 0, 0, 0)
+        self.datalims[curveRef] = _dataLimits(xData, yData)
         self.__updateViewLimits()
 
+    def appendData(self, curveRef, xData, yData, count):
+        """Update data for a existing curve that was extended with new
+        points.  Data limits are updated only with the new points.
+
+        curveRef -- internal reference to a curve
+        xData, yData -- x, y data to used for the curve
+        count -- number of new points at the end of xData and yData
+        """
+        curveRef.set_data(xData, yData)
+        lims = self.datalims.get(curveRef)
+        if lims is None or not 0 < count < len(xData):
+            self.datalims[curveRef] = _dataLimits(xData, yData)
+        else:
+            x0, x1, y0, y1 = _dataLimits(xData[-count:], yData[-count:])
+            self.datalims[curveRef] = (min(lims[0], x0), max(lims[1], x1), min(lims[2], y0), max(lims[3], y1))
+        self.__updateViewLimits()
+        return
+
     def changeStyle(self, curveRef, style):
         """Change curve style.
 
@@ -212,6 +258,7 @@ class ExtendedPlotFrame(wx.Frame):
         # it can be changed afterwards.
         setp((curveRef,), **properties)
         self.subplot.legend(**legendBoxProperties())
+        self._stale = True
 
     def removeCurve(self, curveRef):
         """Remove curve from plot.
@@ -221,6 +268,7 @@ class ExtendedPlotFrame(wx.Frame):
         del self.datalims[curveRef]
         self.figure.gca().lines.remove(curveRef)
         self.subplot.legend(**legendBoxProperties())
+        self._stale = True
         self.__updateViewLimits()
 
     def __updateViewLimits(self):
@@ -232,13 +280,17 @@ class ExtendedPlotFrame(wx.Frame):
         # Beside, autoscale can not automatically respond to data change.
         if len(self.datalims) == 0:
             return
+        bounds = numpy.array(list(self.datalims.values()))
+        xmin, ymin = bounds[:, 0::2].min(axis=0)
+        xmax, ymax = bounds[:, 1::2].max(axis=0)
+        viewlims = (xmin, xmax, ymin, ymax)
+        # axes need to be redrawn only when the view limits change
+        if viewlims == self._viewlims:
+            return
+        self._viewlims = viewlims
+        self._stale = True
         # ignore previous range
         self.subplot.dataLim.ignore(True)
-        bounds = list(self.datalims.values())
-        xmin = min([b[0] for b in bounds])
-        xmax = max([b[1] for b in bounds])
-        ymin = min([b[2] for b in bounds])
-        ymax = max([b[3] for b in bounds])
 
         # If multiple curve, we need calculate new x limits because legend box
         # take up some space
@@ -251,6 +303,41 @@ class ExtendedPlotFrame(wx.Frame):
             self.subplot.set_xlim(xmin, xmax)
         if ymax > ymin:
             self.subplot.set_ylim(ymin, ymax)
+        return
+
+    def __drawBackground(self):
+        """Draw the whole plot and cache the axes background without
+        curves and legend."""
+        artists = self.__blitArtists()
+        visible = [a.get_visible() for a in artists]
+        for a in artists:
+            a.set_visible(False)
+        self._capturing = True
+        try:
+            self.canvas.draw()
+            self._background = self.canvas.copy_from_bbox(self.subplot.bbox)
+        finally:
+            self._capturing = False
+            for a, v in zip(artists, visible):
+                a.set_visible(v)
+        self.__blitCurves()
+        return
+
+    def __blitCurves(self):
+        """Restore cached axes background and draw curves and legend."""
+        self.canvas.restore_region(self._background)
+        for a in self.__blitArtists():
+            self.subplot.draw_artist(a)
+        self.canvas.blit(self.subplot.bbox)
+        return
+
+    def __blitArtists(self):
+        """List of artists drawn over the cached background."""
+        artists = list(self.subplot.lines)
+        legend = self.subplot.get_legend()
+        if legend is not None:
+            artists.append(legend)
+        return artists
 
     def __translateStyles(self, style):
         """Private function to translate general probabilities to
@@ -326,6 +413,7 @@ class ExtendedPlotFrame(wx.Frame):
         """
         self.SetTitle(wt)
         self.figure.gca().set_title(gt)
+        self._stale = True
 
     def setXLabel(self, x):
         """Set label for x axis.
@@ -333,6 +421,7 @@ class ExtendedPlotFrame(wx.Frame):
         x -- x label
         """
         self.figure.gca().set_xlabel(x)
+        self._stale = True
 
     def setYLabel(self, y):
         """Set label for y axis.
@@ -340,17 +429,33 @@ class ExtendedPlotFrame(wx.Frame):
         y -- y label
         """
         self.figure.gca().set_ylabel(y)
+        self._stale = True
 
     def clear(self):
         """Erase all curves."""
         self.subplot.clear()
         self.curverefs = []
+        self.datalims.clear()
+        self._viewlims = None
+        self._stale = True
         self.replot()
 
 
 # End class ExtendedPlotFrame
 
 
+def _dataLimits(xData, yData):
+    """Return (xmin, xmax, ymin, ymax) tuple of the curve data.
+
+    The limits are all zero when there are no data.
+    """
+    x = numpy.asarray(xData, dtype=float)
+    y = numpy.asarray(yData, dtype=float)
+    if not (x.size and y.size):
+        return (0.0, 0.0, 0.0, 0.0)
+    return (x.min(), x.max(), y.min(), y.max())
+
+
 def legendBoxProperties():
     """Legend properties dictionary with keys consistent with MPL
     version.
@@ -307,22 +307,23 @@ class FitTree(wx.TreeCtrl):
         """Get the control center data associated with a node.
 
         NOTE: The fit-root of a node holds this data. This method makes it
-        convenient to retrieve it.
+        convenient to retrieve it.  Data deferred by lazy project loading
+        are loaded here.
         """
         nodetype = self.GetNodeType(node)
         parent = self.GetFitRoot(node)
         pdata = self.GetTreeItemDict(parent)["cdata"]
         if nodetype == "fit":
-            return pdata
+            return pdata.ensureLoaded()
         elif nodetype == "phase":
             pos = self.GetPositionInSubtree(node)
-            return pdata.getStructure(pos)
+            return pdata.getStructure(pos).ensureLoaded()
         elif nodetype == "dataset":
             pos = self.GetPositionInSubtree(node)
-            return pdata.getDataSet(pos)
+            return pdata.getDataSet(pos).ensureLoaded()
         elif nodetype == "calculation":
             pos = self.GetPositionInSubtree(node)
-            return pdata.getCalculation(pos)
+            return pdata.getCalculation(pos).ensureLoaded()
         else:
             message = "Node of type %s does not exist" % nodetype
             raise FitTreeError(message)
@@ -25,7 +25,8 @@ import wx.aui
 import wx.lib.newevent
 
 from diffpy.pdfgui.control import structureviewer
-from diffpy.pdfgui.control.controlerrors import ControlError, ControlFileError
+from diffpy.pdfgui.control.controlerrors import ControlError, ControlFileError, ControlValueError
+from diffpy.pdfgui.control.eventcoalescer import EventCoalescer
 from diffpy.pdfgui.control.pdfguicontrol import pdfguicontrol
 from diffpy.pdfgui.gui import pdfguiglobals
 from diffpy.pdfgui.gui.aboutdialog import DialogAbout
@@ -200,6 +201,8 @@ class MainFrame(wx.Frame):
         self.__customBindings()
         self.__cmdLineLoad()
         self.updateTitle()
+        if not pdfguiglobals.cmdargs:
+            wx.CallAfter(self.checkRecoveryFiles)
 
         self.auiManager.Update()
         self.switchRightPanel("welcome")
@@ -275,18 +278,23 @@ class MainFrame(wx.Frame):
         # The panel should know its name
         self.name = pdfguiglobals.name
 
-        # The fit tree needs a copy of the control, as
-        # most interactions with the control happen there.
-        self.control = pdfguicontrol(self)
-        self.control.startQueue()
-        self.treeCtrlMain.control = self.control
-
         # Constants needed for communication with the control
         self.ERROR = 1
         self.UPDATE = 1 << 1
         self.OUTPUT = 1 << 2
         self.PLOTNOW = 1 << 3
 
+        # Repeated events from running jobs are merged and delivered
+        # at a limited rate, errors are shown immediately.
+        self.eventCoalescer = EventCoalescer(self._postCustomEvent, 10.0, urgent=self.ERROR)
+
+        # The fit tree needs a copy of the control, as
+        # most interactions with the control happen there.
+        self.control = pdfguicontrol(self)
+        self.control.profiler.enable(pdfguiglobals.dbopts.profile)
+        self.control.startQueue()
+        self.treeCtrlMain.control = self.control
+
         # Needed for the error checker so it doesn't throw errors at quit time
         self.quitting = False
 
@@ -895,11 +903,14 @@ class MainFrame(wx.Frame):
         * Give the fit object to the panel
         """
         selections = self.treeCtrlMain.GetSelections()
+        # refined structures are obtained at every step only for shown phase
+        watched = None
         if len(selections) == 1:
             node = selections[0]
             dataobject = self.treeCtrlMain.GetControlData(node)
 
             if paneltype == "phase":
+                watched = dataobject.owner
                 self.rightPanel.configuration = dataobject.initial
                 self.rightPanel.constraints = dataobject.constraints
                 self.rightPanel.results = dataobject.refined
@@ -919,6 +930,8 @@ class MainFrame(wx.Frame):
             elif paneltype == "dseries":
                 self.rightPanel.fit = dataobject
 
+        for fit in self.control.fits:
+            fit.watchRefined = fit is watched
         return
 
     def setMode(self, mode):
@@ -1016,6 +1029,37 @@ class MainFrame(wx.Frame):
             viewer = structureviewer.getStructureViewer()
             viewer.setConfig(viewerconfig)
 
+        # Load settings for concurrent refinement of queued fittings
+        if self.cP.has_option("FITTING", "workers"):
+            workers = self.cP.getint("FITTING", "workers")
+            processes = None
+            if self.cP.has_option("FITTING", "processes"):
+                processes = self.cP.getboolean("FITTING", "processes")
+            self.control.setWorkers(workers, processes)
+
+        # Load retention of per-step Gcalc and crw in refinement history
+        if self.cP.has_option("FITTING", "retention"):
+            try:
+                self.control.setSnapshotRetention(self.cP.get("FITTING", "retention"))
+            except ControlValueError:
+                pass
+
+        # Maximum rate of gui updates from running jobs, 0 for unlimited
+        if self.cP.has_option("FITTING", "eventrate"):
+            try:
+                self.eventCoalescer.setMaxRate(self.cP.get("FITTING", "eventrate"))
+            except ControlValueError:
+                pass
+
+        # Deferred loading of project data
+        if self.cP.has_option("PROJECT", "lazyload"):
+            self.control.lazyLoad = self.cP.getboolean("PROJECT", "lazyload")
+
+        # Autosave interval in minutes, 0 disables autosave
+        if self.cP.has_option("PROJECT", "autosave"):
+            minutes = self.cP.getfloat("PROJECT", "autosave")
+            self.control.autosave.setInterval(60 * minutes)
+
         return
 
     def updateConfiguration(self):
@@ -1054,6 +1098,20 @@ class MainFrame(wx.Frame):
         for key, value in viewerconfig.items():
             self.cP.set("STRUCTUREVIEWER", key, value)
 
+        # Concurrent refinement of queued fittings
+        if not self.cP.has_section("FITTING"):
+            self.cP.add_section("FITTING")
+        self.cP.set("FITTING", "workers", str(self.control.maxWorkers))
+        self.cP.set("FITTING", "processes", str(self.control.useProcesses))
+        self.cP.set("FITTING", "retention", str(self.control.snapshotRetention))
+        self.cP.set("FITTING", "eventrate", str(self.eventCoalescer.maxrate))
+
+        # Deferred loading of project data
+        if not self.cP.has_section("PROJECT"):
+            self.cP.add_section("PROJECT")
+        self.cP.set("PROJECT", "lazyload", str(self.control.lazyLoad))
+        self.cP.set("PROJECT", "autosave", str(self.control.autosave.interval / 60.0))
+
         return
 
     def writeConfiguration(self):
@@ -1093,6 +1151,40 @@ class MainFrame(wx.Frame):
             d.Destroy()
         return code
 
+    def checkRecoveryFiles(self):
+        """Offer to open project recovered from autosave files, which
+        remain when PDFgui did not exit properly."""
+        from diffpy.pdfgui.control.autosave import AutoSave
+
+        if pdfguiglobals.dbopts.noconfirm:
+            return
+        directory = self.control.autosave.directory
+        recovered = AutoSave.findRecoveryFiles(directory)
+        if not recovered:
+            return
+        msg = (
+            "PDFgui did not exit properly.  Open the project recovered "
+            "from %s?\nOtherwise the recovery files will be deleted." % recovered[0]
+        )
+        d = wx.MessageDialog(self, msg, "Recover project?", wx.YES_NO | wx.ICON_QUESTION)
+        code = d.ShowModal()
+        d.Destroy()
+        if code == wx.ID_YES:
+            # load all data, the recovery file is deleted below
+            treelist = self.control.load(recovered[0], lazy=False)
+            self.treeCtrlMain.ExtendProjectTree(treelist)
+            self.setMode("fitting")
+            self.switchRightPanel("welcome")
+            self.journalPanel.refresh()
+            self.plotPanel.refresh()
+            # recovered project must be saved under a new name
+            self.fullpath = ""
+            self.needsSave()
+            self.updateTitle()
+        for filename in recovered:
+            os.remove(filename)
+        return
+
     def updateTitle(self):
         """Update the title according to the name of the current
         file."""
@@ -1496,6 +1588,8 @@ class MainFrame(wx.Frame):
         """
         if not self.quitting:
             pdfguiglobals.isAltered = altered
+            if altered:
+                self.control.autosave.altered = True
             self.updateToolbar()
         return
 
@@ -2289,6 +2383,10 @@ class MainFrame(wx.Frame):
             self.updateConfiguration()
             self.writeConfiguration()
             self.control.exit()
+            self.eventCoalescer.close()
+            if pdfguiglobals.dbopts.profile:
+                print(self.control.profiler.formatSummary())
+                self.control.exportProfile("pdfgui-profile.json", "chrome")
             self.auiManager.UnInit()
             self.Destroy()
         return
@@ -2563,8 +2661,14 @@ class MainFrame(wx.Frame):
 
         Whenever the control needs to communicate directly with the gui
         it can call this method. The event is processed by onCustom and
-        then handled by the gui on its own terms.
+        then handled by the gui on its own terms.  Repeated events are
+        merged by eventCoalescer, which limits the rate of gui updates.
         """
+        self.eventCoalescer.postEvent(type, info)
+        return
+
+    def _postCustomEvent(self, type, info):
+        """Post event for onCustom, called by eventCoalescer."""
         event = PDFCustomEvent()
         event.type = type
         event.info = info
@@ -2573,19 +2677,23 @@ class MainFrame(wx.Frame):
 
     def onCustom(self, event):
         """This handles the custom events sent by the control."""
+        profiler = self.control.profiler
         if event.type == self.ERROR:
             self.showMessage(event.info)
         elif event.type == self.UPDATE:
             # job is a fitting or a calculation
             job = event.info
-            self.updateFittingStatus(job)
+            with profiler.phase("gui update", job.name):
+                self.updateFittingStatus(job)
         elif event.type == self.OUTPUT:
-            self.updateOutput()
+            with profiler.phase("gui output"):
+                self.updateOutput()
         elif event.type == self.PLOTNOW:
             # job is a fitting or a calculation with a new data to plot.
             job = event.info
-            for plot in self.control.plots:
-                plot.notify(job)
+            with profiler.phase("plot", job.name):
+                for plot in self.control.plots:
+                    plot.notify(job)
         return
 
     def updateFittingStatus(self, job):
@@ -2629,7 +2737,11 @@ class MainFrame(wx.Frame):
                 if len(selections) == 1:
                     # Enable whatever panel is currently being viewed.
                     self.rightPanel.Enable()
-                    if node == selections[0]:
+                    if self.rightPanel.key == "phase":
+                        # refined structure was obtained at the end
+                        self.setPanelSpecificData("phase")
+                        self.rightPanel.refresh()
+                    elif node == selections[0]:
                         self.rightPanel.refresh()
                 self.runningDict.pop(name, None)
                 self.needsSave()
@@ -21,6 +21,8 @@ import re
 
 import wx
 
+from diffpy.pdfgui.control.controlerrors import ControlFileError
+from diffpy.pdfgui.control.datasetreader import readDataSets
 from diffpy.pdfgui.control.pdfguimacros import makeTemperatureSeries
 from diffpy.pdfgui.gui import tooltips
 from diffpy.pdfgui.gui.pdfpanel import PDFPanel
@@ -127,6 +129,7 @@ class TemperatureSeriesPanel(wx.Panel, PDFPanel):
         self.reverse = False  # Reverse the sort?
         self.fullpath = "."
         self.datasets = []  # Contains (temperature, filename) tuples
+        self.loaded = {}  # FitDataSet objects read for the header values
         # temperature is a float and comes first for easy sorting
 
         self.listCtrlFiles.InsertColumn(0, "Temperature")
@@ -159,7 +162,8 @@ class TemperatureSeriesPanel(wx.Panel, PDFPanel):
         """Let's go!"""
         paths = [tp[1] for tp in self.datasets]
         temperatures = [tp[0] for tp in self.datasets]
-        org = makeTemperatureSeries(self.mainFrame.control, self.fit, paths, temperatures)
+        datasets = [self.loaded.get(path) for path in paths]
+        org = makeTemperatureSeries(self.mainFrame.control, self.fit, paths, temperatures, datasets=datasets)
         self.treeCtrlMain.ExtendProjectTree(org, clear=False)
         self.mainFrame.needsSave()
         self.onCancel(event)
@@ -216,6 +220,7 @@ class TemperatureSeriesPanel(wx.Panel, PDFPanel):
 
         # Assign the temperatures. Default to 300.0
         newdatasets = []
+        unmatched = []
         for path in paths:
             self.fullpath = path
             self.mainFrame.workpath = os.path.dirname(path)
@@ -241,27 +246,8 @@ class TemperatureSeriesPanel(wx.Panel, PDFPanel):
                 else:
                     temperature = float(res.groups()[1])
             else:
-                # Look in the file
-                infile = open(path, "r")
-                datastring = infile.read()
-                infile.close()
-                # Look for it first in the file
-                res = re.search(r"^#+ start data\s*(?:#.*\s+)*", datastring, re.M)
-                # start_data is position where the first data line starts
-                if res:
-                    start_data = res.end()
-                else:
-                    res = re.search(r"^[^#]", datastring, re.M)
-                    if res:
-                        start_data = res.start()
-                    else:
-                        start_data = 0
-                header = datastring[:start_data]
-                # parse header to get temperature
-                regexp = r"\b(?:temp|temperature|T)\ *=\ *(%(f)s)\b" % rx
-                res = re.search(regexp, header)
-                if res:
-                    temperature = float(res.groups()[0])
+                # Look in the file header
+                unmatched.append((len(newdatasets), path))
             # Add the new path
             if temperature <= 0:
                 temperature = 300.0
@@ -269,8 +255,26 @@ class TemperatureSeriesPanel(wx.Panel, PDFPanel):
 
         # DONT Sort the new paths according to temperature
         # newdatasets.sort()
+        # read the other files concurrently for the temperature in the header,
+        # keep their datasets for the macro and skip unreadable files
+        results = readDataSets([path for idx, path in unmatched])
+        errors = []
+        failed = set()
+        for (idx, path), (dataset, error) in zip(unmatched, results):
+            if error is not None:
+                failed.add(idx)
+                errors.append(error)
+                continue
+            self.loaded[path] = dataset
+            value = dataset.metadata.get("temperature")
+            if value is not None and value > 0:
+                newdatasets[idx][0] = value
+        newdatasets = [dp for idx, dp in enumerate(newdatasets) if idx not in failed]
         self.datasets.extend(newdatasets)
         self.fillList()
+        if errors:
+            message = "Cannot read %i of %i data files:\n%s" % (len(errors), len(paths), "\n".join(errors))
+            raise ControlFileError(message)
         return
 
     def onDelete(self, event):  # wxGlade: TemperatureSeriesPanel.<event_handler>
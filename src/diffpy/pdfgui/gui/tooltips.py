@@ -33,7 +33,7 @@ def _expand_tooltip_aliases(ttps):
 datasetconfigurepanel = {
     #    'panelNameLabel'      : '', # StaticText "Data Set Configuration"
     "radioBoxStype": "Radiation type",  # RadioBox "Scatterer Type", choices=["Neutron", "X-ray"]
-    "radioBoxSampling": "Fit sampling type",  # RadioBox "Scatterer Type", choices=["Default", "Nyquist", "Custom"]
+    "radioBoxSampling": "Fit sampling type",  # RadioBox "Scatterer Type", choices=["Default", "Nyquist", "Nyquist fast", "Custom"]
     #    'labelDataRange'      : '', # StaticText "Data Range"
     "textCtrlDataFrom": "Data r_min",  # TextCtrl
     #    'labelDataTo'         : '', # StaticText "to"
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.control.autosave.py."""
+
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from testutils import datafile
+
+from diffpy.pdfgui.control.autosave import AutoSave
+from diffpy.pdfgui.control.parameter import Parameter
+from diffpy.pdfgui.control.pdfguicontrol import PDFGuiControl
+
+# ----------------------------------------------------------------------------
+
+
+class TestAutoSave(unittest.TestCase):
+    """Test methods of AutoSave."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.control = PDFGuiControl()
+        self.autosave = self.control.autosave
+        self.autosave.directory = self.tmpdir
+        return
+
+    def tearDown(self):
+        self.autosave.stop()
+        del self.control
+        shutil.rmtree(self.tmpdir)
+        return
+
+    def test___init__(self):
+        "check AutoSave.__init__"
+        self.assertEqual(0, self.autosave.interval)
+        self.assertFalse(self.autosave.isRunning())
+        self.assertIsNone(self.autosave.lastSave)
+        return
+
+    def test_saveNow(self):
+        "check AutoSave.saveNow"
+        for lazy in (False, True):
+            self.control.reset()
+            self.control.load(datafile("lcmo_full.ddp"), lazy=lazy)
+            # loaded project is not saved
+            self.assertIsNone(self.autosave.saveNow())
+            self.autosave.altered = True
+            fname = self.autosave.saveNow()
+            self.assertEqual(os.path.join(self.tmpdir, "lcmo_full.autosave.ddp"), fname)
+            self.assertTrue(os.path.isfile(fname))
+            # lazily loaded fits stay unloaded
+            self.assertEqual(lazy, not any(f.isLoaded() for f in self.control.fits))
+            # nothing changed
+            self.assertIsNone(self.autosave.saveNow())
+            self.autosave.altered = True
+            self.assertEqual(fname, self.autosave.saveNow())
+            recovered = PDFGuiControl()
+            recovered.load(fname)
+            names = [f.name for f in self.control.fits]
+            self.assertEqual(names, [f.name for f in recovered.fits])
+            self.assertEqual([fname], AutoSave.findRecoveryFiles(self.tmpdir))
+        return
+
+    def test_saveNow_running(self):
+        "check AutoSave.saveNow while a fit appends steps"
+        fit = self.control.newFitting("fit")
+        fit.parameters[1] = Parameter(1, 0.0)
+        fit.itemIndex = 2
+        fit.dataNameDict = {fit._getStrId(): {"rw": 0, 1: 1}}
+
+        def refine():
+            for step in range(1, 301):
+                results = {
+                    "datasets": [],
+                    "strucs": [],
+                    "parameters": {1: float(step)},
+                    "rw": 1.0 / step,
+                    "step": step,
+                    "snapshot": [1.0 / step, float(step)],
+                    "output": "",
+                    "finished": False,
+                }
+                fit._applyStepResults(results)
+            return
+
+        thread = threading.Thread(target=refine)
+        thread.start()
+        fnames = []
+        while thread.is_alive() or not fnames:
+            self.autosave.altered = True
+            fnames.append(self.autosave.saveNow())
+        thread.join()
+        recovered = PDFGuiControl()
+        recovered.load(fnames[-1])
+        rfit = recovered.fits[0]
+        self.assertEqual(rfit.snapshots.getItem(1), rfit.parameters[1].refined)
+        return
+
+    def test_discard(self):
+        "check AutoSave.discard"
+        self.control.load(datafile("lcmo_full.ddp"))
+        self.control.fits[0].step += 1
+        fname = self.autosave.saveNow()
+        self.assertTrue(os.path.isfile(fname))
+        tmpfile = os.path.join(self.tmpdir, "saved.ddp")
+        self.control.save(tmpfile)
+        self.assertFalse(os.path.isfile(fname))
+        self.assertEqual([], AutoSave.findRecoveryFiles(self.tmpdir))
+        self.assertIsNone(self.autosave.saveNow())
+        return
+
+    def test_setInterval(self):
+        "check AutoSave.setInterval"
+        self.control.load(datafile("lcmo_full.ddp"))
+        self.autosave.altered = True
+        self.autosave.setInterval(0.05)
+        self.assertTrue(self.autosave.isRunning())
+        t0 = time.time()
+        while self.autosave.lastSave is None and time.time() - t0 < 10:
+            time.sleep(0.05)
+        self.assertTrue(os.path.isfile(self.autosave.recoveryFile()))
+        self.autosave.setInterval(0)
+        self.assertFalse(self.autosave.isRunning())
+        return
+
+
+# End of class TestAutoSave
+
+# ----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
@@ -15,10 +15,76 @@
 """Unit tests for calculation.py."""
 
 
+import concurrent.futures
 import unittest
 
+import numpy
+from testutils import datafile
+
 from diffpy.pdfgui.control.calculation import Calculation
-from diffpy.pdfgui.control.controlerrors import ControlValueError
+from diffpy.pdfgui.control.constraint import Constraint
+from diffpy.pdfgui.control.controlerrors import ControlKeyError, ControlValueError
+from diffpy.pdfgui.control.fitstructure import FitStructure
+from diffpy.pdfgui.control.fitting import Fitting
+from diffpy.pdfgui.control.parameter import Parameter
+from diffpy.pdfgui.control.serverpool import ServerPool
+
+
+class _GridServer:
+    "Stand-in for PdfFit server that calculates G = @1 * r + qdamp."
+
+    configured = 0
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pars = {}
+        self.vars = {}
+
+    def read_struct_string(self, s):
+        _GridServer.configured += 1
+
+    def constrain(self, var, formula):
+        return
+
+    def alloc(self, stype, qmax, qdamp, rmin, rmax, rlen):
+        self.r = numpy.linspace(rmin, rmax, rlen)
+        self.vars["qdamp"] = qdamp
+
+    def setvar(self, var, value):
+        self.vars[var] = value
+
+    def setphase(self, iphase):
+        return
+
+    def selectAtomIndex(self, *args):
+        return
+
+    def setpar(self, index, value):
+        self.pars[index] = value
+
+    def fixpar(self, index):
+        return
+
+    def calc(self):
+        self.G = self.pars[1] * self.r + self.vars["qdamp"]
+
+    def getpdf_fit(self):
+        return list(self.G)
+
+
+class _InlineExecutor:
+    "Stand-in for the calculation pool of PDFGuiControl, runs calls at once."
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args))
+        return future
 
 
 ##############################################################################
@@ -71,6 +137,42 @@ class TestCalculation(unittest.TestCase):
         self.assertEqual(0.7, self.calc.rstep)
         return
 
+    def test_calculateGrid(self):
+        """Check Calculation.calculateGrid()"""
+        fit = Fitting("fit")
+        stru = FitStructure("Ni")
+        stru.read(datafile("Ni.stru"), format="pdffit")
+        stru.constraints["lat(1)"] = Constraint("@1")
+        fit.add(stru)
+        fit.parameters[1] = Parameter(1, 3.52)
+        fit.add(self.calc)
+        self.calc.setRGrid(1, 0.5, 3)
+        pool = fit.controlCenter.serverPool
+        fit.controlCenter.serverPool = ServerPool(factory=_GridServer)
+        try:
+            _GridServer.configured = 0
+            g = self.calc.calculateGrid({1: [1, 2, 3], "qdamp": [0, 0.5]})
+            self.assertEqual(1, _GridServer.configured)
+            self.assertRaises(ControlKeyError, self.calc.calculateGrid, {2: [1]})
+            self.assertRaises(ControlValueError, self.calc.calculateGrid, {1: ["x"]})
+            self.assertRaises(ControlValueError, self.calc.calculateGrid, {1: [1]}, workers=0)
+            # parallel grid uses the calculation pool of the control center
+            executor = _InlineExecutor()
+            fit.controlCenter.getCalcExecutor = lambda: executor
+            g2 = self.calc.calculateGrid({1: [1, 2, 3], "qdamp": [0, 0.5]}, workers=2)
+            self.assertEqual(6, executor.submitted)
+            self.assertTrue(numpy.array_equal(g, g2))
+        finally:
+            fit.controlCenter.serverPool = pool
+            fit.controlCenter.__dict__.pop("getCalcExecutor", None)
+        self.assertEqual((6, 5), g.shape)
+        r = numpy.array([1, 1.5, 2, 2.5, 3])
+        self.assertTrue(numpy.allclose(r, g[0]))
+        self.assertTrue(numpy.allclose(r + 0.5, g[1]))
+        self.assertTrue(numpy.allclose(3 * r + 0.5, g[5]))
+        self.assertEqual([], self.calc.Gcalc)
+        return
+
 
 #   def test_start(self):
 #       """check Calculation.start()
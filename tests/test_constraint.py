@@ -15,9 +15,10 @@
 """Unit tests for constraint.py."""
 
 
+import pickle
 import unittest
 
-from diffpy.pdfgui.control.constraint import Constraint
+from diffpy.pdfgui.control.constraint import Constraint, evalConstraints
 from diffpy.pdfgui.control.controlerrors import ControlSyntaxError
 
 
@@ -68,6 +69,32 @@ class TestConstraint(unittest.TestCase):
         self.assertAlmostEqual(sqrt(0.75), value, 8)
         return
 
+    def test_lambdaFormula(self):
+        """Check Constraint.lambdaFormula()"""
+        f = self.c.lambdaFormula()
+        self.assertIs(f, self.c.lambdaFormula())
+        self.c.formula = "2*@1"
+        self.assertIsNot(f, self.c.lambdaFormula())
+        self.assertEqual(6.0, self.c.lambdaFormula()({1: 3.0}))
+        # compiled function is not pickled
+        c1 = pickle.loads(pickle.dumps(self.c))
+        self.assertNotIn("_Constraint__fncp", c1.__dict__)
+        self.assertEqual("2*@1", c1.formula)
+        self.assertEqual(6.0, c1.evalFormula({1: 3.0}))
+        return
+
+    def test_evalConstraints(self):
+        """Check evalConstraints()"""
+        constraints = {"x(1)": Constraint("@1"), "y(1)": Constraint("@1 + sqrt(@2)")}
+        values = evalConstraints(constraints, {1: 0.5, 2: 4.0})
+        self.assertEqual({"x(1)": 0.5, "y(1)": 2.5}, values)
+        self.assertEqual(["x(1)", "y(1)"], list(values))
+        constraints["y(1)"].formula = "-@2"
+        self.assertEqual(-4.0, evalConstraints(constraints, {1: 0.5, 2: 4.0})["y(1)"])
+        self.assertEqual({}, evalConstraints({}, {}))
+        self.assertRaises(KeyError, evalConstraints, constraints, {1: 0.5})
+        return
+
 
 # End of class TestConstraint
 
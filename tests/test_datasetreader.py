@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.control.datasetreader.py."""
+
+
+import unittest
+
+from testutils import datafile
+
+from diffpy.pdfgui.control.datasetreader import readDataSets
+from diffpy.pdfgui.control.fitdataset import FitDataSet
+
+# ----------------------------------------------------------------------------
+
+
+class TestReadDataSets(unittest.TestCase):
+    """Test function readDataSets."""
+
+    def test_readDataSets(self):
+        "check readDataSets"
+        names = ["lcmo_00.gr", "lcmo_20.gr", "550K.gr", "lcmo_00.gr"]
+        paths = [datafile(n) for n in names]
+        results = readDataSets(paths, workers=3)
+        self.assertEqual(4, len(results))
+        self.assertEqual(names, [ds.name for ds, error in results])
+        self.assertEqual([None] * 4, [error for ds, error in results])
+        for path, (ds, error) in zip(paths, results):
+            expected = FitDataSet("expected").readObs(path)
+            self.assertEqual(expected.Gobs, ds.Gobs)
+            self.assertEqual(expected.metadata, ds.metadata)
+        # the same file gives independent datasets
+        self.assertIsNot(results[0][0], results[3][0])
+        self.assertEqual([], readDataSets([]))
+        return
+
+    def test_readDataSets_errors(self):
+        "check readDataSets with invalid files"
+        paths = [datafile("lcmo_00.gr"), datafile("nofile.gr"), datafile("CdSe_bulk_wur.stru")]
+        results = readDataSets(paths)
+        self.assertEqual("lcmo_00.gr", results[0][0].name)
+        self.assertIsNone(results[0][1])
+        for ds, error in results[1:]:
+            self.assertIsNone(ds)
+            self.assertTrue(error)
+        self.assertIn("nofile.gr", results[1][1])
+        self.assertIn("CdSe_bulk_wur.stru", results[2][1])
+        return
+
+
+# End of class TestReadDataSets
+
+# ----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
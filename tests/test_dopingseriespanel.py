@@ -19,6 +19,7 @@ import unittest
 import wx
 from testutils import GUITestCase, datafile, overridefiledialog
 
+from diffpy.pdfgui.control.controlerrors import ControlFileError
 from diffpy.pdfgui.gui.dopingseriespanel import DopingSeriesPanel
 
 # ----------------------------------------------------------------------------
@@ -47,6 +48,18 @@ class TestDopingSeriesPanel(GUITestCase):
             panel.onAdd(None)
         self.assertEqual(paths[-1], panel.fullpath)
         self.assertEqual([0, 20, 0, 0.2], [xf[0] for xf in panel.datasets])
+        self.assertEqual(sorted(paths[2:]), sorted(panel.loaded))
+        return
+
+    def test_onAdd_errors(self):
+        "Check DopingSeriesPanel.onAdd with unreadable files"
+        panel = self.panel
+        paths = [datafile(p) for p in ["x020.gr", "lcmo_20.gr", "nofile.gr"]]
+        with overridefiledialog(wx.ID_OK, paths):
+            self.assertRaises(ControlFileError, panel.onAdd, None)
+        self.assertEqual(paths[:2], [xf[1] for xf in panel.datasets])
+        self.assertEqual([20, 0.2], [xf[0] for xf in panel.datasets])
+        self.assertEqual(paths[1:2], list(panel.loaded))
         return
 
 
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.control.eventcoalescer.py."""
+
+
+import threading
+import unittest
+
+from diffpy.pdfgui.control.controlerrors import ControlValueError
+from diffpy.pdfgui.control.eventcoalescer import EventCoalescer
+
+ERROR, UPDATE, OUTPUT, PLOTNOW = 1, 2, 4, 8
+
+# ----------------------------------------------------------------------------
+
+
+class TestEventCoalescer(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.ec = EventCoalescer(self._deliver, 0.01, urgent=ERROR)
+        self.fit1 = object()
+        self.fit2 = object()
+        return
+
+    def tearDown(self):
+        self.ec.close()
+        return
+
+    def _deliver(self, type, info):
+        self.events.append((type, info))
+        return
+
+    def test_postEvent(self):
+        """check merging of repeated events."""
+        ec = self.ec
+        fit1, fit2 = self.fit1, self.fit2
+        ec.postEvent(OUTPUT, fit1)
+        self.assertEqual([(OUTPUT, fit1)], self.events)
+        for i in range(5):
+            ec.postEvent(OUTPUT, fit1)
+            ec.postEvent(PLOTNOW, fit1)
+            ec.postEvent(PLOTNOW, fit2)
+        self.assertEqual(1, len(self.events))
+        self.assertEqual(3, ec.pending())
+        self.assertEqual(12, ec.merged)
+        ec.flush()
+        expected = [(OUTPUT, fit1), (OUTPUT, fit1), (PLOTNOW, fit1), (PLOTNOW, fit2)]
+        self.assertEqual(expected, self.events)
+        self.assertEqual(4, ec.delivered)
+        self.assertEqual(0, ec.pending())
+        return
+
+    def test_urgent(self):
+        """check immediate delivery of urgent events."""
+        ec = self.ec
+        ec.postEvent(UPDATE, self.fit1)
+        ec.postEvent(UPDATE, self.fit1)
+        ec.postEvent(ERROR, "error message")
+        expected = [(UPDATE, self.fit1), (UPDATE, self.fit1), (ERROR, "error message")]
+        self.assertEqual(expected, self.events)
+        return
+
+    def test_timer(self):
+        """check delivery of pending events by the timer."""
+        done = threading.Event()
+        ec = EventCoalescer(lambda t, i: (self._deliver(t, i), done.set()), 50)
+        ec.postEvent(UPDATE, self.fit1)
+        done.clear()
+        ec.postEvent(UPDATE, self.fit1)
+        ec.postEvent(UPDATE, self.fit1)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(2, len(self.events))
+        self.assertEqual(0, ec.pending())
+        return
+
+    def test_setMaxRate(self):
+        """check EventCoalescer.setMaxRate()"""
+        ec = self.ec
+        ec.postEvent(UPDATE, self.fit1)
+        ec.postEvent(OUTPUT, self.fit1)
+        self.assertEqual(1, ec.pending())
+        ec.setMaxRate(0)
+        self.assertEqual(0, ec.maxrate)
+        self.assertEqual(2, len(self.events))
+        ec.postEvent(OUTPUT, self.fit1)
+        ec.postEvent(OUTPUT, self.fit1)
+        self.assertEqual(4, len(self.events))
+        ec.maxrate = "20"
+        self.assertAlmostEqual(20, ec.maxrate)
+        self.assertRaises(ControlValueError, ec.setMaxRate, -1)
+        self.assertRaises(ControlValueError, ec.setMaxRate, "fast")
+        return
+
+
+# End of class TestEventCoalescer
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
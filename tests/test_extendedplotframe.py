@@ -52,6 +52,45 @@ class TestExtendedPlotFrame(GUITestCase):
         self.assertEqual(2.3, line.get_linewidth())
         return
 
+    def test_replot(self):
+        "Check incremental redraw in ExtendedPlotFrame.replot"
+        frame = self.frame
+        x = numpy.linspace(-5, 5)
+        style = {"with": "lines", "color": "blue", "line": "solid", "width": 2}
+        line = frame.insertCurve(x, numpy.sin(x), style)
+        self.assertEqual((-5, 5, -1, 1), tuple(numpy.round(frame.datalims[line], 3)))
+        frame.replot()
+        self.assertFalse(frame._stale)
+        background = frame._background
+        self.assertIsNotNone(background)
+        # same view limits, only the curve is redrawn
+        frame.updateData(line, x, numpy.sin(x)[::-1])
+        self.assertFalse(frame._stale)
+        frame.replot()
+        self.assertIs(background, frame._background)
+        # changed view limits require full redraw
+        frame.updateData(line, x, 2 * numpy.sin(x))
+        self.assertTrue(frame._stale)
+        self.assertEqual((-5, 5), frame.subplot.get_xlim())
+        frame.replot()
+        self.assertIsNot(background, frame._background)
+        # empty data have zero limits
+        self.assertEqual((0, 0, 0, 0), epf._dataLimits([], []))
+        return
+
+    def test_appendData(self):
+        "Check ExtendedPlotFrame.appendData"
+        frame = self.frame
+        style = {"with": "lines", "color": "blue", "line": "solid", "width": 2}
+        line = frame.insertCurve([0, 1], [0.5, 0.4], style)
+        x = numpy.arange(4.0)
+        y = numpy.array([0.5, 0.4, 0.7, 0.1])
+        frame.appendData(line, x, y, 2)
+        self.assertEqual((0, 3, 0.1, 0.7), frame.datalims[line])
+        self.assertEqual((0, 3), frame.subplot.get_xlim())
+        self.assertTrue(numpy.array_equal(y, line.get_ydata()))
+        return
+
     def test_savePlotData(self):
         self.frame.plotter = Plotter()
         # intercept plotter.export to avoid plot setup and temporary files
@@ -15,6 +15,9 @@
 """Unit tests for fitdataset.py."""
 
 
+import os
+import shutil
+import tempfile
 import unittest
 
 import numpy
@@ -22,6 +25,7 @@ from testutils import datafile
 
 import diffpy.pdfgui.control.fitdataset as fds
 from diffpy.pdfgui.control.fitdataset import FitDataSet
+from diffpy.pdfgui.control.pdfdataset import DataArray
 
 # ----------------------------------------------------------------------------
 
@@ -67,6 +71,32 @@ class TestRoutines(unittest.TestCase):
         self.assertEqual(0, y4[2])
         return
 
+    def test_sinc_interpolation(self):
+        """Check Nyquist resampling in grid_interpolation()"""
+        from diffpy.utils.resampler import wsinterp
+
+        ds = FitDataSet("Ni")
+        ds.read(datafile("Ni_2-8.chi.gr"))
+        x0 = numpy.asarray(ds.robs)
+        y0 = numpy.asarray(ds.Gobs)
+        x1 = numpy.arange(x0[0] - 0.3, x0[-1] + 0.3, numpy.pi / ds.qmax)
+        y1 = wsinterp(x1, x0, y0)
+        # full sum is the same as in wsinterp
+        y1a = fds.grid_interpolation(x0, y0, x1, tp="Nyquist")
+        self.assertTrue(numpy.allclose(y1, y1a, rtol=0, atol=1e-10))
+        # windowed sum agrees within stated tolerance
+        y1b = fds.grid_interpolation(x0, y0, x1, tp="Nyquist-fast")
+        self.assertTrue(numpy.max(numpy.abs(y1b - y1)) < 1e-3 * numpy.max(numpy.abs(y0)))
+        # outside values
+        self.assertEqual(y0[0], y1b[0])
+        self.assertEqual(y0[-1], y1b[-1])
+        y1c = fds.grid_interpolation(x0, y0, x1, left=7, right=8, tp="Nyquist-fast")
+        self.assertEqual((7, 8), (y1c[0], y1c[-1]))
+        # data points are reproduced exactly
+        y1d = fds.grid_interpolation(x0, y0, x0[::7], tp="Nyquist-fast")
+        self.assertTrue(numpy.allclose(y0[::7], y1d))
+        return
+
 
 # End of class TestRoutines
 
@@ -208,6 +238,110 @@ class TestFitDataSet(unittest.TestCase):
         self.assertEqual(npts1, len(rds1.dGobs))
         return
 
+    def test_calculated_arrays(self):
+        """Check DataArray storage of calculated data."""
+        fds = FitDataSet("Ni")
+        fds.read(datafile("Ni_2-8.chi.gr"))
+        self.assertEqual([], fds.Gcalc)
+        self.assertEqual([], fds.Gdiff)
+        npts = len(fds.rcalc)
+        fds.Gcalc = npts * [0.5]
+        fds.crw = npts * [0.0]
+        for name in ("rcalc", "Gcalc", "Gtrunc", "dGtrunc", "Gdiff", "crw"):
+            a = getattr(fds, name)
+            self.assertTrue(isinstance(a, DataArray), name)
+            self.assertEqual(npts, len(a), name)
+        self.assertTrue(numpy.array_equal(fds.Gtrunc - 0.5, fds.Gdiff))
+        # arrays are kept as assigned
+        Gcalc = numpy.linspace(0, 1, npts)
+        fds.Gcalc = Gcalc
+        self.assertTrue(numpy.shares_memory(Gcalc, fds.Gcalc))
+        # resampling keeps arrays
+        fds.fitrmax = fds.rmax / 2.0
+        self.assertTrue(isinstance(fds.Gcalc, DataArray))
+        self.assertEqual(len(fds.rcalc), len(fds.Gcalc))
+        fds.refined.update(fds.initial)
+        self.assertTrue(fds.writeCalcStr())
+        return
+
+    def test_cache(self):
+        """Check invalidation of cached Gtrunc, dGtrunc and Gdiff."""
+        fds = FitDataSet("Ni")
+        fds.read(datafile("Ni_2-8.chi.gr"))
+        fds.Gcalc = numpy.zeros(len(fds.rcalc))
+        Gtrunc = fds.Gtrunc
+        Gdiff = fds.Gdiff
+        fds.resetCacheStats()
+        self.assertIs(Gtrunc, fds.Gtrunc)
+        self.assertIs(Gdiff, fds.Gdiff)
+        self.assertFalse(Gdiff.flags.writeable)
+        self.assertEqual((2, 0), fds.getCacheStats()["Gtrunc"])
+        self.assertEqual((1, 0), fds.getCacheStats()["Gdiff"])
+        # unchanged fit range keeps the cache
+        fds.fitrmin = fds.fitrmin
+        self.assertIs(Gtrunc, fds.Gtrunc)
+        # new Gcalc invalidates only Gdiff
+        fds.Gcalc = numpy.ones(len(fds.rcalc))
+        self.assertIs(Gtrunc, fds.Gtrunc)
+        self.assertTrue(numpy.array_equal(Gtrunc - 1, fds.Gdiff))
+        self.assertEqual(1, fds.getCacheStats()["Gdiff"][1])
+        # changed fit range or observed data invalidate all
+        fds.fitrmax = fds.rmax / 2.0
+        self.assertIsNot(Gtrunc, fds.Gtrunc)
+        self.assertEqual(len(fds.rcalc), len(fds.Gdiff))
+        Gtrunc = fds.Gtrunc
+        fds.Gobs = 2 * fds.Gobs
+        self.assertTrue(numpy.allclose(2 * Gtrunc, fds.Gtrunc))
+        self.assertEqual(2, fds.getCacheStats()["Gtrunc"][1])
+        return
+
+    def test_Gtrunc_Nyquist(self):
+        """Check Gtrunc and dGtrunc use sinc interpolation for Nyquist
+        sampling."""
+        ds = FitDataSet("300K")
+        ds.read(datafile("300K.gr"))
+        ds.qmax = 20
+        ds.setFitSamplingType("Nyquist")
+        robs, rcalc = ds.robs, ds.rcalc
+        Gsinc = fds.grid_interpolation(robs, ds.Gobs, rcalc, tp="Nyquist")
+        Glinear = fds.grid_interpolation(robs, ds.Gobs, rcalc)
+        self.assertTrue(numpy.array_equal(Gsinc, ds.Gtrunc))
+        self.assertFalse(numpy.allclose(Glinear, ds.Gtrunc))
+        dGsinc = fds.grid_interpolation(robs, ds.dGobs, rcalc, left=ds.dGobs[0], right=ds.dGobs[-1], tp="Nyquist")
+        self.assertTrue(numpy.array_equal(dGsinc, ds.dGtrunc))
+        # windowed sinc is used only for the Nyquist-fast sampling type
+        ds.setFitSamplingType("Nyquist-fast")
+        self.assertEqual("Nyquist-fast", ds.getFitSamplingType())
+        self.assertTrue(numpy.array_equal(rcalc, ds.rcalc))
+        Gfast = fds.grid_interpolation(robs, ds.Gobs, rcalc, tp="Nyquist-fast")
+        self.assertTrue(numpy.array_equal(Gfast, ds.Gtrunc))
+        self.assertFalse(numpy.array_equal(Gsinc, ds.Gtrunc))
+        self.assertEqual("Nyquist-fast", ds.copy().getFitSamplingType())
+        ds.setFitSamplingType("data")
+        self.assertFalse(ds.windowedSinc)
+        return
+
+    def test_save_windowedSinc(self):
+        """Check Nyquist-fast sampling type is saved in project files."""
+        from diffpy.pdfgui.control.pdfguicontrol import PDFGuiControl
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            control = PDFGuiControl()
+            fit = control.newFitting("fit")
+            ds = control.loadDataset(fit, datafile("300K.gr"))
+            ds.qmax = 20
+            ds.setFitSamplingType("Nyquist-fast")
+            projfile = os.path.join(tmpdir, "fast.ddp")
+            control.save(projfile)
+            control.reset()
+            control.load(projfile)
+            ds1 = control.fits[0].datasets[0]
+            self.assertEqual("Nyquist-fast", ds1.getFitSamplingType())
+        finally:
+            shutil.rmtree(tmpdir)
+        return
+
 
 #   def test_writeResampledObs(self):
 #       """check FitDataSet.writeResampledObs()
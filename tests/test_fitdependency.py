@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.control.fitdependency.py."""
+
+
+import unittest
+
+from diffpy.pdfgui.control.controlerrors import ControlRuntimeError
+from diffpy.pdfgui.control.fitdependency import FitDependencyGraph, FitSchedule
+from diffpy.pdfgui.control.parameter import Parameter
+from diffpy.pdfgui.control.pdfguicontrol import pdfguicontrol
+
+# ----------------------------------------------------------------------------
+
+
+class TestFitDependencyGraph(unittest.TestCase):
+    """Test methods of FitDependencyGraph."""
+
+    def setUp(self):
+        # linked parameters are resolved in the singleton instance
+        self.control = pdfguicontrol()
+        self.fa = self.control.newFitting("fa")
+        self.fb = self.control.newFitting("fb")
+        self.fc = self.control.newFitting("fc")
+        self.fd = self.control.newFitting("fd")
+        # fa -> fb -> fd, fa -> fc
+        self.fb.parameters[1] = Parameter(1, "=fa:1")
+        self.fc.parameters[1] = Parameter(1, "=fa")
+        self.fd.parameters[1] = Parameter(1, "=fb:1")
+        self.fd.parameters[2] = Parameter(2, 0.5)
+        self.graph = FitDependencyGraph(self.control.fits)
+        return
+
+    def tearDown(self):
+        self.control.reset()
+        return
+
+    def test___init__(self):
+        "check FitDependencyGraph.__init__"
+        self.assertEqual([], self.graph.sources[self.fa])
+        self.assertEqual([self.fa], self.graph.sources[self.fb])
+        self.assertEqual([self.fb], self.graph.sources[self.fd])
+        self.assertEqual([self.fb, self.fc], self.graph.targets[self.fa])
+        return
+
+    def test_readyFittings(self):
+        "check FitDependencyGraph.readyFittings"
+        fits = [self.fd, self.fc, self.fb, self.fa]
+        self.assertEqual([self.fa], self.graph.readyFittings(fits))
+        ready = self.graph.readyFittings([self.fd, self.fc, self.fb], [self.fa])
+        self.assertEqual([], ready)
+        ready = self.graph.readyFittings([self.fd, self.fc, self.fb])
+        self.assertEqual([self.fc, self.fb], ready)
+        return
+
+    def test_topologicalOrder(self):
+        "check FitDependencyGraph.topologicalOrder"
+        order = self.graph.topologicalOrder()
+        self.assertEqual([self.fa, self.fb, self.fc, self.fd], order)
+        self.fa.parameters[1] = Parameter(1, "=fd:1")
+        graph = FitDependencyGraph(self.control.fits)
+        self.assertRaises(ControlRuntimeError, graph.topologicalOrder)
+        return
+
+    def test_criticalPath(self):
+        "check FitDependencyGraph.criticalPath"
+        durations = {self.fa: 1.0, self.fb: 2.0, self.fc: 4.0, self.fd: 0.5}
+        length, path = self.graph.criticalPath(durations)
+        self.assertEqual(5.0, length)
+        self.assertEqual([self.fa, self.fc], path)
+        self.assertEqual((0.0, []), FitDependencyGraph([]).criticalPath({}))
+        return
+
+
+# End of class TestFitDependencyGraph
+
+
+class TestFitSchedule(unittest.TestCase):
+    """Test methods of FitSchedule."""
+
+    def test_report(self):
+        "check FitSchedule.report"
+        control = pdfguicontrol()
+        try:
+            f1 = control.newFitting("f1")
+            f2 = control.newFitting("f2")
+            f2.parameters[1] = Parameter(1, "=f1:1")
+            schedule = FitSchedule(workers=2)
+            schedule.started = {f1: 10.0, f2: 13.0}
+            schedule.finished = {f1: 12.0}
+            self.assertFalse(schedule.isComplete())
+            schedule.finished[f2] = 14.0
+            self.assertTrue(schedule.isComplete())
+            report = schedule.report(FitDependencyGraph(control.fits))
+            self.assertEqual(4.0, report["wallTime"])
+            self.assertEqual(3.0, report["busyTime"])
+            self.assertEqual(5.0, report["idleTime"])
+            self.assertEqual(["f1", "f2"], report["criticalPath"])
+            self.assertEqual(3.0, report["criticalPathLength"])
+            self.assertEqual(["f1", "f2"], [fi["name"] for fi in report["fits"]])
+            self.assertEqual(1.0, report["fits"][1]["wait"])
+        finally:
+            control.reset()
+        return
+
+
+# End of class TestFitSchedule
+
+# ----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
@@ -59,6 +59,29 @@ class TestFitStructure(unittest.TestCase):
         self.assertEqual("p_noname", stru._getStrId())
         return
 
+    def test_setRefinedString(self):
+        """Check FitStructure.setRefinedString()"""
+        stru = self.stru
+        stru.read(datafile("Ni.stru"), format="pdffit")
+        self.assertIsNone(stru.getRefinedString())
+        s = stru.writeStr("pdffit")
+        stru.setRefinedString(s)
+        self.assertIsNone(stru.__dict__["_refined"])
+        self.assertEqual(s, stru.getRefinedString())
+        refined = stru.refined
+        self.assertEqual(4, len(refined))
+        self.assertEqual(stru.lattice.a, refined.lattice.a)
+        # new string is parsed into the same refined object
+        stru.setRefinedString(s.replace(str(stru.lattice.a), "3.6", 1))
+        self.assertIs(refined, stru.refined)
+        self.assertEqual(3.6, refined.lattice.a)
+        self.assertIsNone(stru.__dict__["_refinedstr"])
+        self.assertEqual(refined.writeStr("pdffit"), stru.getRefinedString())
+        stru.clearRefined()
+        self.assertIsNone(stru.refined)
+        self.assertIsNone(stru.getRefinedString())
+        return
+
     #   def test_clearRefined(self):
     #       """check FitStructure.clearRefined()
     #       """
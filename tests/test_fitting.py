@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.control.fitting.py."""
+
+
+import concurrent.futures
+import contextlib
+import io
+import unittest
+
+from testutils import datafile
+
+from diffpy.pdfgui.control import calculation
+from diffpy.pdfgui.control.calculation import Calculation
+from diffpy.pdfgui.control.controlerrors import ControlConfigError
+from diffpy.pdfgui.control.fitstructure import FitStructure
+from diffpy.pdfgui.control.fitting import Fitting
+from diffpy.pdfgui.control.snapshotstore import SnapshotRetention, SnapshotStore
+
+# ----------------------------------------------------------------------------
+
+
+class _StructureServer:
+    "Thin stand-in for the structure methods of PdfFit server."
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def setphase(self, iphase):
+        return
+
+    def save_struct_string(self, iphase):
+        self.calls += 1
+        return self.text
+
+
+def _calculateProcess(owner, index):
+    "Stand-in for the worker process target of fitting calculations."
+    calc = owner.calcs[index]
+    if calc.name == "bad":
+        raise ControlConfigError("No structure is given for calculation")
+    if calc.name == "lost":
+        raise RuntimeError("worker process died")
+    return [1.0], [float(index)], ""
+
+
+class TestFitting(unittest.TestCase):
+    """Test methods of Fitting."""
+
+    def setUp(self):
+        self.fitting = Fitting("fit")
+        stru = FitStructure("Ni")
+        stru.read(datafile("Ni.stru"), format="pdffit")
+        self.fitting.add(stru)
+        self.server = _StructureServer(stru.writeStr("pdffit"))
+        self.fitting.server = self.server
+        return
+
+    def test_requestRefined(self):
+        "check Fitting.requestRefined"
+        fitting = self.fitting
+        self.assertFalse(fitting.watchRefined)
+        fitting.requestRefined()
+        self.assertTrue(fitting._refinedRequested)
+        fitting.step = 1
+        fitting._obtainRefined()
+        self.assertFalse(fitting._refinedRequested)
+        self.assertEqual(1, fitting._refinedStep)
+        self.assertEqual(1, self.server.calls)
+        self.assertEqual(4, len(fitting.strucs[0].refined))
+        return
+
+    def test__obtainStaleRefined(self):
+        "check Fitting._obtainStaleRefined"
+        fitting = self.fitting
+        # nothing to obtain before the first step
+        fitting.fitStatus = Fitting.CONFIGURED
+        self.assertFalse(fitting._obtainStaleRefined())
+        fitting.step = 3
+        self.assertTrue(fitting._obtainStaleRefined())
+        self.assertEqual(1, self.server.calls)
+        self.assertFalse(fitting._obtainStaleRefined())
+        self.assertEqual(1, self.server.calls)
+        # finished refinements obtained their structures already
+        fitting.step = 4
+        fitting.fitStatus = Fitting.DONE
+        self.assertFalse(fitting._obtainStaleRefined())
+        fitting.resetStatus()
+        self.assertIsNone(fitting._refinedStep)
+        return
+
+    def test__applyStepData_scalars(self):
+        "check Fitting._applyStepData with worker retention of scalars"
+        fitting = self.fitting
+        fitting.setRetention("scalars")
+        # the worker process sends its last snapshot without vectors
+        worker = SnapshotStore(retention=SnapshotRetention("scalars"))
+        for step in (1, 2):
+            worker.append([0.5 / step, [1.0, 2.0], [0.1, 0.2], 0.5 / step])
+            results = {
+                "datasets": [],
+                "strucs": [None],
+                "parameters": {},
+                "rw": 0.5 / step,
+                "step": step,
+                "snapshot": worker[-1],
+                "output": "",
+            }
+            fitting._applyStepData(results)
+        self.assertEqual(2, len(fitting.snapshots))
+        self.assertIsNone(fitting.snapshots.getItem(1))
+        self.assertIsNone(fitting.snapshots[0][2])
+        self.assertEqual(0.25, fitting.snapshots.getItem(3))
+        return
+
+    def test_run_calculations(self):
+        "check calculations of Fitting.run run in the calculation pool"
+        fitting = self.fitting
+        fitting.server = None
+        for name in ("c1", "c2", "bad", "lost"):
+            fitting.add(Calculation(name))
+        control = fitting.controlCenter
+        saved = (calculation._calculateProcess, control.calcExecutor)
+        calculation._calculateProcess = _calculateProcess
+        control.calcExecutor = concurrent.futures.ThreadPoolExecutor()
+        out = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(out):
+                fitting.run()
+        finally:
+            control.calcExecutor.shutdown()
+            calculation._calculateProcess, control.calcExecutor = saved
+        self.assertEqual([0.0], fitting.calcs[0].Gcalc)
+        self.assertEqual([1.0], fitting.calcs[1].Gcalc)
+        self.assertEqual([], fitting.calcs[2].Gcalc)
+        self.assertIn("<Calculation exception> No structure", out.getvalue())
+        self.assertIn("<Calculation exception> RuntimeError: worker process died", out.getvalue())
+        self.assertEqual(Fitting.VOID, fitting.jobStatus)
+        return
+
+
+# End of class TestFitting
+
+# ----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
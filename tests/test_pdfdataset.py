@@ -17,9 +17,10 @@
 
 import unittest
 
+import numpy
 from testutils import datafile
 
-from diffpy.pdfgui.control.pdfdataset import PDFDataSet
+from diffpy.pdfgui.control.pdfdataset import DataArray, PDFDataFormatError, PDFDataSet, asDataArray
 
 
 ##############################################################################
@@ -96,6 +97,58 @@ class TestPDFDataSet(unittest.TestCase):
         self.assertEqual(npts * [0.0], self.pdfds.dGobs)
         return
 
+    def test_readStr_columns(self):
+        """Check PDFDataSet.readStr() agrees with line-by-line
+        parsing."""
+        header = "# qmax=25\n#### start data\n#S 1\n#L r G dr dG\n"
+        bodies = [
+            "1.0 2.0 0.1 0.2\n1.5 -2.0 0.1 0.3\n",
+            "1.0 2.0 0.0 0.2\n1.5 -2.0 0.1 0.3\r\n",
+            "1.0 2.0\n1.5 -2.0 0.1 0.3\n",
+            "1.0 2.0 nan 0.2\n1.5 -2.0 0.1 inf\n",
+            "1.0 2.0 0.1 0.2 7\n1.5 -2.0 0.1 0.3 8\n",
+        ]
+        for body in bodies:
+            self.pdfds.readStr(header + body)
+            ds = PDFDataSet("line by line")
+            ds._readDataLines(body.strip())
+            self.assertEqual(ds.robs, self.pdfds.robs)
+            self.assertEqual(ds.Gobs, self.pdfds.Gobs)
+            self.assertEqual(ds.drobs, self.pdfds.drobs)
+            self.assertEqual(ds.dGobs, self.pdfds.dGobs)
+            self.assertEqual(25.0, self.pdfds.qmax)
+            self.assertEqual((1.0, 1.5), (self.pdfds.rmin, self.pdfds.rmax))
+        # invalid data raise PDFDataFormatError
+        for body in ["1.0\n1.5\n", "1.0 2.0\n\n1.5 3.0\n", "1.0 2.0\n1.5 x\n", ""]:
+            self.assertRaises(PDFDataFormatError, self.pdfds.readStr, header + body)
+        return
+
+    def test_DataArray(self):
+        """check DataArray storage of observed data."""
+        self.pdfds.read(datafile("Ni_2-8.chi.gr"))
+        for a in (self.pdfds.robs, self.pdfds.Gobs, self.pdfds.drobs, self.pdfds.dGobs):
+            self.assertTrue(isinstance(a, DataArray))
+            self.assertEqual(numpy.float64, a.dtype)
+            self.assertTrue(a.flags.c_contiguous)
+        robs = self.pdfds.robs
+        self.assertEqual(robs.tolist(), robs)
+        self.assertNotEqual(robs.tolist()[1:], robs)
+        self.assertTrue(robs)
+        self.assertFalse(robs[:0])
+        self.assertFalse(isinstance(robs.min(), numpy.ndarray))
+        # contiguous arrays are not copied
+        a = numpy.arange(3.0)
+        self.assertTrue(numpy.shares_memory(a, asDataArray(a)))
+        self.assertEqual([0, 2, 4], 2 * asDataArray(a))
+        # ufuncs and comparisons with arrays are elementwise
+        isinf = numpy.isinf(asDataArray([1.0, numpy.inf]))
+        self.assertEqual([False, True], isinf.tolist())
+        self.assertEqual([True, False], (robs[:2] == robs[0]).tolist())
+        self.assertEqual([True, False], numpy.equal(robs[:2], robs[:1]).tolist())
+        self.pdfds.clear()
+        self.assertEqual([], self.pdfds.Gobs)
+        return
+
 
 #   def test_write(self):
 #       """check PDFDataSet.write()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.applications.pdfguibatch.py."""
+
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from testutils import datafile
+
+from diffpy.pdfgui.applications.pdfguibatch import BatchReporter, runBatch
+from diffpy.pdfgui.control.controlerrors import ControlKeyError
+from diffpy.pdfgui.control.pdfguicontrol import pdfguicontrol
+from diffpy.pdfgui.tui import LoadProject
+
+# ----------------------------------------------------------------------------
+
+
+class TestPDFGuiBatch(unittest.TestCase):
+    """Test batch refinement of PDFgui projects."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.projfile = os.path.join(self.tmpdir, "lcmo.ddp")
+        shutil.copyfile(datafile("lcmo.ddp"), self.projfile)
+        return
+
+    def tearDown(self):
+        control = pdfguicontrol()
+        control.gui = None
+        control.reset()
+        shutil.rmtree(self.tmpdir)
+        return
+
+    def test_BatchReporter(self):
+        "check BatchReporter.postEvent"
+        stream = io.StringIO()
+        reporter = BatchReporter(stream)
+        reporter.postEvent(reporter.UPDATE, None)
+        reporter.postEvent(reporter.ERROR, "<Fitting exception> Failed")
+        self.assertEqual("<Fitting exception> Failed\n", stream.getvalue())
+        return
+
+    def test_runBatch(self):
+        "check runBatch"
+        stream = io.StringIO()
+        self.assertRaises(ControlKeyError, runBatch, self.projfile, ["nosuchfit"], stream=stream)
+        results = runBatch(self.projfile, ["fit-d300"], stream=stream)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(1, len(lines))
+        self.assertEqual(results[0], json.loads(lines[0]))
+        self.assertEqual("fit-d300", results[0]["fit"])
+        self.assertEqual("done", results[0]["status"])
+        self.assertTrue(results[0]["steps"] > 0)
+        # refined values are saved to the project
+        fit = LoadProject(self.projfile).getFits()[0]
+        self.assertAlmostEqual(results[0]["rw"], fit.rw)
+        self.assertTrue(fit.strucs[0].refined is not None)
+        return
+
+    def test_runBatch_timeout(self):
+        "check runBatch stops fits after timeout"
+        stream = io.StringIO()
+        results = runBatch(self.projfile, ["fit-d300"], output=False, stream=stream, timeout=0)
+        self.assertEqual(1, len(results))
+        self.assertEqual(results[0], json.loads(stream.getvalue()))
+        # engine output is discarded in batch mode
+        self.assertEqual("", pdfguicontrol().getEngineOutput())
+        return
+
+
+# End of class TestPDFGuiBatch
+
+# ----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
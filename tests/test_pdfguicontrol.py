@@ -15,13 +15,30 @@
 """Unit tests for pdfgui.control.pdfguicontrol.py."""
 
 
+import os
+import tempfile
 import unittest
+import zipfile
+
+from testutils import datafile
 
 from diffpy.pdfgui.control.pdfguicontrol import PDFGuiControl
 
 # ----------------------------------------------------------------------------
 
 
+class _RunningFit:
+    "Stand-in for a running Fitting."
+
+    name = "fit"
+
+    def __init__(self):
+        self.running = True
+
+    def isThreadRunning(self):
+        return self.running
+
+
 class TestPDFGuiControl(unittest.TestCase):
     """Test methods of PDFGuiControl."""
 
@@ -37,6 +54,103 @@ class TestPDFGuiControl(unittest.TestCase):
         "check PDFGuiControl.__init__"
         self.assertEqual("", self.control.journal)
         self.assertIsNone(self.control.projfile)
+        self.assertEqual(1, self.control.maxWorkers)
+        self.assertFalse(self.control.useProcesses)
+        return
+
+    def test_waitQueue(self):
+        "check PDFGuiControl.waitQueue"
+        control = self.control
+        self.assertTrue(control.waitQueue(0))
+        fit = _RunningFit()
+        control.runningFittings.append(fit)
+        control.schedule.start(fit)
+        control.startQueue()
+        try:
+            self.assertFalse(control.waitQueue(0.1))
+            fit.running = False
+            self.assertTrue(control.waitQueue(10))
+            self.assertIn(fit, control.schedule.finished)
+        finally:
+            control.queueManager.running = False
+            control.queueEvent.set()
+            control.queueManager.join()
+        return
+
+    def test_setWorkers(self):
+        "check PDFGuiControl.setWorkers"
+        self.control.setWorkers(4, True)
+        self.assertEqual(4, self.control.maxWorkers)
+        self.assertTrue(self.control.useProcesses)
+        self.control.setWorkers(0)
+        self.assertEqual(1, self.control.maxWorkers)
+        self.assertTrue(self.control.useProcesses)
+        self.assertTrue(self.control.queueEvent.is_set())
+        return
+
+    def test_getWorkers(self):
+        "check PDFGuiControl.getWorkers"
+        self.control.setWorkers(4, False)
+        self.assertEqual(4, self.control.maxWorkers)
+        self.assertEqual(1, self.control.getWorkers())
+        self.control.setWorkers(4, True)
+        self.assertEqual(4, self.control.getWorkers())
+        return
+
+    def test_load_lazy(self):
+        "check PDFGuiControl.load with deferred loading"
+        org = self.control.load(datafile("lcmo_full.ddp"), lazy=True)
+        self.assertEqual(10, len(org))
+        fit = self.control.fits[1]
+        self.assertEqual("fit-d550", fit.name)
+        self.assertEqual("d550", org[1][1][0][0])
+        self.assertFalse(fit.isLoaded())
+        dataset = fit.datasets[0]
+        self.assertFalse(dataset.isLoaded())
+        self.assertEqual(0, len(dataset.robs))
+        self.assertTrue(dataset is dataset.ensureLoaded())
+        self.assertTrue(dataset.isLoaded())
+        self.assertFalse(fit.isLoaded())
+        self.assertEqual(2000, len(dataset.robs))
+        fit.ensureLoaded()
+        self.assertTrue(fit.isLoaded())
+        self.assertTrue(fit.strucs[0].isLoaded())
+        self.assertTrue(len(fit.parameters) > 0)
+        self.assertFalse(self.control.fits[2].isLoaded())
+        return
+
+    def test_save_lazy(self):
+        "check PDFGuiControl.save of lazily loaded project"
+        tmpfiles = []
+        try:
+            for lazy in (False, True):
+                fd, tmpfile = tempfile.mkstemp(suffix=".ddp")
+                os.close(fd)
+                tmpfiles.append(tmpfile)
+                self.control.reset()
+                self.control.load(datafile("lcmo_full.ddp"), lazy=lazy)
+                self.control.save(tmpfile)
+                # fits that were not loaded are copied without loading
+                self.assertEqual(lazy, not any(f.isLoaded() for f in self.control.fits))
+                if lazy:
+                    self.assertEqual(tmpfile, self.control.projarchive.projfile)
+                else:
+                    self.assertIsNone(self.control.projarchive)
+            contents = []
+            for f in [datafile("lcmo_full.ddp")] + tmpfiles:
+                with zipfile.ZipFile(f) as z:
+                    contents.append(dict((n.split("/", 1)[1], z.read(n)) for n in z.namelist()))
+            # eager save adds members with default values
+            self.assertTrue(set(contents[0]).issubset(contents[1]))
+            # data that were not loaded are copied unchanged
+            self.assertEqual(contents[0], contents[2])
+            # deferred data are loaded from the saved file
+            fit = self.control.fits[0]
+            self.assertTrue(fit.ensureLoaded().parameters)
+            self.assertTrue(len(fit.datasets[0].ensureLoaded().robs))
+        finally:
+            for tmpfile in tmpfiles:
+                os.remove(tmpfile)
         return
 
 
@@ -75,6 +75,30 @@ class TestPDFStructure(unittest.TestCase):
         self.assertRaises(ControlKeyError, stru.setvar, "invalid(1)", 7)
         return
 
+    def test_setvars(self):
+        """Check PDFStructure.setvars()"""
+        stru = self.stru
+        stru.addNewAtom("C", [0, 0, 0], anisotropy=True)
+        stru.addNewAtom("O", [0.5, 0.5, 0.5], anisotropy=True)
+        values = {"pscale": 1.5, "lat(2)": 5, "x(2)": 0.1, "occ(1)": 0.9, "u13(2)": 0.004}
+        stru.setvars(values)
+        self.assertEqual(1.5, stru.pdffit["scale"])
+        self.assertEqual(5, stru.lattice.b)
+        self.assertEqual([0.1, 0.5, 0.5], stru[1].xyz.tolist())
+        self.assertEqual(0.9, stru[0].occupancy)
+        self.assertEqual(0.004, stru[1].U[0, 2])
+        self.assertEqual(0.004, stru[1].U[2, 0])
+        for var, value in values.items():
+            self.assertEqual(value, stru.getvar(var))
+        self.assertEqual(list(values.values()), stru.getvars(values))
+        # replaced atoms are updated
+        stru[1] = stru[1].__copy__()
+        stru.setvars({"y(2)": 0.2})
+        self.assertEqual([0.1, 0.2, 0.5], stru[1].xyz.tolist())
+        self.assertRaises(ControlKeyError, stru.setvars, {"lat(7)": 1})
+        self.assertRaises(IndexError, stru.setvars, {"x(3)": 1})
+        return
+
     def test_getvar(self):
         """Check PDFStructure.getvar()"""
         from diffpy.structure import Atom
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.control.profiler.py."""
+
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from diffpy.pdfgui.control.controlerrors import ControlValueError
+from diffpy.pdfgui.control.profiler import Profiler
+
+# ----------------------------------------------------------------------------
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = Profiler(enabled=True)
+        self.tmpdir = tempfile.mkdtemp()
+        return
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        return
+
+    def test_phase(self):
+        """check Profiler.phase() and Profiler.getSummary()"""
+        prof = self.profiler
+        for step in (1, 2):
+            with prof.phase("refine_step", "fit1", step):
+                pass
+        with self.assertRaises(ValueError):
+            with prof.phase("configure", "fit2"):
+                raise ValueError
+        with prof.phase("save"):
+            pass
+        summary = prof.getSummary()
+        self.assertEqual(2, summary["phases"]["refine_step"]["calls"])
+        self.assertEqual(1, summary["phases"]["configure"]["calls"])
+        self.assertEqual(["refine_step"], list(summary["fits"]["fit1"]))
+        self.assertNotIn(None, summary["fits"])
+        self.assertTrue(summary["wall"] >= summary["phases"]["refine_step"]["total"])
+        prof.reset()
+        self.assertEqual({}, prof.getSummary()["phases"])
+        return
+
+    def test_disabled(self):
+        """check disabled Profiler records nothing"""
+        prof = Profiler()
+        with prof.phase("refine_step", "fit1", 1):
+            pass
+        prof.recordMemory("fit1", 100)
+        self.assertEqual({}, prof.getSummary()["phases"])
+        self.assertEqual({}, prof.getSummary()["memory"])
+        self.assertEqual([], prof.getTrace()["traceEvents"])
+        return
+
+    def test_recordMemory(self):
+        """check memory high-water marks"""
+        prof = self.profiler
+        prof.recordMemory("fit1", 100)
+        prof.recordMemory("fit1", 50)
+        self.assertEqual({"fit1": 100}, prof.getSummary()["memory"])
+        self.assertIn("history memory of fit1: 100 bytes", prof.formatSummary())
+        return
+
+    def test_maxevents(self):
+        """check timeline is limited to maxevents"""
+        prof = Profiler(enabled=True, maxevents=3)
+        for step in range(5):
+            prof.record("refine_step", 0.0, 0.5, "fit1", step)
+        trace = prof.getTrace()["traceEvents"]
+        self.assertEqual([2, 3, 4], [e["args"]["step"] for e in trace])
+        self.assertEqual(5, prof.getSummary()["phases"]["refine_step"]["calls"])
+        self.assertEqual(2.5, prof.getSummary()["phases"]["refine_step"]["total"])
+        return
+
+    def test_write(self):
+        """check Profiler.write() in JSON and Chrome trace formats"""
+        prof = self.profiler
+        with prof.phase("refine_step", "fit1", 1):
+            pass
+        prof.recordMemory("fit1", 100)
+        fjson = os.path.join(self.tmpdir, "profile.json")
+        prof.write(fjson)
+        with open(fjson) as fp:
+            data = json.load(fp)
+        self.assertEqual(1, data["summary"]["phases"]["refine_step"]["calls"])
+        self.assertEqual("fit1", data["events"][0]["fit"])
+        fchrome = os.path.join(self.tmpdir, "trace.json")
+        prof.write(fchrome, "chrome")
+        with open(fchrome) as fp:
+            trace = json.load(fp)["traceEvents"]
+        self.assertEqual(["X", "C"], [e["ph"] for e in trace])
+        self.assertEqual({"fit": "fit1", "step": 1}, trace[0]["args"])
+        self.assertRaises(ControlValueError, prof.write, fjson, "xml")
+        return
+
+
+# End of class TestProfiler
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
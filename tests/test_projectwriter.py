@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.control.projectwriter.py."""
+
+
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from diffpy.pdfgui.control.pdfcomponent import PDFComponent
+from diffpy.pdfgui.control.projectwriter import ProjectWriter
+
+# ----------------------------------------------------------------------------
+
+
+class TestProjectWriter(unittest.TestCase):
+    """Test methods of ProjectWriter."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmpdir, "old.ddp")
+        self.target = os.path.join(self.tmpdir, "new.ddp")
+        with zipfile.ZipFile(self.source, "w", zipfile.ZIP_DEFLATED) as z:
+            z.writestr("old/fits", "fit1")
+            z.writestr("old/fit1/parameters", "p" * 1000)
+            z.writestr("old/fit1/steps", "s" * 1000)
+            z.writestr("old/fit1/dataset/d1/obs", "o" * 1000)
+        return
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        return
+
+    def read(self, filename):
+        with zipfile.ZipFile(filename) as z:
+            return dict((n, z.read(n)) for n in z.namelist())
+
+    def test_writestr(self):
+        "check ProjectWriter.writestr"
+        pw = ProjectWriter(self.target, "new", self.source)
+        pw.writestr("new/fits", "fit1")
+        pw.writestr("new/fit1/parameters", "q" * 1000)
+        pw.writestr("new/journal", b"journal")
+        pw.close()
+        self.assertEqual(1, pw.copied)
+        self.assertEqual(2, pw.written)
+        content = self.read(self.target)
+        self.assertEqual(b"fit1", content["new/fits"])
+        self.assertEqual(b"q" * 1000, content["new/fit1/parameters"])
+        self.assertEqual(b"journal", content["new/journal"])
+        with zipfile.ZipFile(self.target) as z:
+            self.assertIsNone(z.testzip())
+        return
+
+    def test_copyRaw_fallback(self):
+        "check ProjectWriter._copyRaw when the member header does not match"
+        pw = ProjectWriter(self.target, "new", self.source)
+        source = zipfile.ZipFile(self.source)
+        info = copy.copy(source.getinfo("old/fit1/steps"))
+        info.header_offset = source.getinfo("old/fit1/parameters").header_offset
+        pw._copyRaw(info, "new/fit1/steps", source)
+        pw.writestr("new/fit1/parameters", "p" * 1000)
+        pw.close()
+        source.close()
+        self.assertEqual((1, 1), (pw.written, pw.copied))
+        content = self.read(self.target)
+        self.assertEqual(b"s" * 1000, content["new/fit1/steps"])
+        self.assertEqual(b"p" * 1000, content["new/fit1/parameters"])
+        with zipfile.ZipFile(self.target) as z:
+            self.assertIsNone(z.testzip())
+        return
+
+    def test_writestr_nosource(self):
+        "check ProjectWriter.writestr without source file"
+        pw = ProjectWriter(self.target, "new", os.path.join(self.tmpdir, "nofile.ddp"))
+        pw.writestr("new/fits", "fit1")
+        pw.close()
+        self.assertEqual((1, 0), (pw.written, pw.copied))
+        self.assertEqual({"new/fits": b"fit1"}, self.read(self.target))
+        return
+
+    def test_writeCached(self):
+        "check ProjectWriter.writeCached"
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return "s" * 1000
+
+        pw = ProjectWriter(self.target, "new", self.source)
+        pw.writeCached("new/fit1/steps", 7, factory)
+        pw.close()
+        self.assertEqual(1, len(calls))
+        self.assertEqual(1, pw.copied)
+        tokens = pw.tokens
+        self.assertEqual(7, tokens["new/fit1/steps"][0])
+        # unchanged token does not call the factory
+        target2 = os.path.join(self.tmpdir, "new2.ddp")
+        pw = ProjectWriter(target2, "new2", self.target, tokens)
+        pw.writeCached("new2/fit1/steps", 7, factory)
+        pw.writeCached("new2/fit1/parameters", 7, lambda: "p")
+        pw.close()
+        self.assertEqual(1, len(calls))
+        self.assertEqual((1, 1), (pw.written, pw.copied))
+        content = self.read(target2)
+        self.assertEqual(b"s" * 1000, content["new2/fit1/steps"])
+        self.assertEqual(b"p", content["new2/fit1/parameters"])
+        return
+
+    def test_copyDeferred(self):
+        "check ProjectWriter.copyDeferred"
+
+        class Archive:
+            projfile = self.source
+            fileTree = {"old": {"fits": None, "fit1": {"parameters": None, "steps": None, "dataset": {}}}}
+
+        fit = PDFComponent("fit1")
+        pw = ProjectWriter(self.target, "new", self.source)
+        self.assertFalse(pw.copyDeferred(fit, "new/fit1/"))
+        fit.deferLoad(Archive(), "old/fit1/")
+        self.assertTrue(pw.copyDeferred(fit, "new/fit1/"))
+        pw.close()
+        self.assertEqual([(fit, "new/fit1/")], pw.deferred)
+        content = self.read(self.target)
+        self.assertEqual(["new/fit1/parameters", "new/fit1/steps"], sorted(content))
+        self.assertEqual(b"s" * 1000, content["new/fit1/steps"])
+        with zipfile.ZipFile(self.target) as z:
+            self.assertIsNone(z.testzip())
+        return
+
+
+# End of class TestProjectWriter
+
+# ----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
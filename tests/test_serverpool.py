@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.control.serverpool.py."""
+
+
+import threading
+import unittest
+
+from diffpy.pdfgui.control.controlerrors import ControlValueError
+from diffpy.pdfgui.control.serverpool import ServerPool
+
+# ----------------------------------------------------------------------------
+
+
+class _Server:
+    """Minimal stand-in for the PdfFit engine."""
+
+    def __init__(self):
+        self.resets = 0
+        return
+
+    def reset(self):
+        self.resets += 1
+        return
+
+
+class _BrokenServer(_Server):
+    """Server stand-in that fails to reset."""
+
+    def reset(self):
+        raise RuntimeError("reset failed")
+
+
+class TestServerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ServerPool(2, factory=_Server)
+        return
+
+    def test_checkout(self):
+        """check ServerPool.checkout() and ServerPool.checkin()"""
+        s1 = self.pool.checkout()
+        s2 = self.pool.checkout()
+        self.assertIsNot(s1, s2)
+        self.assertEqual(2, self.pool.created)
+        self.pool.checkin(s1)
+        self.assertEqual(1, s1.resets)
+        self.assertEqual(1, self.pool.idle())
+        self.assertIs(s1, self.pool.checkout())
+        self.assertEqual(1, self.pool.reused)
+        self.assertEqual(2, self.pool.created)
+        return
+
+    def test_maxsize(self):
+        """check bounded number of idle servers"""
+        servers = [self.pool.checkout() for i in range(3)]
+        for s in servers:
+            self.pool.checkin(s)
+        self.assertEqual(2, self.pool.idle())
+        self.assertEqual(1, self.pool.discarded)
+        self.pool.maxsize = 1
+        self.assertEqual(1, self.pool.idle())
+        self.pool.maxsize = 0
+        self.pool.checkin(self.pool.checkout())
+        self.assertEqual(0, self.pool.idle())
+        self.assertRaises(ControlValueError, self.pool.setMaxSize, -1)
+        self.assertRaises(ControlValueError, self.pool.setMaxSize, "many")
+        return
+
+    def test_thread_affinity(self):
+        """check servers are preferably reused by the same thread"""
+        s0 = self.pool.checkout()
+        other = []
+        t = threading.Thread(target=lambda: other.append(self.pool.checkout()))
+        t.start()
+        t.join()
+        t = threading.Thread(target=self.pool.checkin, args=other)
+        t.start()
+        t.join()
+        self.pool.checkin(s0)
+        self.assertIs(s0, self.pool.checkout())
+        self.assertIs(other[0], self.pool.checkout())
+        return
+
+    def test_lease(self):
+        """check ServerPool.lease() returns server on errors"""
+        with self.pool.lease() as s1:
+            pass
+        self.assertEqual(1, s1.resets)
+        with self.assertRaises(ValueError):
+            with self.pool.lease() as s2:
+                raise ValueError
+        self.assertIs(s1, s2)
+        self.assertEqual(1, self.pool.idle())
+        self.pool.clear()
+        self.assertEqual(0, self.pool.idle())
+        return
+
+    def test_failed_reset(self):
+        """check servers that fail to reset are dropped"""
+        pool = ServerPool(2, factory=_BrokenServer)
+        pool.checkin(pool.checkout())
+        self.assertEqual(0, pool.idle())
+        self.assertEqual(1, pool.discarded)
+        with self.assertRaises(ValueError):
+            with pool.lease():
+                raise ValueError
+        self.assertEqual(2, pool.discarded)
+        self.assertEqual(2, pool.created)
+        return
+
+
+# End of class TestServerPool
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
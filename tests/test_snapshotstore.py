@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+##############################################################################
+#
+# (c) 2024-2026 The Trustees of Columbia University in the City of New York.
+# All rights reserved.
+#
+# File coded by: Billinge Group members and community contributors.
+#
+# See GitHub contributions for a more detailed list of contributors.
+# https://github.com/diffpy/diffpy.pdfgui/graphs/contributors
+#
+# See LICENSE.rst for license information.
+#
+##############################################################################
+"""Unit tests for pdfgui.control.snapshotstore.py."""
+
+
+import copy
+import pickle
+import unittest
+
+import numpy
+
+from diffpy.pdfgui.control.controlerrors import ControlValueError
+from diffpy.pdfgui.control.snapshotstore import SnapshotRetention, SnapshotStore
+
+# ----------------------------------------------------------------------------
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Test methods of SnapshotStore."""
+
+    def setUp(self):
+        # snapshot items are: scalar, Gcalc, crw, rw
+        self.snapshots = [[0.1 * i, [1.0 * i] * 4, [0.5] * 4, 1.0 / (i + 1)] for i in range(20)]
+        self.store = SnapshotStore(self.snapshots)
+        return
+
+    def test___init__(self):
+        "check SnapshotStore.__init__"
+        self.assertEqual(0, len(SnapshotStore()))
+        self.assertFalse(SnapshotStore())
+        self.assertEqual(20, len(self.store))
+        self.assertTrue(self.store)
+        return
+
+    def test___getitem__(self):
+        "check SnapshotStore.__getitem__"
+        s = self.store[-1]
+        self.assertEqual(4, len(s))
+        self.assertAlmostEqual(1.9, s[0])
+        self.assertEqual([19.0] * 4, list(s[1]))
+        self.assertEqual(3, len(self.store[2:5]))
+        self.assertRaises(IndexError, self.store.__getitem__, 20)
+        return
+
+    def test_append(self):
+        "check SnapshotStore.append"
+        self.assertRaises(ControlValueError, self.store.append, [1.0])
+        # vector of different length is stored as is
+        self.store.append([2.0, [1.0, 2.0], [0.5] * 4, 0.01])
+        self.assertEqual(21, len(self.store))
+        self.assertEqual([1.0, 2.0], self.store.getItem(1))
+        self.assertEqual([19.0] * 4, list(self.store.getItem(1, -2)))
+        self.assertEqual(21, len(self.store.getItem(1, None)))
+        return
+
+    def test_getItem(self):
+        "check SnapshotStore.getItem"
+        rw = self.store.getItem(3, None)
+        self.assertTrue(isinstance(rw, numpy.ndarray))
+        self.assertEqual([1.0 / (i + 1) for i in range(20)], list(rw))
+        self.assertFalse(rw.flags.writeable)
+        self.assertAlmostEqual(0.05, self.store.getItem(3))
+        self.assertTrue(isinstance(self.store.getItem(3), float))
+        self.assertAlmostEqual(0.5, self.store.getItem(3, 1))
+        self.assertTrue(numpy.allclose([0.0, 1.9], self.store.getItem(0, [0, -1])))
+        gcalc = self.store.getItem(1, None)
+        self.assertEqual((20, 4), gcalc.shape)
+        self.assertEqual([3.0] * 4, list(gcalc[3]))
+        self.assertRaises(IndexError, self.store.getItem, 0, 20)
+        self.assertRaises(IndexError, self.store.getItem, 4)
+        return
+
+    def test_tolist(self):
+        "check SnapshotStore.tolist"
+        snapshots = self.store.tolist()
+        self.assertEqual(self.snapshots, snapshots)
+        self.assertTrue(isinstance(snapshots[0][1], list))
+        return
+
+    def test_pickle(self):
+        "check pickling and copy of SnapshotStore"
+        s1 = pickle.loads(pickle.dumps(self.store))
+        self.assertEqual(self.snapshots, s1.tolist())
+        s1.append(self.snapshots[0])
+        self.assertEqual(21, len(s1))
+        self.assertEqual(20, len(self.store))
+        s2 = copy.deepcopy(self.store)
+        self.assertEqual(self.snapshots, s2.tolist())
+        return
+
+    def test_nbytes(self):
+        "check SnapshotStore.nbytes"
+        self.assertEqual(0, SnapshotStore().nbytes())
+        nbytes = self.store.nbytes()
+        self.assertTrue(nbytes > 0)
+        s1 = pickle.loads(pickle.dumps(self.store))
+        self.assertTrue(0 < s1.nbytes() <= nbytes)
+        return
+
+    def test_retention_last(self):
+        "check SnapshotStore with retention of last steps"
+        store = SnapshotStore(self.snapshots, SnapshotRetention("last", 3))
+        self.assertEqual(20, len(store))
+        self.assertEqual([17, 18, 19], list(store.getSteps(1)))
+        self.assertEqual(20, len(store.getSteps(0)))
+        self.assertEqual((3, 4), store.getItem(1, None).shape)
+        self.assertEqual([18.0] * 4, list(store.getItem(1, -2)))
+        self.assertTrue(store.getItem(1, 0) is None)
+        self.assertTrue(store[0][1] is None)
+        self.assertAlmostEqual(0.0, store[0][0])
+        self.assertEqual([None, 19.0], [None if v is None else v[0] for v in store.getItem(1, [0, 19])])
+        for snapshot in self.snapshots:
+            store.append(snapshot)
+        self.assertEqual([37, 38, 39], list(store.getSteps(2)))
+        self.assertEqual(40, len(store.getItem(3, None)))
+        return
+
+    def test_retention_every(self):
+        "check SnapshotStore with retention of every k-th step"
+        store = SnapshotStore(self.snapshots, SnapshotRetention("every", 5))
+        self.assertEqual([0, 5, 10, 15, 19], list(store.getSteps(1)))
+        store.append(self.snapshots[0])
+        self.assertEqual([0, 5, 10, 15, 20], list(store.getSteps(1)))
+        return
+
+    def test_retention_scalars(self):
+        "check SnapshotStore with retention of scalars only"
+        store = SnapshotStore(self.snapshots, SnapshotRetention("scalars"))
+        self.assertEqual(0, len(store.getSteps(1)))
+        self.assertTrue(store.getItem(1) is None)
+        self.assertEqual(20, len(store.getItem(0, None)))
+        return
+
+    def test_pending(self):
+        "check SnapshotStore items that start as None"
+        store = SnapshotStore(retention=SnapshotRetention("scalars"))
+        store.append([0.0, None, None, 1.0])
+        self.assertEqual([0.0, None, None, 1.0], store[0])
+        self.assertEqual(0, len(store.getSteps(1)))
+        self.assertTrue(store.getItem(1) is None)
+        self.assertEqual([], store.getItem(1, None))
+        store.append(self.snapshots[1])
+        self.assertTrue(store[1][1] is None)
+        store.setRetention(SnapshotRetention())
+        store.append(self.snapshots[2])
+        self.assertEqual([2], list(store.getSteps(1)))
+        self.assertEqual((1, 4), store.getItem(1, None).shape)
+        self.assertEqual(self.snapshots[2], store.tolist()[2])
+        # scalar item gets NaN for the earlier steps
+        store = SnapshotStore([[None, 1.0]])
+        store.append([2.0, 2.0])
+        self.assertTrue(numpy.isnan(store[0][0]))
+        self.assertEqual(2.0, store.getItem(0))
+        self.assertEqual([1.0, 2.0], list(store.getItem(1, None)))
+        return
+
+    def test_setRetention(self):
+        "check SnapshotStore.setRetention"
+        self.store.setRetention(SnapshotRetention("last", 2))
+        self.assertEqual([18, 19], list(self.store.getSteps(1)))
+        snapshots = self.store.tolist()
+        self.assertEqual(self.snapshots[-1], snapshots[-1])
+        self.assertEqual(None, snapshots[0][1])
+        # saved snapshots with dropped vectors are loaded correctly
+        s1 = SnapshotStore(snapshots)
+        self.assertEqual([18, 19], list(s1.getSteps(1)))
+        self.assertEqual((2, 4), s1.getItem(2, None).shape)
+        self.assertEqual(snapshots, s1.tolist())
+        return
+
+
+# End of class TestSnapshotStore
+
+# ----------------------------------------------------------------------------
+
+
+class TestSnapshotRetention(unittest.TestCase):
+    """Test methods of SnapshotRetention."""
+
+    def test___init__(self):
+        "check SnapshotRetention.__init__"
+        self.assertEqual("all", SnapshotRetention().mode)
+        self.assertRaises(ControlValueError, SnapshotRetention, "first")
+        self.assertRaises(ControlValueError, SnapshotRetention, "last")
+        self.assertRaises(ControlValueError, SnapshotRetention, "every", 0)
+        return
+
+    def test_fromString(self):
+        "check SnapshotRetention.fromString"
+        for s in ("all", "last 10", "every 5", "scalars"):
+            self.assertEqual(s, str(SnapshotRetention.fromString(s)))
+        self.assertEqual(SnapshotRetention("last", 3), SnapshotRetention.fromString("last 3"))
+        self.assertRaises(ControlValueError, SnapshotRetention.fromString, "last x")
+        self.assertRaises(ControlValueError, SnapshotRetention.fromString, "")
+        return
+
+    def test_keeps(self):
+        "check SnapshotRetention.keeps and dropped"
+        r = SnapshotRetention("last", 3)
+        self.assertEqual([7, 8, 9], [i for i in range(10) if r.keeps(i, 9)])
+        self.assertEqual(6, r.dropped(9))
+        self.assertEqual(None, r.dropped(2))
+        r = SnapshotRetention("every", 4)
+        self.assertEqual([0, 4, 8, 9], [i for i in range(10) if r.keeps(i, 9)])
+        self.assertEqual(None, r.dropped(9))
+        self.assertEqual(9, r.dropped(10))
+        self.assertEqual(None, SnapshotRetention().dropped(9))
+        return
+
+
+# End of class TestSnapshotRetention
+
+# ----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
+
+# End of file
@@ -19,6 +19,7 @@ import unittest
 import wx
 from testutils import GUITestCase, datafile, overridefiledialog
 
+from diffpy.pdfgui.control.controlerrors import ControlFileError
 from diffpy.pdfgui.gui.temperatureseriespanel import TemperatureSeriesPanel
 
 # ----------------------------------------------------------------------------
@@ -47,6 +48,18 @@ class TestTemperatureSeriesPanel(GUITestCase):
             panel.onAdd(None)
         self.assertEqual(paths[-1], panel.fullpath)
         self.assertEqual([17, 137, 10, 10], [tf[0] for tf in panel.datasets])
+        self.assertEqual(sorted(paths[2:]), sorted(panel.loaded))
+        return
+
+    def test_onAdd_errors(self):
+        "Check TemperatureSeriesPanel.onAdd with unreadable files"
+        panel = self.panel
+        paths = [datafile(p) for p in ["T017K.gr", "lcmo_00.gr", "nofile.gr"]]
+        with overridefiledialog(wx.ID_OK, paths):
+            self.assertRaises(ControlFileError, panel.onAdd, None)
+        self.assertEqual(paths[:2], [xf[1] for xf in panel.datasets])
+        self.assertEqual([17, 10], [xf[0] for xf in panel.datasets])
+        self.assertEqual(paths[1:2], list(panel.loaded))
         return
 
 